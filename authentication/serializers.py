@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from rest_framework.authtoken.models import Token
 from owners.models import Owner, Captain
 from ships.models import Ship
+from ships.lookup import get_ship
 from admin_module.models import AdminProfile
 from django.core.exceptions import ObjectDoesNotExist
 
@@ -84,7 +85,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             # If ship code is provided, update the ship with this owner
             if ship_code:
                 try:
-                    ship = Ship._default_manager.get(registration_number=ship_code)  # type: ignore
+                    ship = get_ship(ship_code)
                     ship.owner = owner
                     ship.save()
                 except Ship._default_manager.model.DoesNotExist:
@@ -119,7 +120,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             # If ship code is provided, update the ship with this captain
             if ship_code:
                 try:
-                    ship = Ship._default_manager.get(registration_number=ship_code)  # type: ignore
+                    ship = get_ship(ship_code)
                     ship.captain = captain
                     ship.save()
                 except Ship._default_manager.model.DoesNotExist:
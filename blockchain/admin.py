@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import BlockchainBlock, FishCatchTransaction, BlockchainConfig
+from .models import BlockchainBlock, FishCatchTransaction, PNBPTransaction, BlockchainConfig
 
 @admin.register(BlockchainBlock)
 class BlockchainBlockAdmin(admin.ModelAdmin):
@@ -14,6 +14,13 @@ class FishCatchTransactionAdmin(admin.ModelAdmin):
     search_fields = ('ship_registration_number', 'fish_name', 'fishing_area_code')
     readonly_fields = ('timestamp',)
 
+@admin.register(PNBPTransaction)
+class PNBPTransactionAdmin(admin.ModelAdmin):
+    list_display = ('ship_identifier', 'fishing_area_code', 'quota_kg', 'total_pnbp', 'run_id', 'timestamp')
+    list_filter = ('timestamp', 'fishing_area_code')
+    search_fields = ('ship_identifier', 'fishing_area_code', 'run_id')
+    readonly_fields = ('timestamp',)
+
 @admin.register(BlockchainConfig)
 class BlockchainConfigAdmin(admin.ModelAdmin):
     list_display = ('name', 'value')
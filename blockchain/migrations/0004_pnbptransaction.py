@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0003_initial'),
+        ('ships', '0002_quotapredictionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PNBPTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.CharField(db_index=True, max_length=64, verbose_name='ID Proses')),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+                ('fishing_area_code', models.CharField(max_length=20, verbose_name='Kode Wilayah Penangkapan')),
+                ('ship_identifier', models.CharField(max_length=100, verbose_name='Identitas Kapal')),
+                ('quota_kg', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Kuota (kg)')),
+                ('catch_kg', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Hasil Tangkap (kg)')),
+                ('fish_price', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Harga Ikan (Rp/kg)')),
+                ('base_fee', models.DecimalField(decimal_places=2, max_digits=18, verbose_name='Biaya Awal (Rp)')),
+                ('catch_value', models.DecimalField(decimal_places=2, max_digits=18, verbose_name='Hasil Tangkapan (Rp)')),
+                ('quota_fee', models.DecimalField(decimal_places=2, max_digits=18, verbose_name='Biaya 5% (Rp)')),
+                ('total_pnbp', models.DecimalField(decimal_places=2, max_digits=18, verbose_name='Total PNBP (Rp)')),
+                ('block', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pnbp_transactions', to='blockchain.blockchainblock')),
+                ('ship', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pnbp_transactions', to='ships.ship', verbose_name='Kapal')),
+            ],
+            options={
+                'verbose_name': 'Transaksi Blockchain PNBP',
+                'verbose_name_plural': 'Transaksi Blockchain PNBP',
+            },
+        ),
+    ]
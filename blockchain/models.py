@@ -54,6 +54,32 @@ class FishCatchTransaction(models.Model):
         verbose_name_plural = "Transaksi Blockchain Penangkapan Ikan"
 
 
+class PNBPTransaction(models.Model):
+    """Model representing a PNBP quota allocation and fee recorded in the blockchain"""
+    block = models.ForeignKey(BlockchainBlock, on_delete=models.CASCADE, related_name='pnbp_transactions')
+    run_id = models.CharField(max_length=64, db_index=True, verbose_name="ID Proses")
+    timestamp = models.DateTimeField(auto_now_add=True)
+
+    # Allocation and fee data produced by the PNBP smart contract
+    fishing_area_code = models.CharField(max_length=20, verbose_name="Kode Wilayah Penangkapan")
+    ship_identifier = models.CharField(max_length=100, verbose_name="Identitas Kapal")
+    ship = models.ForeignKey('ships.Ship', on_delete=models.SET_NULL, null=True, blank=True, related_name='pnbp_transactions', verbose_name="Kapal")
+    quota_kg = models.DecimalField(max_digits=15, decimal_places=2, verbose_name="Kuota (kg)")
+    catch_kg = models.DecimalField(max_digits=15, decimal_places=2, verbose_name="Hasil Tangkap (kg)")
+    fish_price = models.DecimalField(max_digits=15, decimal_places=2, verbose_name="Harga Ikan (Rp/kg)")
+    base_fee = models.DecimalField(max_digits=18, decimal_places=2, verbose_name="Biaya Awal (Rp)")
+    catch_value = models.DecimalField(max_digits=18, decimal_places=2, verbose_name="Hasil Tangkapan (Rp)")
+    quota_fee = models.DecimalField(max_digits=18, decimal_places=2, verbose_name="Biaya 5% (Rp)")
+    total_pnbp = models.DecimalField(max_digits=18, decimal_places=2, verbose_name="Total PNBP (Rp)")
+
+    def __str__(self) -> str:  # type: ignore
+        return f"PNBP {self.ship_identifier} ({self.fishing_area_code}) - {self.total_pnbp}"
+
+    class Meta:
+        verbose_name = "Transaksi Blockchain PNBP"
+        verbose_name_plural = "Transaksi Blockchain PNBP"
+
+
 class BlockchainConfig(models.Model):
     """Model for blockchain configuration settings"""
     name = models.CharField(max_length=100, unique=True)
@@ -2,14 +2,22 @@
 Tests for the blockchain module
 """
 
-from django.test import TestCase
+import importlib.util
+import json
+import os
+import tempfile
+from unittest import skipUnless
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
 from ships.models import Ship
 from owners.models import Owner
 from fish.models import FishSpecies
 from catches.models import FishCatch, CatchDetail
-from .models import BlockchainBlock, FishCatchTransaction
-from .utils import create_genesis_block, add_block_to_chain, create_fish_catch_transaction
+from .models import BlockchainBlock, FishCatchTransaction, PNBPTransaction
+from .utils import (
+    create_genesis_block, add_block_to_chain, create_fish_catch_transaction,
+    record_pnbp_transactions, verify_blockchain
+)
 
 class BlockchainTestCase(TestCase):
     def setUp(self):
@@ -98,4 +106,67 @@ class BlockchainTestCase(TestCase):
         self.assertTrue(FishCatchTransaction.objects.filter(id=transaction.id).exists())
         
         # Check that a block was created
-        self.assertTrue(BlockchainBlock.objects.filter(id=transaction.block.id).exists())
\ No newline at end of file
+        self.assertTrue(BlockchainBlock.objects.filter(id=transaction.block.id).exists())
+
+
+class PNBPLedgerTestCase(TestCase):
+    def setUp(self):
+        owner = Owner.objects.create(full_name='Test Owner', owner_type='individual')
+        self.ship = Ship.objects.create(name='Test Ship', registration_number='TS001', owner=owner)
+        self.transactions = [
+            {
+                'wpp_id': 'WPP 711',
+                'ship_id': ship_id,
+                'kuota_kg': 1000.5,
+                'hasil_tangkap_kg': 900.25,
+                'harga_ikan_rp': 35000.0,
+                'biaya_awal_rp': 10000000,
+                'hasil_tangkapan_rp': 31508750.0,
+                'biaya_5_persen_rp': 1575437.5,
+                'total_pnbp_final_rp': 11575437.5
+            }
+            for ship_id in ['TS001', 'Kapal 2', 'Kapal 3', 'Kapal 4', 'Kapal 5']
+        ]
+
+    def test_record_pnbp_transactions_in_batched_blocks(self):
+        """PNBP transactions are sealed into batched blocks that verify"""
+        create_genesis_block()
+
+        records = record_pnbp_transactions('WPP 711', self.transactions, run_id='run-1', block_size=2)
+
+        self.assertEqual(len(records), 5)
+        self.assertEqual(PNBPTransaction.objects.filter(run_id='run-1').count(), 5)
+        self.assertEqual(BlockchainBlock.objects.count(), 1 + 3)
+        self.assertEqual(PNBPTransaction.objects.get(ship_identifier='TS001').ship, self.ship)
+        self.assertIsNone(PNBPTransaction.objects.get(ship_identifier='Kapal 2').ship)
+
+        is_valid, message = verify_blockchain()
+        self.assertTrue(is_valid, message)
+
+
+@skipUnless(
+    all(importlib.util.find_spec(name) for name in ('torch', 'sklearn', 'platypus')),
+    'fco2 dependencies are not installed'
+)
+class FCO2PNBPPricingTestCase(SimpleTestCase):
+    def test_species_price_table_changes_the_fee(self):
+        """A ship whose species has a price in the table is charged at that price"""
+        import pandas as pd
+        import fco2
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump({'Tuna': 60000}, f)
+        self.addCleanup(os.remove, f.name)
+
+        ships = fco2.assign_ship_species(
+            pd.DataFrame({'Kapal': ['K1', 'K2', 'K3']}), {'K1': 'Tuna', 'K2': 'Kakap'}
+        )
+        contract = fco2.SmartContract(fish_prices=fco2.load_fish_prices(f.name))
+        tuna, kakap, unknown = contract.calculate_pnbp('WPP 711', [100.0, 100.0, 100.0], ships)
+
+        self.assertEqual((tuna['jenis_ikan'], tuna['harga_ikan_rp']), ('Tuna', 60000.0))
+        self.assertEqual(tuna['total_pnbp_final_rp'], 10000000 + 100 * 60000 * 0.05)
+        self.assertEqual(kakap['harga_ikan_rp'], fco2.DEFAULT_FISH_PRICE)
+        self.assertEqual(kakap['total_pnbp_final_rp'], 10000000 + 100 * 35000 * 0.05)
+        self.assertIsNone(unknown['jenis_ikan'])
+        self.assertEqual(unknown['harga_ikan_rp'], fco2.DEFAULT_FISH_PRICE)
@@ -5,10 +5,14 @@ Utility functions for blockchain operations
 import hashlib
 import json
 import time
+import uuid
 from datetime import datetime
+from decimal import Decimal
 from django.db import transaction
-from .models import BlockchainBlock, FishCatchTransaction
-from ships.models import Quota
+from django.utils import timezone
+from .models import BlockchainBlock, FishCatchTransaction, PNBPTransaction
+from ships.models import Quota, Ship
+from catches.models import NO_AREA_CODE
 
 def calculate_hash(index, previous_hash, timestamp, data, nonce=0):
     """Calculate the hash for a block"""
@@ -47,20 +51,25 @@ def mine_block(block_data, difficulty=2):
     previous_hash = latest_block.hash
     timestamp = time.time()
     
+    hash_result, nonce = proof_of_work(index, previous_hash, timestamp, block_data, difficulty)
+    return {
+        'index': index,
+        'previous_hash': previous_hash,
+        'timestamp': timestamp,
+        'data': block_data,
+        'hash': hash_result,
+        'nonce': nonce
+    }
+
+def proof_of_work(index, previous_hash, timestamp, block_data, difficulty=2):
+    """Find a nonce whose block hash starts with `difficulty` zeros; returns (hash, nonce)"""
     nonce = 0
     prefix = '0' * difficulty
     
     while True:
         hash_result = calculate_hash(index, previous_hash, timestamp, block_data, nonce)
         if hash_result.startswith(prefix):
-            return {
-                'index': index,
-                'previous_hash': previous_hash,
-                'timestamp': timestamp,
-                'data': block_data,
-                'hash': hash_result,
-                'nonce': nonce
-            }
+            return hash_result, nonce
         nonce += 1
 
 def add_block_to_chain(block_data):
@@ -77,39 +86,28 @@ def add_block_to_chain(block_data):
     
     return block
 
-def create_fish_catch_transaction(fish_catch, catch_detail, quota=None):
-    """Create a blockchain transaction for a fish catch report"""
-    # Get the latest block or create genesis block
-    latest_block = get_latest_block()
-    if not latest_block:
-        latest_block = create_genesis_block()
-
-    # Prepare transaction data
-    transaction_data = {
+def _catch_transaction_data(fish_catch, catch_detail, quota=None):
+    """Build the ledger payload for one catch detail"""
+    return {
         'ship_registration_number': fish_catch.ship.registration_number,
-        'fishing_area_code': getattr(fish_catch, 'fishing_area_code', 'N/A'),
+        'fishing_area_code': getattr(fish_catch, 'fishing_area_code', NO_AREA_CODE),
         'fish_species_code': catch_detail.fish_species.name,  # Using name as code
         'fish_name': catch_detail.fish_species.name,
         'quantity': float(catch_detail.quantity),
         'unit': catch_detail.unit,
-        'catch_date': fish_catch.catch_date.isoformat(),
+        'catch_date': str(fish_catch.catch_date),
         'quota_amount': float(quota.quota) if quota else None,
         'quota_remaining': float(quota.remaining_quota) if quota else None,
         'timestamp': datetime.now().isoformat()
     }
 
-    # Convert to JSON string for storage in block
-    block_data = json.dumps(transaction_data, sort_keys=True)
-
-    # Add block to chain
-    block = add_block_to_chain(block_data)
-
-    # Create the transaction record
-    transaction_record = FishCatchTransaction.objects.create(
+def _catch_transaction_record(fish_catch, catch_detail, block, quota=None):
+    """Build (without saving) the FishCatchTransaction for one catch detail"""
+    return FishCatchTransaction(
         fish_catch=fish_catch,
         block=block,
         ship_registration_number=fish_catch.ship.registration_number,
-        fishing_area_code=getattr(fish_catch, 'fishing_area_code', 'N/A'),
+        fishing_area_code=getattr(fish_catch, 'fishing_area_code', NO_AREA_CODE),
         fish_species_code=catch_detail.fish_species.name,
         fish_name=catch_detail.fish_species.name,
         quantity=catch_detail.quantity,
@@ -118,8 +116,169 @@ def create_fish_catch_transaction(fish_catch, catch_detail, quota=None):
         quota=quota
     )
 
+def create_fish_catch_transaction(fish_catch, catch_detail, quota=None):
+    """Create a blockchain transaction for a fish catch report"""
+    # Get the latest block or create genesis block
+    latest_block = get_latest_block()
+    if not latest_block:
+        latest_block = create_genesis_block()
+
+    # Prepare transaction data and convert to JSON string for storage in block
+    block_data = json.dumps(_catch_transaction_data(fish_catch, catch_detail, quota), sort_keys=True)
+
+    # Add block to chain
+    block = add_block_to_chain(block_data)
+
+    # Create the transaction record
+    transaction_record = _catch_transaction_record(fish_catch, catch_detail, block, quota)
+    transaction_record.save()
+
     return transaction_record
 
+def create_fish_catch_transactions(fish_catch, catch_details, quota=None):
+    """
+    Anchor several catch details of one catch report in a single block.
+    Used by bulk writes, which do not trigger the per-detail post_save signal.
+    """
+    catch_details = list(catch_details)
+    if not catch_details:
+        return []
+
+    if not get_latest_block():
+        create_genesis_block()
+
+    block_data = json.dumps(
+        [_catch_transaction_data(fish_catch, catch_detail, quota) for catch_detail in catch_details],
+        sort_keys=True
+    )
+    block = add_block_to_chain(block_data)
+
+    return FishCatchTransaction.objects.bulk_create([
+        _catch_transaction_record(fish_catch, catch_detail, block, quota)
+        for catch_detail in catch_details
+    ])
+
+def create_catch_report_transactions(reports, difficulty=2):
+    """
+    Anchor many catch reports at once: one block per report, all sealed in a single pass.
+    `reports` is a list of (fish_catch, catch_details) tuples.
+    """
+    reports = [(fish_catch, list(catch_details)) for fish_catch, catch_details in reports]
+    reports = [(fish_catch, catch_details) for fish_catch, catch_details in reports if catch_details]
+    if not reports:
+        return []
+
+    block_data_list = [
+        json.dumps(
+            [_catch_transaction_data(fish_catch, catch_detail) for catch_detail in catch_details],
+            sort_keys=True
+        )
+        for fish_catch, catch_details in reports
+    ]
+
+    with transaction.atomic():
+        blocks = seal_blocks(block_data_list, difficulty)
+        return FishCatchTransaction.objects.bulk_create([
+            _catch_transaction_record(fish_catch, catch_detail, block)
+            for block, (fish_catch, catch_details) in zip(blocks, reports)
+            for catch_detail in catch_details
+        ])
+
+def seal_blocks(block_data_list, difficulty=2):
+    """
+    Mine and save several blocks in a single pass.
+    All blocks share one timestamp, which is stored on the rows so that
+    verify_blockchain() recomputes the same hashes.
+    """
+    if not block_data_list:
+        return []
+
+    with transaction.atomic():
+        latest_block = get_latest_block()
+        if not latest_block:
+            latest_block = create_genesis_block()
+
+        sealed_at = timezone.now()
+        timestamp = sealed_at.timestamp()
+        index = latest_block.index
+        previous_hash = latest_block.hash
+
+        blocks = []
+        for block_data in block_data_list:
+            index += 1
+            hash_result, nonce = proof_of_work(index, previous_hash, timestamp, block_data, difficulty)
+            blocks.append(BlockchainBlock(
+                index=index,
+                data=block_data,
+                previous_hash=previous_hash,
+                hash=hash_result,
+                nonce=nonce
+            ))
+            previous_hash = hash_result
+
+        BlockchainBlock.objects.bulk_create(blocks)
+        # auto_now_add overwrites the timestamp on insert, store the one used for hashing
+        BlockchainBlock.objects.filter(index__in=[block.index for block in blocks]).update(timestamp=sealed_at)
+        for block in blocks:
+            block.timestamp = sealed_at
+
+    return blocks
+
+def _to_decimal(value):
+    """Convert a float amount to a 2-decimal Decimal"""
+    return Decimal(str(value)).quantize(Decimal('0.01'))
+
+def record_pnbp_transactions(fishing_area_code, transactions, run_id=None, block_size=500, difficulty=2):
+    """
+    Record the PNBP transactions of one WPP run in the ledger.
+    Transactions are grouped into blocks of `block_size`, all blocks are sealed
+    in one pass and the PNBPTransaction rows are written with bulk_create.
+    `transactions` are the dicts produced by the fco2 SmartContract.
+    """
+    transactions = list(transactions)
+    if not transactions:
+        return []
+
+    run_id = run_id or uuid.uuid4().hex
+    chunks = [transactions[i:i + block_size] for i in range(0, len(transactions), block_size)]
+    block_data_list = [
+        json.dumps({
+            'type': 'pnbp',
+            'run_id': run_id,
+            'fishing_area_code': fishing_area_code,
+            'transactions': chunk
+        }, sort_keys=True, default=str)
+        for chunk in chunks
+    ]
+    ships = Ship.objects.in_bulk(
+        {str(item['ship_id']) for item in transactions},
+        field_name='registration_number'
+    )
+
+    with transaction.atomic():
+        blocks = seal_blocks(block_data_list, difficulty)
+        records = [
+            PNBPTransaction(
+                block=block,
+                run_id=run_id,
+                fishing_area_code=fishing_area_code,
+                ship_identifier=str(item['ship_id']),
+                ship=ships.get(str(item['ship_id'])),
+                quota_kg=_to_decimal(item['kuota_kg']),
+                catch_kg=_to_decimal(item['hasil_tangkap_kg']),
+                fish_price=_to_decimal(item.get('harga_ikan_rp', 0)),
+                base_fee=_to_decimal(item['biaya_awal_rp']),
+                catch_value=_to_decimal(item['hasil_tangkapan_rp']),
+                quota_fee=_to_decimal(item['biaya_5_persen_rp']),
+                total_pnbp=_to_decimal(item['total_pnbp_final_rp'])
+            )
+            for block, chunk in zip(blocks, chunks)
+            for item in chunk
+        ]
+        PNBPTransaction.objects.bulk_create(records)
+
+    return records
+
 def verify_blockchain():
     """Verify the integrity of the blockchain"""
     blocks = BlockchainBlock.objects.order_by('index')
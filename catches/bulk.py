@@ -0,0 +1,210 @@
+"""
+Bulk ingestion of catch reports.
+Reports are processed in chunks: ships, species and fishing areas of a chunk are
+resolved with one IN query each, every report is validated, and the valid ones
+are written with bulk_create and anchored in the ledger in a single sealing pass.
+"""
+
+import logging
+from itertools import islice
+from django.db import transaction
+from rest_framework import serializers
+from ships.models import Ship
+from fish.models import FishSpecies
+from fish.lookup import SpeciesResolver
+from regions.models import FishingArea
+from blockchain.utils import create_catch_report_transactions
+from .models import FishCatch, CatchDetail
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class BulkCatchDetailSerializer(serializers.Serializer):
+    """One detail line of a bulk catch report; species by ID or by name"""
+    fish_species = serializers.IntegerField(required=False)
+    fish_species_name = serializers.CharField(required=False)
+    quantity = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    unit = serializers.CharField(max_length=20, default='kg')
+    value = serializers.DecimalField(max_digits=12, decimal_places=2, required=False, allow_null=True)
+    notes = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    def validate(self, attrs):
+        if 'fish_species' not in attrs and not attrs.get('fish_species_name'):
+            raise serializers.ValidationError("fish_species atau fish_species_name wajib diisi")
+        return attrs
+
+
+class BulkCatchReportSerializer(serializers.Serializer):
+    """One catch report of a bulk upload; validated without database access"""
+    ship_registration_number = serializers.CharField(max_length=100)
+    catch_date = serializers.DateField()
+    catch_type = serializers.ChoiceField(choices=FishCatch.CATCH_TYPE_CHOICES)
+    location_latitude = serializers.DecimalField(max_digits=9, decimal_places=6)
+    location_longitude = serializers.DecimalField(max_digits=9, decimal_places=6)
+    fishing_area_code = serializers.CharField(max_length=20, required=False, allow_null=True)
+    description = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    catch_details = BulkCatchDetailSerializer(many=True, allow_empty=False)
+
+
+def _chunks(items, size):
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _resolve_references(reports, species_names):
+    """
+    Load the ships, species and fishing areas referenced by a chunk with one query each.
+    Species given by name are resolved through ``species_names`` (a SpeciesResolver).
+    """
+    registration_numbers = set()
+    species_ids = set()
+    area_codes = set()
+    for report in reports:
+        registration_numbers.add(report['ship_registration_number'])
+        if report.get('fishing_area_code'):
+            area_codes.add(report['fishing_area_code'])
+        for detail in report['catch_details']:
+            if 'fish_species' in detail:
+                species_ids.add(detail['fish_species'])
+            else:
+                species_ids.add(species_names.resolve(detail['fish_species_name']))
+    species_ids.discard(None)
+
+    ships = Ship.objects.in_bulk(registration_numbers, field_name='registration_number')  # type: ignore
+    species = FishSpecies._default_manager.in_bulk(species_ids)  # type: ignore
+    areas = FishingArea._default_manager.in_bulk(area_codes, field_name='code')  # type: ignore
+    return ships, species, areas
+
+
+def _build_report(report, species_names, ships, species, areas):
+    """Build unsaved FishCatch/CatchDetail objects for a report, or return its errors"""
+    errors = {}
+    ship = ships.get(report['ship_registration_number'])
+    if ship is None:
+        errors['ship_registration_number'] = [
+            f"Kapal dengan nomor registrasi '{report['ship_registration_number']}' tidak ditemukan"
+        ]
+
+    area = None
+    if report.get('fishing_area_code'):
+        area = areas.get(report['fishing_area_code'])
+        if area is None:
+            errors['fishing_area_code'] = [f"Wilayah penangkapan '{report['fishing_area_code']}' tidak ditemukan"]
+
+    details = []
+    detail_errors = []
+    for detail in report['catch_details']:
+        if 'fish_species' in detail:
+            fish_species = species.get(detail['fish_species'])
+            reference = detail['fish_species']
+        else:
+            fish_species = species.get(species_names.resolve(detail['fish_species_name']))
+            reference = detail['fish_species_name']
+        if fish_species is None:
+            detail_errors.append({'fish_species': [f"Jenis ikan '{reference}' tidak ditemukan"]})
+            continue
+        detail_errors.append({})
+        details.append(CatchDetail(
+            fish_species=fish_species,
+            quantity=detail['quantity'],
+            unit=detail['unit'],
+            value=detail.get('value'),
+            notes=detail.get('notes')
+        ))
+    if any(detail_errors):
+        errors['catch_details'] = detail_errors
+
+    if errors:
+        return None, errors
+
+    fish_catch = FishCatch(
+        ship=ship,
+        fishing_area=area,
+        catch_date=report['catch_date'],
+        catch_type=report['catch_type'],
+        location_latitude=report['location_latitude'],
+        location_longitude=report['location_longitude'],
+        description=report.get('description')
+    )
+    return (fish_catch, details), None
+
+
+def _write_chunk(built):
+    """Insert a chunk of valid reports and anchor them in the ledger"""
+    with transaction.atomic():
+        catches = FishCatch._default_manager.bulk_create([fish_catch for fish_catch, _ in built])  # type: ignore
+        details = []
+        for fish_catch, catch_details in zip(catches, (catch_details for _, catch_details in built)):
+            for detail in catch_details:
+                detail.fish_catch = fish_catch
+                details.append(detail)
+        CatchDetail._default_manager.bulk_create(details)  # type: ignore
+
+    try:
+        create_catch_report_transactions(built)
+    except Exception:
+        # The chunk is already committed; only its ledger blocks are missing
+        logger.exception('Error adding catch reports to blockchain', extra={'reports': len(catches)})
+
+
+def ingest_catch_reports(reports, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Validate and store catch reports in chunks.
+
+    `reports` can be any iterable (a parsed JSON array or a stream of NDJSON
+    lines). Returns a dict with the created/failed counts and one result per
+    report, in input order.
+    """
+    results = []
+    created = 0
+    index = 0
+    # Species names (case-insensitive, scientific names as aliases) are resolved from one preloaded map
+    species_names = SpeciesResolver()
+
+    for chunk in _chunks(reports, chunk_size):
+        valid = []
+        for data in chunk:
+            serializer = BulkCatchReportSerializer(data=data)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results.append({'index': index, 'status': 'error', 'errors': serializer.errors})
+            index += 1
+
+        if not valid:
+            continue
+
+        references = _resolve_references([report for _, report in valid], species_names)
+        built = []
+        built_indexes = []
+        for report_index, report in valid:
+            report_objects, errors = _build_report(report, species_names, *references)
+            if errors:
+                results.append({'index': report_index, 'status': 'error', 'errors': errors})
+            else:
+                built.append(report_objects)
+                built_indexes.append(report_index)
+
+        if built:
+            _write_chunk(built)
+            created += len(built)
+            for report_index, (fish_catch, catch_details) in zip(built_indexes, built):
+                results.append({
+                    'index': report_index,
+                    'status': 'created',
+                    'id': fish_catch.pk,
+                    'catch_details': len(catch_details)
+                })
+
+    results.sort(key=lambda result: result['index'])
+    return {
+        'created': created,
+        'failed': len(results) - created,
+        'results': results
+    }
@@ -0,0 +1,178 @@
+"""
+Catch data as pandas DataFrames for model training (see fco2.py).
+
+``load_catch_frame`` builds the ``Tanggal/WPP/Kapal/Hasil_Tangkapan_Kg`` frame
+that ``fco2.predict_lstm`` and friends expect, from one aggregated query read
+with ``values_list`` straight into ``pd.DataFrame.from_records`` (no model
+instances). Detail quantities are converted to kilograms in the query
+(``UNIT_TO_KG``); details in any other unit are left out of the totals rather
+than summed as if they were kilograms. Each ship's series is filled to one
+row per day, with 0 kg on days without a catch report. The frame is cached on disk
+(``CATCH_DATASET_CACHE_DIR``) under a key built from the latest
+``FishCatch.updated_at`` and the count, highest id and total quantity of the
+details, so repeated training runs read a pickle instead of querying again
+until the catch data changes.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from decimal import Decimal
+import pandas as pd
+from django.conf import settings
+from django.db.models import Case, Count, DecimalField, F, Max, Sum, Value, When
+from .models import FishCatch, CatchDetail, NO_AREA_CODE
+
+FRAME_COLUMNS = ['Tanggal', 'WPP', 'Kapal', 'Hasil_Tangkapan_Kg']
+# Bumped when the frame layout changes, so frames cached by older code are not reused
+FRAME_FORMAT = 3
+
+# Kilograms per unit for the ``CatchDetail.unit`` spellings in use (matched case-insensitively)
+UNIT_TO_KG = {
+    'kg': Decimal('1'),
+    'kilogram': Decimal('1'),
+    'ton': Decimal('1000'),
+    'tons': Decimal('1000'),
+    'tonne': Decimal('1000'),
+    'tonnes': Decimal('1000'),
+    't': Decimal('1000'),
+    'g': Decimal('0.001'),
+    'gram': Decimal('0.001'),
+}
+
+
+def quantity_kg():
+    """
+    ``CatchDetail.quantity`` in kilograms as a query expression. Details in a
+    unit missing from ``UNIT_TO_KG`` evaluate to NULL, so ``Sum`` skips them.
+    """
+    return Case(
+        *(When(unit__iexact=name, then=F('quantity') * Value(factor)) for name, factor in UNIT_TO_KG.items()),
+        output_field=DecimalField(max_digits=16, decimal_places=5),
+    )
+
+
+def catch_totals(wpp_ids=None):
+    """Daily catch totals in kg per fishing area and ship as a values_list queryset"""
+    details = CatchDetail._default_manager.all()  # type: ignore
+    if wpp_ids:
+        details = details.filter(fish_catch__fishing_area__code__in=list(wpp_ids))
+    return details.values(
+        'fish_catch__catch_date', 'fish_catch__fishing_area__code', 'fish_catch__ship__registration_number'
+    ).annotate(total=Sum(quantity_kg())).filter(total__isnull=False).order_by().values_list(
+        'fish_catch__catch_date', 'fish_catch__fishing_area__code',
+        'fish_catch__ship__registration_number', 'total'
+    )
+
+
+def ship_main_species(wpp_ids=None):
+    """
+    The species each ship caught the most of, by total weight in kg:
+    ``{registration_number: species name}``. fco2 uses it to price the PNBP fee per ship.
+    """
+    details = CatchDetail._default_manager.all()  # type: ignore
+    if wpp_ids:
+        details = details.filter(fish_catch__fishing_area__code__in=list(wpp_ids))
+    totals = details.values('fish_catch__ship__registration_number', 'fish_species__name').annotate(
+        total=Sum(quantity_kg())
+    ).filter(total__isnull=False).order_by().values_list(
+        'fish_catch__ship__registration_number', 'fish_species__name', 'total'
+    )
+
+    species = {}
+    best = {}
+    for registration_number, name, total in totals:
+        # Ties go to the alphabetically first species, so the result does not depend on row order
+        current = best.get(registration_number)
+        if current is None or (-total, name) < (-current[0], current[1]):
+            best[registration_number] = (total, name)
+            species[registration_number] = name
+    return species
+
+
+def fill_daily(frame):
+    """
+    Reindex every (WPP, Kapal) series to one row per day between its first and
+    last catch, with 0 kg on days without a report, as the LSTM windows and
+    ``forecast_days`` in fco2 expect a daily series.
+    """
+    if frame.empty:
+        return frame
+    daily = frame.set_index('Tanggal').groupby(['WPP', 'Kapal'], sort=False)['Hasil_Tangkapan_Kg'].resample('D').sum()
+    return daily.reset_index()[FRAME_COLUMNS]
+
+
+def build_catch_frame(wpp_ids=None):
+    """Query the catch tables and return the daily fco2 training frame"""
+    frame = pd.DataFrame.from_records(catch_totals(wpp_ids).iterator(), columns=FRAME_COLUMNS)
+    frame['Tanggal'] = pd.to_datetime(frame['Tanggal'])
+    frame['WPP'] = frame['WPP'].fillna(NO_AREA_CODE)
+    frame['Hasil_Tangkapan_Kg'] = frame['Hasil_Tangkapan_Kg'].astype(float)
+    return fill_daily(frame)
+
+
+def data_version():
+    """
+    Cheap fingerprint of the catch tables: the latest report change plus the
+    number, highest id and total quantity of catch details. Details have no
+    timestamp of their own, so added, deleted or edited details are caught
+    by the latter instead. The quantity is summed in kg, so an edit that only
+    changes a detail's unit changes the fingerprint too.
+    """
+    catches = FishCatch._default_manager.aggregate(updated_at=Max('updated_at'))  # type: ignore
+    details = CatchDetail._default_manager.aggregate(  # type: ignore
+        count=Count('pk'), last_id=Max('pk'), quantity=Sum(quantity_kg())
+    )
+    updated_at = catches['updated_at']
+    return {
+        'updated_at': updated_at.isoformat() if updated_at else None,
+        'details': details['count'],
+        'last_detail_id': details['last_id'],
+        'quantity': str(details['quantity']),
+    }
+
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def get_cache_dir():
+    return getattr(settings, 'CATCH_DATASET_CACHE_DIR', None)
+
+
+def load_catch_frame(wpp_ids=None, use_cache=True, cache_dir=None):
+    """
+    Return the fco2 training frame, from the on-disk cache when the catch
+    data has not changed since it was written.
+    """
+    cache_dir = cache_dir or get_cache_dir()
+    if not use_cache or not cache_dir:
+        return build_catch_frame(wpp_ids)
+
+    selection = _digest(sorted(wpp_ids) if wpp_ids else None)
+    version = _digest(dict(data_version(), frame_format=FRAME_FORMAT))
+    path = os.path.join(cache_dir, f'catch_frame_{selection}_{version}.pkl')
+    if os.path.exists(path):
+        return pd.read_pickle(path)
+
+    frame = build_catch_frame(wpp_ids)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temporary file first so concurrent readers never see a partial pickle
+    fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    os.close(fd)
+    try:
+        frame.to_pickle(temp_path)
+        os.replace(temp_path, path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+
+    # Older versions of the same selection are stale now
+    for name in os.listdir(cache_dir):
+        if name.startswith(f'catch_frame_{selection}_') and os.path.join(cache_dir, name) != path:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except FileNotFoundError:  # removed by a concurrent loader
+                pass
+    return frame
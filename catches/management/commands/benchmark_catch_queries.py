@@ -0,0 +1,118 @@
+"""
+Management command to time the catch query hot paths, optionally with and
+without the composite indexes, for example on a dataset made with
+``generate_synthetic_catches``.
+"""
+
+import statistics
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Sum
+from django.db.models.functions import TruncMonth
+from catches.models import FishCatch, CatchDetail
+
+# Indexes added for these queries; dropped and recreated by --compare
+BENCHMARK_MODELS = [FishCatch, CatchDetail]
+
+
+def _run(queryset):
+    return list(queryset)
+
+
+def build_queries(ship_id, species_id, start_date, end_date):
+    """(name, callable) pairs mirroring the views and prediction code"""
+    ship_range = FishCatch._default_manager.filter(  # type: ignore
+        ship_id=ship_id, catch_date__gte=start_date, catch_date__lte=end_date
+    )
+    return [
+        # FishCatchViewSet.get_queryset with ship_id + start_date/end_date
+        ('list: ship + date range', lambda: _run(ship_range.order_by('catch_date')[:100])),
+        # FishCatchViewSet.get_queryset with start_date/end_date only
+        ('count: date range', lambda: FishCatch._default_manager.filter(  # type: ignore
+            catch_date__gte=start_date, catch_date__lte=end_date
+        ).count()),
+        # get_historical_catch_data / ai_ship_recommendations monthly trend
+        ('monthly totals: ship + date range', lambda: _run(
+            ship_range.annotate(month=TruncMonth('catch_date')).values('month')
+            .annotate(total=Sum('catch_details__quantity')).order_by('month')
+        )),
+        # ai_ship_recommendations species filter
+        ('details: reports + species', lambda: CatchDetail._default_manager.filter(  # type: ignore
+            fish_catch__in=ship_range, fish_species_id=species_id
+        ).aggregate(total=Sum('quantity'))),
+    ]
+
+
+def time_queries(queries, repeat):
+    """Median wall time in milliseconds of each query over ``repeat`` runs (after one warm-up run)"""
+    timings = {}
+    for name, query in queries:
+        query()
+        runs = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            query()
+            runs.append((time.perf_counter() - started) * 1000)
+        timings[name] = statistics.median(runs)
+    return timings
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the FishCatch/CatchDetail query hot paths (optionally with vs. without indexes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ship', default=None, help='Registration number of the ship to query (default: first ship with catches)')
+        parser.add_argument('--days', type=int, default=180, help='Length of the date range ending at the latest catch')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per query')
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help='Also time the queries with the composite indexes dropped; they are recreated afterwards',
+        )
+
+    def handle(self, *args, **options):
+        catches = FishCatch._default_manager.all()  # type: ignore
+        if options['ship']:
+            catches = catches.filter(ship__registration_number=options['ship'])
+        sample = catches.order_by('pk').values('ship_id').first()
+        if sample is None:
+            raise CommandError('No catch reports found; generate data first (manage.py generate_synthetic_catches)')
+
+        ship_id = sample['ship_id']
+        end_date = FishCatch._default_manager.aggregate(last=Max('catch_date'))['last'] or date.today()  # type: ignore
+        start_date = end_date - timedelta(days=options['days'])
+        species_id = CatchDetail._default_manager.filter(  # type: ignore
+            fish_catch__ship_id=ship_id
+        ).values_list('fish_species_id', flat=True).first()
+        repeat = max(1, options['repeat'])
+
+        self.stdout.write(
+            f'{FishCatch._default_manager.count()} catch reports, '  # type: ignore
+            f'{CatchDetail._default_manager.count()} catch details; '  # type: ignore
+            f'ship {ship_id}, {start_date} .. {end_date}, median of {repeat} runs'
+        )
+        queries = build_queries(ship_id, species_id, start_date, end_date)
+        with_indexes = time_queries(queries, repeat)
+
+        without_indexes = None
+        if options['compare']:
+            indexes = [(model, index) for model in BENCHMARK_MODELS for index in model._meta.indexes]
+            with connection.schema_editor() as editor:
+                for model, index in indexes:
+                    editor.remove_index(model, index)
+            try:
+                without_indexes = time_queries(queries, repeat)
+            finally:
+                with connection.schema_editor() as editor:
+                    for model, index in indexes:
+                        editor.add_index(model, index)
+
+        for name, elapsed in with_indexes.items():
+            line = f'{name:<36} {elapsed:10.2f} ms'
+            if without_indexes is not None:
+                before = without_indexes[name]
+                speedup = before / elapsed if elapsed else float('inf')
+                line += f'   without indexes {before:10.2f} ms   x{speedup:.1f}'
+            self.stdout.write(line)
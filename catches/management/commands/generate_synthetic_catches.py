@@ -0,0 +1,109 @@
+"""
+Management command to load synthetic catch data for load testing.
+The series follow the same trend + seasonal + noise shape as the fco2 simulator
+and are written with bulk_create, a chunk of ships at a time.
+"""
+
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from owners.models import Owner
+from ships.models import Ship
+from fish.models import FishSpecies
+from regions.models import FishingArea
+from catches.models import FishCatch, CatchDetail
+
+SYNTHETIC_PREFIX = 'SYN'
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic FishCatch/CatchDetail data for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wpps', type=int, default=10, help='Number of WPP fishing areas')
+        parser.add_argument('--ships-per-wpp', type=int, default=10, help='Number of ships per WPP')
+        parser.add_argument('--start-date', default='2023-01-01', help='First catch date (YYYY-MM-DD)')
+        parser.add_argument('--end-date', default='2025-01-01', help='Last catch date (YYYY-MM-DD)')
+        parser.add_argument('--species', default='Tuna', help='Fish species used for the catch details')
+        parser.add_argument('--ships-per-chunk', type=int, default=10, help='Ships generated and inserted per transaction')
+        parser.add_argument('--batch-size', type=int, default=2000, help='bulk_create batch size')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible data')
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete previously generated synthetic ships (and their catches) first',
+        )
+
+    def handle(self, *args, **options):
+        dates = pd.date_range(start=options['start_date'], end=options['end_date'], freq='D')
+        if options['wpps'] < 1 or options['ships_per_wpp'] < 1 or len(dates) == 0:
+            raise CommandError('wpps, ships-per-wpp and the date range must not be empty')
+
+        rng = np.random.default_rng(options['seed'])
+        batch_size = options['batch_size']
+
+        if options['clear']:
+            deleted, _ = Ship.objects.filter(registration_number__startswith=f'{SYNTHETIC_PREFIX}-').delete()  # type: ignore
+            self.stdout.write(f'Deleted {deleted} synthetic records')
+
+        owner, _ = Owner.objects.get_or_create(  # type: ignore
+            full_name='Pemilik Sintetis',
+            defaults={'owner_type': 'company'}
+        )
+        species, _ = FishSpecies.objects.get_or_create(name=options['species'])  # type: ignore
+
+        ships = []
+        for wpp_number in range(711, 711 + options['wpps']):
+            area, _ = FishingArea.objects.get_or_create(  # type: ignore
+                code=f'WPP {wpp_number}',
+                defaults={'nama': f'WPP {wpp_number}'}
+            )
+            for ship_number in range(1, options['ships_per_wpp'] + 1):
+                ship, _ = Ship.objects.get_or_create(  # type: ignore
+                    registration_number=f'{SYNTHETIC_PREFIX}-{wpp_number}-{ship_number:04d}',
+                    defaults={'name': f'Kapal {ship_number}', 'owner': owner}
+                )
+                ships.append((ship, area))
+
+        # Same series shape as fco2.generate_synthetic_data
+        num_days = len(dates)
+        base = np.linspace(50, 150, num_days) + 30 * np.sin(2 * np.pi * dates.dayofyear.values / 365)
+        catch_dates = dates.date
+        latitudes = np.round(rng.uniform(-11.0, 6.0, len(ships)), 6)
+        longitudes = np.round(rng.uniform(95.0, 141.0, len(ships)), 6)
+
+        total_catches = 0
+        chunk_size = max(1, options['ships_per_chunk'])
+        for first in range(0, len(ships), chunk_size):
+            chunk = ships[first:first + chunk_size]
+            quantities = np.maximum(0, base + rng.normal(0, 10, (len(chunk), num_days))).astype(int)
+
+            with transaction.atomic():
+                catches = FishCatch.objects.bulk_create([  # type: ignore
+                    FishCatch(
+                        ship=ship,
+                        fishing_area=area,
+                        catch_date=catch_date,
+                        catch_type='pelagic',
+                        location_latitude=Decimal(str(latitudes[first + i])),
+                        location_longitude=Decimal(str(longitudes[first + i])),
+                    )
+                    for i, (ship, area) in enumerate(chunk)
+                    for catch_date in catch_dates
+                ], batch_size=batch_size)
+
+                CatchDetail.objects.bulk_create([  # type: ignore
+                    CatchDetail(fish_catch=fish_catch, fish_species=species, quantity=int(quantity))
+                    for fish_catch, quantity in zip(catches, quantities.ravel())
+                ], batch_size=batch_size)
+
+            total_catches += len(catches)
+            self.stdout.write(f'Inserted {total_catches} catch reports ({first + len(chunk)}/{len(ships)} ships)')
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully generated {total_catches} synthetic catch reports for {len(ships)} ships'
+            )
+        )
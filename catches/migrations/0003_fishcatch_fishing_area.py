@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catches', '0002_initial'),
+        ('regions', '0002_alter_fishingarea_options_alter_fishingarea_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fishcatch',
+            name='fishing_area',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='catch_reports', to='regions.fishingarea', verbose_name='Wilayah Penangkapan (WPP)'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catches', '0003_fishcatch_fishing_area'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='catchdetail',
+            index=models.Index(fields=['fish_catch', 'fish_species'], name='catchdetail_catch_species_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fishcatch',
+            index=models.Index(fields=['ship', 'catch_date'], name='fishcatch_ship_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fishcatch',
+            index=models.Index(fields=['catch_date'], name='fishcatch_date_idx'),
+        ),
+    ]
@@ -5,6 +5,10 @@ from django.db import models
 from django.core.validators import MinValueValidator
 from ships.models import Ship
 from fish.models import FishSpecies
+from regions.models import FishingArea
+
+# WPP code used for catch reports without a fishing area (API, exports and datasets)
+NO_AREA_CODE = 'N/A'
 
 class FishCatch(models.Model):
     """Model representing a fish catch report"""
@@ -19,16 +23,27 @@ class FishCatch(models.Model):
     catch_type = models.CharField(max_length=20, choices=CATCH_TYPE_CHOICES, verbose_name="Jenis Penangkapan")
     location_latitude = models.DecimalField(max_digits=9, decimal_places=6, verbose_name="Latitude Lokasi")
     location_longitude: DecimalField = models.DecimalField(max_digits=9, decimal_places=6, verbose_name="Longitude Lokasi")
+    fishing_area = models.ForeignKey(FishingArea, on_delete=models.SET_NULL, null=True, blank=True, related_name='catch_reports', verbose_name="Wilayah Penangkapan (WPP)")
     description = models.TextField(blank=True, null=True, verbose_name="Deskripsi")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"Laporan penangkapan untuk {self.ship.name} pada {self.catch_date}"
+
+    @property
+    def fishing_area_code(self):
+        """Kode WPP laporan, atau 'N/A' jika wilayah penangkapan belum diisi"""
+        return self.fishing_area.code if self.fishing_area_id else NO_AREA_CODE  # type: ignore
     
     class Meta:
         verbose_name = "Penangkapan Ikan"
         verbose_name_plural = "Penangkapan Ikan"
+        indexes = [
+            # Per-ship history and date-range filters (list filters, quota history, recommendations)
+            models.Index(fields=['ship', 'catch_date'], name='fishcatch_ship_date_idx'),
+            models.Index(fields=['catch_date'], name='fishcatch_date_idx'),
+        ]
 
 class CatchDetail(models.Model):
     """Model representing details of a fish catch (specific species and quantities)"""
@@ -44,4 +59,8 @@ class CatchDetail(models.Model):
     
     class Meta:
         verbose_name = "Detail Penangkapan"
-        verbose_name_plural = "Detail Penangkapan"
\ No newline at end of file
+        verbose_name_plural = "Detail Penangkapan"
+        indexes = [
+            # Details of a set of reports filtered by species
+            models.Index(fields=['fish_catch', 'fish_species'], name='catchdetail_catch_species_idx'),
+        ]
\ No newline at end of file
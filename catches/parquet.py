@@ -0,0 +1,208 @@
+"""
+Columnar (Parquet) export of the catch history for analytics.
+
+Every catch detail becomes one row, joined with its catch report, ship,
+species and fishing area. Rows are read with ``values_list().iterator()`` in
+chunks; each chunk is turned into an Arrow record batch and appended to the
+Parquet file of its partition, giving a hive-partitioned dataset
+(``year=2024/month=3/wpp=WPP%20712/part-0.parquet``) without holding the whole
+history in memory. The batches are written in the calling thread, which owns
+the database cursor. The result can be read with
+``pandas.read_parquet(path)`` or ``pyarrow.dataset.dataset(path, partitioning='hive')``.
+
+pyarrow is optional: ``is_available()`` tells whether the export can run.
+"""
+
+import os
+import shutil
+import tempfile
+import zipfile
+from urllib.parse import quote
+from .models import CatchDetail, NO_AREA_CODE
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed for this export
+    pa = None
+
+DEFAULT_CHUNK_SIZE = 50000
+PARTITION_COLUMNS = ['year', 'month', 'wpp']
+
+# (column, lookup) read from the database for every catch detail
+COLUMNS = [
+    ('catch_id', 'fish_catch_id'),
+    ('catch_date', 'fish_catch__catch_date'),
+    ('catch_type', 'fish_catch__catch_type'),
+    ('ship_registration_number', 'fish_catch__ship__registration_number'),
+    ('ship_name', 'fish_catch__ship__name'),
+    ('fish_species', 'fish_species__name'),
+    ('scientific_name', 'fish_species__scientific_name'),
+    ('quantity', 'quantity'),
+    ('unit', 'unit'),
+    ('value', 'value'),
+    ('latitude', 'fish_catch__location_latitude'),
+    ('longitude', 'fish_catch__location_longitude'),
+    ('wpp', 'fish_catch__fishing_area__code'),
+]
+
+# Decimal columns and the database precision they are read with before becoming float64
+DECIMAL_COLUMNS = {'quantity': (10, 2), 'value': (12, 2), 'latitude': (9, 6), 'longitude': (9, 6)}
+
+
+class ParquetUnavailable(Exception):
+    """Raised when pyarrow is not installed"""
+
+
+def is_available():
+    return pa is not None
+
+
+def get_schema():
+    """Arrow schema of the exported rows, partition columns included"""
+    return pa.schema([
+        ('catch_id', pa.int64()),
+        ('catch_date', pa.date32()),
+        ('catch_type', pa.string()),
+        ('ship_registration_number', pa.string()),
+        ('ship_name', pa.string()),
+        ('fish_species', pa.string()),
+        ('scientific_name', pa.string()),
+        ('quantity', pa.float64()),
+        ('unit', pa.string()),
+        ('value', pa.float64()),
+        ('latitude', pa.float64()),
+        ('longitude', pa.float64()),
+        ('wpp', pa.string()),
+        ('year', pa.int16()),
+        ('month', pa.int8()),
+    ])
+
+
+def catch_detail_queryset(catches=None):
+    """Catch details to export, optionally limited to a FishCatch queryset"""
+    queryset = CatchDetail._default_manager.all()  # type: ignore
+    if catches is not None:
+        queryset = queryset.filter(fish_catch__in=catches)
+    return queryset.order_by('fish_catch__catch_date', 'pk')
+
+
+def _record_batch(rows, schema):
+    """Turn a chunk of value tuples into an Arrow record batch"""
+    columns = dict(zip((name for name, _ in COLUMNS), zip(*rows)))
+    arrays = {}
+    for name, values in columns.items():
+        if name in DECIMAL_COLUMNS:
+            # Vectorised Decimal -> float conversion instead of a Python loop
+            precision, scale = DECIMAL_COLUMNS[name]
+            arrays[name] = pa.array(values, pa.decimal128(precision, scale)).cast(pa.float64())
+        elif name == 'wpp':
+            arrays[name] = pa.array([code or NO_AREA_CODE for code in values], pa.string())
+        else:
+            arrays[name] = pa.array(values, schema.field(name).type)
+    arrays['year'] = pc.year(arrays['catch_date']).cast(pa.int16())
+    arrays['month'] = pc.month(arrays['catch_date']).cast(pa.int8())
+    return pa.RecordBatch.from_arrays([arrays[field.name] for field in schema], schema=schema)
+
+
+def iter_record_batches(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the rows of a CatchDetail queryset as Arrow record batches of up to ``chunk_size`` rows"""
+    schema = get_schema()
+    rows = queryset.values_list(*(lookup for _, lookup in COLUMNS)).iterator(chunk_size=chunk_size)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield _record_batch(chunk, schema)
+            chunk = []
+    if chunk:
+        yield _record_batch(chunk, schema)
+
+
+def _partition_dir(year, month, wpp):
+    # Same hive layout and URI escaping as pyarrow's own partitioned writes
+    return os.path.join(f'year={year}', f'month={month}', f'wpp={quote(wpp, safe="")}')
+
+
+def _write_partitions(directory, batches):
+    """
+    Write record batches below ``directory``, one Parquet file per partition.
+    Rows come ordered by catch date, so only the writers of the current month
+    are kept open; a partition seen again later gets an additional file.
+    """
+    schema = get_schema()
+    file_schema = pa.schema([field for field in schema if field.name not in PARTITION_COLUMNS])
+    writers = {}
+    files = {}
+    current_month = None
+    rows = 0
+    try:
+        for batch in batches:
+            table = pa.Table.from_batches([batch])
+            rows += table.num_rows
+            keys = zip(*(table[name].to_pylist() for name in PARTITION_COLUMNS))
+            for year, month, wpp in dict.fromkeys(keys):
+                if (year, month) != current_month:
+                    for writer in writers.values():
+                        writer.close()
+                    writers = {}
+                    current_month = (year, month)
+                mask = pc.and_(pc.and_(pc.equal(table['year'], year), pc.equal(table['month'], month)), pc.equal(table['wpp'], wpp))
+                part = table.filter(mask).select(file_schema.names)
+                writer = writers.get(wpp)
+                if writer is None:
+                    partition = _partition_dir(year, month, wpp)
+                    number = files.get(partition, 0)
+                    files[partition] = number + 1
+                    os.makedirs(os.path.join(directory, partition), exist_ok=True)
+                    writer = pq.ParquetWriter(os.path.join(directory, partition, f'part-{number}.parquet'), file_schema)
+                    writers[wpp] = writer
+                writer.write_table(part)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return rows, list(files)
+
+
+def write_catch_dataset(path, queryset=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Write the catch history to ``path`` as a Parquet dataset partitioned by
+    year, month and WPP. Partitions present in the export replace the files
+    of a previous export; other partitions are left alone.
+
+    Returns the number of rows written.
+    """
+    if not is_available():
+        raise ParquetUnavailable('pyarrow is required for Parquet exports (pip install pyarrow)')
+
+    queryset = queryset if queryset is not None else catch_detail_queryset()
+    os.makedirs(path, exist_ok=True)
+    # Written next to the target first, so a failed export leaves the previous one intact
+    staging = tempfile.mkdtemp(prefix='.staging-', dir=path)
+    try:
+        rows, partitions = _write_partitions(staging, iter_record_batches(queryset, chunk_size))
+        for partition in partitions:
+            target = os.path.join(path, partition)
+            shutil.rmtree(target, ignore_errors=True)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(os.path.join(staging, partition), target)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return rows
+
+
+def write_catch_dataset_zip(output, queryset=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write the partitioned dataset into a zip archive on the binary file ``output``"""
+    directory = tempfile.mkdtemp(prefix='catch-parquet-')
+    try:
+        rows = write_catch_dataset(directory, queryset, chunk_size)
+        # Parquet files are already compressed
+        with zipfile.ZipFile(output, 'w', zipfile.ZIP_STORED) as archive:
+            for root, _, files in os.walk(directory):
+                for name in sorted(files):
+                    full_path = os.path.join(root, name)
+                    archive.write(full_path, os.path.relpath(full_path, directory))
+        return rows
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,30 @@
+import codecs
+import json
+from django.conf import settings
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline-delimited JSON into a lazy iterator of objects, so large
+    uploads are consumed line by line. Blank lines are skipped; a line that is
+    not valid JSON is yielded as its raw text so the caller can report it as an
+    invalid item instead of rejecting the whole upload.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        return self._iter_lines(codecs.getreader(encoding)(stream))
+
+    @staticmethod
+    def _iter_lines(reader):
+        for line in reader:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield line
@@ -1,8 +1,15 @@
+import logging
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import serializers
 from .models import FishCatch, CatchDetail
 from ships.models import Ship
+from ships.lookup import get_ship_id
+from blockchain.utils import create_fish_catch_transactions
 from fish.models import FishSpecies
 
+logger = logging.getLogger(__name__)
+
 class CatchDetailSerializer(serializers.ModelSerializer):
     fish_species_name = serializers.CharField(source='fish_species.name', read_only=True)
 
@@ -10,6 +17,27 @@ class CatchDetailSerializer(serializers.ModelSerializer):
         model = CatchDetail
         fields = '__all__'
 
+class CachedFishSpeciesField(serializers.PrimaryKeyRelatedField):
+    """Species primary key field that first looks in the species loaded by the parent serializer"""
+
+    def to_internal_value(self, data):
+        species_cache = self.context.get('fish_species_cache')
+        if species_cache is not None:
+            try:
+                species = species_cache.get(int(data))
+            except (TypeError, ValueError):
+                species = None
+            if species is not None:
+                return species
+        return super().to_internal_value(data)
+
+class NestedCatchDetailSerializer(CatchDetailSerializer):
+    """Catch detail written as part of its catch report; fish_catch is set by the parent"""
+    fish_species = CachedFishSpeciesField(queryset=FishSpecies._default_manager.all())
+
+    class Meta(CatchDetailSerializer.Meta):
+        read_only_fields = ['fish_catch']
+
 class FishCatchSerializer(serializers.ModelSerializer):
     ship_name = serializers.CharField(source='ship.name', read_only=True)
     catch_details = CatchDetailSerializer(many=True, read_only=True)
@@ -21,21 +49,19 @@ class FishCatchSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         ship_registration = validated_data.pop('ship')
-        try:
-            ship = Ship.objects.get(registration_number=ship_registration)
-            validated_data['ship'] = ship
-        except Ship.DoesNotExist:
+        ship_id = get_ship_id(ship_registration)
+        if ship_id is None:
             raise serializers.ValidationError(f"Kapal dengan nomor registrasi '{ship_registration}' tidak ditemukan")
+        validated_data['ship_id'] = ship_id
         return super().create(validated_data)
 
     def update(self, instance, validated_data):
         ship_registration = validated_data.pop('ship', None)
         if ship_registration:
-            try:
-                ship = Ship.objects.get(registration_number=ship_registration)
-                validated_data['ship'] = ship
-            except Ship.DoesNotExist:
+            ship_id = get_ship_id(ship_registration)
+            if ship_id is None:
                 raise serializers.ValidationError(f"Kapal dengan nomor registrasi '{ship_registration}' tidak ditemukan")
+            validated_data['ship_id'] = ship_id
         return super().update(instance, validated_data)
 
     class Meta:
@@ -44,38 +70,110 @@ class FishCatchSerializer(serializers.ModelSerializer):
 
 class FishCatchWithDetailsSerializer(serializers.ModelSerializer):
     """Serializer for creating FishCatch with nested CatchDetails in a single request"""
-    catch_details = CatchDetailSerializer(many=True, write_only=True)
+    catch_details = NestedCatchDetailSerializer(many=True, write_only=True)
     ship_name = serializers.CharField(source='ship.name', read_only=True)
     catch_details_display = CatchDetailSerializer(many=True, read_only=True, source='catch_details')
     
+    # Detail fields compared when deciding whether an existing line changed
+    DETAIL_FIELDS = ['quantity', 'unit', 'value', 'notes']
+
     class Meta:
         model = FishCatch
         fields = '__all__'
         read_only_fields = ['created_at', 'updated_at']
     
+    def to_internal_value(self, data):
+        # Load every referenced species in one query instead of one per detail line
+        catch_details = data.get('catch_details') if hasattr(data, 'get') else None
+        if isinstance(catch_details, list):
+            species_ids = set()
+            for detail in catch_details:
+                try:
+                    species_ids.add(int(detail.get('fish_species')))
+                except (AttributeError, TypeError, ValueError):
+                    continue
+            self.context['fish_species_cache'] = FishSpecies._default_manager.in_bulk(species_ids)  # type: ignore
+        return super().to_internal_value(data)
+
+    def to_representation(self, instance):
+        # Load the details with their species in one query when they were not prefetched
+        if 'catch_details' not in getattr(instance, '_prefetched_objects_cache', {}):
+            prefetch_related_objects([instance], Prefetch(
+                'catch_details',
+                queryset=CatchDetail._default_manager.select_related('fish_species')
+            ))
+        return super().to_representation(instance)
+
     def create(self, validated_data):
         catch_details_data = validated_data.pop('catch_details', [])
-        fish_catch = FishCatch._default_manager.create(**validated_data)
-        
-        for detail_data in catch_details_data:
-            CatchDetail._default_manager.create(fish_catch=fish_catch, **detail_data)
+
+        with transaction.atomic():
+            fish_catch = FishCatch._default_manager.create(**validated_data)
+            details = CatchDetail._default_manager.bulk_create([
+                CatchDetail(fish_catch=fish_catch, **detail_data)
+                for detail_data in catch_details_data
+            ])
+            self.anchor_details(fish_catch, details)
         
         return fish_catch
     
     def update(self, instance, validated_data):
         catch_details_data = validated_data.pop('catch_details', None)
         
-        # Update FishCatch fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-        
-        # Update catch details if provided
-        if catch_details_data is not None:
-            # Delete existing details
-            instance.catch_details.all().delete()
-            # Create new details
-            for detail_data in catch_details_data:
-                CatchDetail._default_manager.create(fish_catch=instance, **detail_data)
+        with transaction.atomic():
+            # Update FishCatch fields
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+            
+            # Update catch details if provided, touching only the lines that changed
+            if catch_details_data is not None:
+                self.sync_details(instance, catch_details_data)
         
         return instance
+
+    def sync_details(self, instance, catch_details_data):
+        """
+        Diff the submitted details against the stored ones, keyed by fish species:
+        matching lines are updated only when a field changed, new lines are
+        bulk-created and lines that are no longer submitted are deleted.
+        """
+        existing = {}
+        for detail in instance.catch_details.select_related('fish_species'):
+            existing.setdefault(detail.fish_species_id, []).append(detail)
+
+        to_create = []
+        to_update = []
+        for detail_data in catch_details_data:
+            matches = existing.get(detail_data['fish_species'].pk)
+            if not matches:
+                to_create.append(CatchDetail(fish_catch=instance, **detail_data))
+                continue
+
+            detail = matches.pop(0)
+            changed = False
+            for field in self.DETAIL_FIELDS:
+                if field in detail_data and getattr(detail, field) != detail_data[field]:
+                    setattr(detail, field, detail_data[field])
+                    changed = True
+            if changed:
+                to_update.append(detail)
+
+        stale_ids = [detail.pk for details in existing.values() for detail in details]
+        if stale_ids:
+            CatchDetail._default_manager.filter(pk__in=stale_ids).delete()
+        if to_update:
+            CatchDetail._default_manager.bulk_update(to_update, self.DETAIL_FIELDS)
+        created = CatchDetail._default_manager.bulk_create(to_create)
+
+        self.anchor_details(instance, list(created) + to_update)
+
+    def anchor_details(self, fish_catch, details):
+        """Record the written details in the blockchain ledger as one block per catch report"""
+        try:
+            # Savepoint so a ledger failure does not break the surrounding transaction
+            with transaction.atomic():
+                create_fish_catch_transactions(fish_catch, details)
+        except Exception:
+            # The catch report and its details are still saved, just without a ledger block
+            logger.exception('Error adding catch to blockchain', extra={'fish_catch_id': fish_catch.pk})
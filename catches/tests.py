@@ -1,3 +1,329 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO, StringIO
+from typing import cast
+from unittest import skipUnless
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from owners.models import Owner
+from fish.models import FishSpecies
+from ships.models import Ship
+from regions.models import FishingArea
+from blockchain.models import BlockchainBlock, FishCatchTransaction
+from catches.models import FishCatch, CatchDetail
+from catches import parquet
+from catches.datasets import load_catch_frame, ship_main_species
 
-# Create your tests here.
+
+class GenerateSyntheticCatchesCommandTestCase(TestCase):
+    def run_command(self, *args):
+        call_command(
+            'generate_synthetic_catches',
+            '--wpps', '2', '--ships-per-wpp', '3',
+            '--start-date', '2024-01-01', '--end-date', '2024-01-10',
+            '--ships-per-chunk', '4', '--seed', '1',
+            *args,
+            stdout=StringIO()
+        )
+
+    def test_generates_catches_for_every_ship_and_day(self):
+        """Every WPP x ship x day gets one catch report with one detail"""
+        self.run_command()
+
+        self.assertEqual(FishingArea.objects.filter(code__startswith='WPP ').count(), 2)  # type: ignore
+        self.assertEqual(Ship.objects.filter(registration_number__startswith='SYN-').count(), 6)  # type: ignore
+        self.assertEqual(FishCatch.objects.count(), 6 * 10)  # type: ignore
+        self.assertEqual(CatchDetail.objects.count(), 6 * 10)  # type: ignore
+        self.assertFalse(FishCatch.objects.filter(fishing_area__isnull=True).exists())  # type: ignore
+
+    def test_clear_replaces_previous_run(self):
+        """--clear removes earlier synthetic data instead of appending to it"""
+        self.run_command()
+        self.run_command('--clear')
+
+        self.assertEqual(FishCatch.objects.count(), 6 * 10)  # type: ignore
+
+
+class FishCatchWithDetailsBulkTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        User = get_user_model()
+        self.client.force_authenticate(user=User.objects.create_user(username='testuser', password='testpass123'))
+
+        owner = Owner.objects.create(full_name='Test Owner', owner_type='individual')
+        self.ship = Ship.objects.create(name='Kapal Satu', registration_number='KS001', owner=owner)
+        self.species = [FishSpecies.objects.create(name=f'Ikan {i}') for i in range(30)]  # type: ignore
+        self.url = reverse('fishcatch-with-details-list')
+
+    def payload(self, details):
+        return {
+            'ship': self.ship.pk,
+            'catch_date': '2024-01-15',
+            'catch_type': 'pelagic',
+            'location_latitude': '1.000000',
+            'location_longitude': '2.000000',
+            'catch_details': details
+        }
+
+    def test_create_report_with_many_species_in_few_queries(self):
+        """A 30-species report is written with bulk inserts and anchored in one block"""
+        details = [{'fish_species': species.pk, 'quantity': '10.00', 'unit': 'kg'} for species in self.species]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = cast(Response, self.client.post(self.url, self.payload(details), format='json'))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(CatchDetail.objects.count(), 30)  # type: ignore
+        self.assertEqual(FishCatchTransaction.objects.count(), 30)  # type: ignore
+        # Genesis block plus one block for the whole report
+        self.assertEqual(BlockchainBlock.objects.count(), 2)  # type: ignore
+        self.assertLess(len(queries), 20)
+
+    def test_update_only_touches_changed_details(self):
+        """Unchanged lines keep their ids, changed lines are updated and missing lines deleted"""
+        details = [{'fish_species': species.pk, 'quantity': '10.00', 'unit': 'kg'} for species in self.species[:3]]
+        response = cast(Response, self.client.post(self.url, self.payload(details), format='json'))
+        fish_catch = FishCatch.objects.get(pk=response.data['id'])  # type: ignore
+        original = {d.fish_species_id: d.pk for d in fish_catch.catch_details.all()}  # type: ignore
+
+        updated_details = [
+            {'fish_species': self.species[0].pk, 'quantity': '10.00', 'unit': 'kg'},
+            {'fish_species': self.species[1].pk, 'quantity': '25.50', 'unit': 'kg'},
+            {'fish_species': self.species[3].pk, 'quantity': '5.00', 'unit': 'kg'},
+        ]
+        response = cast(Response, self.client.put(
+            reverse('fishcatch-with-details-detail', args=[fish_catch.pk]),
+            self.payload(updated_details),
+            format='json'
+        ))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        current = {d.fish_species_id: d for d in fish_catch.catch_details.all()}  # type: ignore
+        self.assertEqual(set(current), {self.species[0].pk, self.species[1].pk, self.species[3].pk})
+        self.assertEqual(current[self.species[0].pk].pk, original[self.species[0].pk])
+        self.assertEqual(current[self.species[1].pk].pk, original[self.species[1].pk])
+        self.assertEqual(str(current[self.species[1].pk].quantity), '25.50')
+        # Only the changed and the new line are anchored again
+        self.assertEqual(FishCatchTransaction.objects.count(), 3 + 2)  # type: ignore
+
+
+class BulkCatchIngestionTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        User = get_user_model()
+        self.client.force_authenticate(user=User.objects.create_user(username='testuser', password='testpass123'))
+
+        owner = Owner.objects.create(full_name='Test Owner', owner_type='individual')
+        for i in range(5):
+            Ship.objects.create(name=f'Kapal {i}', registration_number=f'KS00{i}', owner=owner)
+        self.tuna = FishSpecies.objects.create(name='Tuna')
+        FishSpecies.objects.create(name='Cakalang')
+        FishingArea.objects.create(nama='WPP 711', code='WPP 711')  # type: ignore
+        self.url = reverse('fishcatch-with-details-bulk')
+
+    def report(self, registration_number='KS000', **overrides):
+        report = {
+            'ship_registration_number': registration_number,
+            'catch_date': '2024-01-15',
+            'catch_type': 'pelagic',
+            'location_latitude': '1.000000',
+            'location_longitude': '2.000000',
+            'fishing_area_code': 'WPP 711',
+            'catch_details': [
+                {'fish_species': self.tuna.pk, 'quantity': '10.00'},
+                {'fish_species_name': 'Cakalang', 'quantity': '4.50', 'unit': 'kg'}
+            ]
+        }
+        report.update(overrides)
+        return report
+
+    def test_bulk_json_array_with_per_item_results(self):
+        """Valid reports are stored and invalid ones reported by index"""
+        payload = [self.report('KS000'), self.report('UNKNOWN'), self.report('KS001', catch_type='invalid')]
+
+        response = cast(Response, self.client.post(self.url, payload, format='json'))
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 1)  # type: ignore
+        results = response.data['results']  # type: ignore
+        self.assertEqual([result['status'] for result in results], ['created', 'error', 'error'])
+        self.assertIn('ship_registration_number', results[1]['errors'])
+        self.assertIn('catch_type', results[2]['errors'])
+
+        fish_catch = FishCatch.objects.get(pk=results[0]['id'])  # type: ignore
+        self.assertEqual(fish_catch.fishing_area_code, 'WPP 711')
+        self.assertEqual(fish_catch.catch_details.count(), 2)  # type: ignore
+        self.assertEqual(FishCatchTransaction.objects.filter(fish_catch=fish_catch).count(), 2)  # type: ignore
+
+    def test_bulk_ndjson_stream(self):
+        """NDJSON uploads are parsed line by line and malformed lines become item errors"""
+        lines = [json.dumps(self.report(f'KS00{i}')) for i in range(3)] + ['{not json']
+        response = cast(Response, self.client.generic(
+            'POST', self.url, '\n'.join(lines) + '\n', content_type='application/x-ndjson'
+        ))
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 3)  # type: ignore
+        self.assertEqual(response.data['results'][3]['status'], 'error')  # type: ignore
+
+    def test_bulk_query_count_does_not_grow_with_reports(self):
+        """References are resolved with IN queries, so 100 reports cost about as much as 10"""
+        def ingest(count):
+            payload = [self.report(f'KS00{i % 5}') for i in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                response = cast(Response, self.client.post(self.url, payload, format='json'))
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+
+        small = ingest(10)
+        # Allow for the genesis block and SQLite splitting large inserts into batches
+        self.assertLessEqual(ingest(100), small + 3)
+
+
+@skipUnless(parquet.is_available(), 'pyarrow is not installed')
+class CatchParquetExportTestCase(TestCase):
+    def setUp(self):
+        owner = Owner.objects.create(full_name='Pemilik Satu', owner_type='individual')
+        ship = Ship.objects.create(name='Kapal Satu', registration_number='REG001', owner=owner)
+        species = FishSpecies.objects.create(name='Tuna', scientific_name='Thunnus')
+        area = FishingArea.objects.create(nama='Laut Jawa', code='WPP 712')
+        for catch_date, fishing_area, quantity in (
+            ('2024-01-05', area, '10.50'), ('2024-01-20', area, '4.25'), ('2024-02-01', None, '7.00')
+        ):
+            fish_catch = FishCatch.objects.create(
+                ship=ship, catch_date=catch_date, catch_type='pelagic',
+                location_latitude='-6.100000', location_longitude='106.800000', fishing_area=fishing_area
+            )
+            CatchDetail.objects.create(fish_catch=fish_catch, fish_species=species, quantity=quantity)
+
+    def test_command_writes_dataset_partitioned_by_year_month_and_wpp(self):
+        import pyarrow.dataset as ds
+        output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output, ignore_errors=True)
+
+        call_command('export_catch_parquet', output, '--chunk-size', '2', stdout=StringIO())
+
+        partitions = sorted(
+            os.path.relpath(root, output) for root, _, files in os.walk(output) if files
+        )
+        self.assertEqual(partitions, ['year=2024/month=1/wpp=WPP%20712', 'year=2024/month=2/wpp=N%2FA'])
+
+        table = ds.dataset(output, format='parquet', partitioning='hive').to_table()
+        rows = sorted(table.to_pylist(), key=lambda row: row['catch_date'])
+        self.assertEqual([row['quantity'] for row in rows], [10.5, 4.25, 7.0])
+        self.assertEqual(rows[0]['ship_registration_number'], 'REG001')
+        self.assertEqual(rows[0]['fish_species'], 'Tuna')
+        self.assertEqual(rows[0]['wpp'], 'WPP 712')
+        self.assertEqual(rows[2]['wpp'], 'N/A')
+
+    def test_endpoint_returns_zipped_dataset(self):
+        client = APIClient()
+        User = get_user_model()
+        client.force_authenticate(user=User.objects.create_user(username='testuser', password='testpass123'))
+
+        response = client.get(reverse('fishcatch-export-parquet'), {'start_date': '2024-02-01'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        archive = zipfile.ZipFile(BytesIO(b''.join(response.streaming_content)))  # type: ignore
+        self.assertEqual(archive.namelist(), ['year=2024/month=2/wpp=N%2FA/part-0.parquet'])
+
+
+class CatchDatasetTestCase(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        owner = Owner.objects.create(full_name='Pemilik Satu', owner_type='individual')
+        self.ship = Ship.objects.create(name='Kapal Satu', registration_number='REG001', owner=owner)
+        self.species = FishSpecies.objects.create(name='Tuna')
+        self.area = FishingArea.objects.create(nama='Laut Jawa', code='WPP 712')
+        self.fish_catch = self.add_catch('2024-01-05', self.area, ['10.50', '4.50'])
+        self.add_catch('2024-01-06', None, ['7.00'])
+
+    def add_catch(self, catch_date, area, quantities):
+        fish_catch = FishCatch.objects.create(
+            ship=self.ship, catch_date=catch_date, catch_type='pelagic',
+            location_latitude='-6.100000', location_longitude='106.800000', fishing_area=area
+        )
+        for quantity in quantities:
+            CatchDetail.objects.create(fish_catch=fish_catch, fish_species=self.species, quantity=quantity)
+        return fish_catch
+
+    def test_frame_matches_fco2_layout(self):
+        frame = load_catch_frame(use_cache=False).sort_values('Tanggal')
+        self.assertEqual(list(frame.columns), ['Tanggal', 'WPP', 'Kapal', 'Hasil_Tangkapan_Kg'])
+        self.assertEqual(frame['WPP'].tolist(), ['WPP 712', 'N/A'])
+        self.assertEqual(frame['Kapal'].tolist(), ['REG001', 'REG001'])
+        self.assertEqual(frame['Hasil_Tangkapan_Kg'].tolist(), [15.0, 7.0])
+        self.assertEqual(str(frame['Tanggal'].dtype), 'datetime64[ns]')
+
+    def test_gaps_between_catches_are_filled_with_zero(self):
+        """Each ship's series has one row per day, so fco2 windows span real days"""
+        self.add_catch('2024-01-09', self.area, ['3.00'])
+        frame = load_catch_frame(use_cache=False)
+        series = frame[frame['WPP'] == 'WPP 712'].sort_values('Tanggal')
+        self.assertEqual(
+            series['Tanggal'].dt.strftime('%Y-%m-%d').tolist(),
+            ['2024-01-05', '2024-01-06', '2024-01-07', '2024-01-08', '2024-01-09']
+        )
+        self.assertEqual(series['Hasil_Tangkapan_Kg'].tolist(), [15.0, 0.0, 0.0, 0.0, 3.0])
+        self.assertEqual(set(series['Kapal']), {'REG001'})
+
+    def test_mixed_units_are_summed_in_kg(self):
+        """A report with kg and tonne details is totalled in kg; unknown units are left out"""
+        fish_catch = self.add_catch('2024-01-07', self.area, ['20.00'])
+        CatchDetail.objects.create(fish_catch=fish_catch, fish_species=self.species, quantity='1.50', unit='ton')
+        CatchDetail.objects.create(fish_catch=fish_catch, fish_species=self.species, quantity='500.00', unit='Gram')
+        CatchDetail.objects.create(fish_catch=fish_catch, fish_species=self.species, quantity='9.00', unit='ekor')
+        frame = load_catch_frame(use_cache=False)
+        day = frame[(frame['WPP'] == 'WPP 712') & (frame['Tanggal'] == '2024-01-07')]
+        self.assertEqual(day['Hasil_Tangkapan_Kg'].tolist(), [1520.5])
+
+    def test_ship_main_species_is_the_largest_total(self):
+        mackerel = FishSpecies.objects.create(name='Tongkol')
+        fish_catch = self.add_catch('2024-01-07', self.area, [])
+        CatchDetail.objects.create(fish_catch=fish_catch, fish_species=mackerel, quantity='30.00')
+        self.assertEqual(ship_main_species(), {'REG001': 'Tongkol'})
+        self.assertEqual(ship_main_species(['WPP 711']), {})
+
+    def test_cached_frame_is_reused_until_catch_data_changes(self):
+        first = load_catch_frame(cache_dir=self.cache_dir)
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = load_catch_frame(cache_dir=self.cache_dir)
+        # Only the version check runs; the frame comes from disk
+        self.assertEqual(len(queries), 2)
+        self.assertTrue(cached.equals(first))
+
+        detail = CatchDetail.objects.filter(fish_catch=self.fish_catch).first()
+        CatchDetail.objects.filter(pk=detail.pk).update(quantity='20.50')  # type: ignore
+        refreshed = load_catch_frame(cache_dir=self.cache_dir)
+        self.assertEqual(sorted(refreshed['Hasil_Tangkapan_Kg'].tolist()), [7.0, 25.0])
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+
+class BenchmarkCatchQueriesCommandTestCase(TransactionTestCase):
+    def test_compare_restores_indexes(self):
+        call_command(
+            'generate_synthetic_catches', '--wpps', '1', '--ships-per-wpp', '2',
+            '--start-date', '2024-01-01', '--end-date', '2024-01-31', '--seed', '1', stdout=StringIO()
+        )
+        out = StringIO()
+        call_command('benchmark_catch_queries', '--compare', '--repeat', '1', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('62 catch reports, 62 catch details'))
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(all('without indexes' in line for line in lines[1:]))
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, FishCatch._meta.db_table)
+        self.assertEqual(constraints['fishcatch_ship_date_idx']['columns'], ['ship_id', 'catch_date'])
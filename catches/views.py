@@ -1,9 +1,16 @@
-from rest_framework import viewsets, permissions
+import tempfile
+from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
+from django.http import FileResponse
 from .models import FishCatch, CatchDetail
 from .serializers import FishCatchSerializer, CatchDetailSerializer, FishCatchWithDetailsSerializer
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from .bulk import BulkCatchReportSerializer, ingest_catch_reports
+from .parsers import NDJSONParser
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from fco_project.exports import export_response, get_export_format
+from . import parquet
 
 @extend_schema_view(
     list=extend_schema(
@@ -47,6 +54,51 @@ Filter yang Tersedia:
         tags=['Fish Catches'],
         summary='Hapus laporan tangkapan ikan',
         description='Menghapus laporan tangkapan ikan dari sistem.'
+    ),
+    export=extend_schema(
+        tags=['Fish Catches'],
+        summary='Ekspor laporan tangkapan ikan ke CSV/Excel',
+        description='''Mengekspor laporan tangkapan ikan sebagai file CSV atau XLSX yang dikirim secara streaming.
+Filter ship_id, start_date dan end_date sama seperti pada daftar laporan.''',
+        parameters=[
+            OpenApiParameter(
+                name='file_format',
+                description='Format file: csv (default) atau xlsx',
+                required=False,
+                type=str,
+                enum=['csv', 'xlsx']
+            ),
+            OpenApiParameter(name='ship_id', description='Memfilter berdasarkan ID kapal', required=False, type=int),
+            OpenApiParameter(name='start_date', description='Tanggal awal tangkapan (YYYY-MM-DD)', required=False, type=str),
+            OpenApiParameter(name='end_date', description='Tanggal akhir tangkapan (YYYY-MM-DD)', required=False, type=str),
+        ],
+        responses={
+            200: {
+                'content': {
+                    'text/csv': {'schema': {'type': 'string'}},
+                    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': {
+                        'schema': {'type': 'string', 'format': 'binary'}
+                    }
+                }
+            }
+        }
+    ),
+    export_parquet=extend_schema(
+        tags=['Fish Catches'],
+        summary='Ekspor riwayat tangkapan ke Parquet',
+        description='''Mengunduh riwayat tangkapan (detail tangkapan digabung dengan laporan, kapal, spesies
+dan WPP) sebagai arsip ZIP berisi dataset Parquet yang dipartisi per tahun/bulan/WPP
+(`year=2024/month=3/wpp=WPP 712/part-0.parquet`), untuk analisis dengan pandas/pyarrow.
+Filter ship_id, start_date dan end_date sama seperti pada daftar laporan.
+Mengembalikan HTTP 501 jika pyarrow tidak terpasang.''',
+        parameters=[
+            OpenApiParameter(name='ship_id', description='Memfilter berdasarkan ID kapal', required=False, type=int),
+            OpenApiParameter(name='start_date', description='Tanggal awal tangkapan (YYYY-MM-DD)', required=False, type=str),
+            OpenApiParameter(name='end_date', description='Tanggal akhir tangkapan (YYYY-MM-DD)', required=False, type=str),
+        ],
+        responses={
+            200: {'content': {'application/zip': {'schema': {'type': 'string', 'format': 'binary'}}}}
+        }
     )
 )
 class FishCatchViewSet(viewsets.ModelViewSet):
@@ -85,6 +137,47 @@ class FishCatchViewSet(viewsets.ModelViewSet):
             
         return queryset
 
+    EXPORT_COLUMNS = [
+        ('id', 'id'),
+        ('ship_registration_number', 'ship__registration_number'),
+        ('ship_name', 'ship__name'),
+        ('catch_date', 'catch_date'),
+        ('catch_type', 'catch_type'),
+        ('location_latitude', 'location_latitude'),
+        ('location_longitude', 'location_longitude'),
+        ('fishing_area_code', 'fishing_area__code'),
+        ('description', 'description'),
+        ('created_at', 'created_at'),
+    ]
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def export(self, request):
+        """Stream the (filtered) catch reports as CSV or XLSX (?file_format=csv|xlsx)"""
+        file_format = get_export_format(request)
+        if file_format is None:
+            return Response({'error': 'file_format must be csv or xlsx'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_queryset().order_by('pk')
+        return export_response(queryset, self.EXPORT_COLUMNS, 'fish_catches', file_format, sheet_name='Fish Catches')
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def export_parquet(self, request):
+        """Download the (filtered) catch history as a zipped Parquet dataset partitioned by year/month/WPP"""
+        if not parquet.is_available():
+            return Response(
+                {'error': 'Parquet export is not available: pyarrow is not installed'},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+
+        output = tempfile.TemporaryFile()
+        try:
+            parquet.write_catch_dataset_zip(output, parquet.catch_detail_queryset(self.get_queryset()))
+        except Exception:
+            output.close()
+            raise
+        output.seek(0)
+        return FileResponse(output, as_attachment=True, filename='catch_history_parquet.zip', content_type='application/zip')
+
 @extend_schema_view(
     create=extend_schema(
         tags=['Fish Catches'],
@@ -95,6 +188,46 @@ class FishCatchViewSet(viewsets.ModelViewSet):
         tags=['Fish Catches'],
         summary='Perbarui laporan tangkapan ikan dengan detail',
         description='Memperbarui laporan tangkapan ikan yang ada beserta detail spesies dan jumlah dalam satu permintaan.'
+    ),
+    bulk=extend_schema(
+        tags=['Fish Catches'],
+        summary='Unggah banyak laporan tangkapan ikan sekaligus',
+        description='''Mengunggah banyak laporan tangkapan ikan beserta detailnya dalam satu permintaan.
+
+Body berupa array JSON (`application/json`) atau satu laporan JSON per baris (`application/x-ndjson`).
+Kapal diidentifikasi dengan `ship_registration_number`, jenis ikan dengan `fish_species` (ID) atau
+`fish_species_name`, dan wilayah penangkapan (opsional) dengan `fishing_area_code`.
+
+Laporan yang valid disimpan, laporan yang tidak valid dilaporkan per item:
+- 201: semua laporan tersimpan
+- 207: sebagian laporan tersimpan
+- 400: tidak ada laporan yang tersimpan''',
+        request={
+            'application/json': BulkCatchReportSerializer(many=True),
+            'application/x-ndjson': BulkCatchReportSerializer,
+        },
+        responses={
+            201: {
+                'type': 'object',
+                'properties': {
+                    'created': {'type': 'integer'},
+                    'failed': {'type': 'integer'},
+                    'results': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'index': {'type': 'integer'},
+                                'status': {'type': 'string', 'enum': ['created', 'error']},
+                                'id': {'type': 'integer'},
+                                'catch_details': {'type': 'integer'},
+                                'errors': {'type': 'object'}
+                            }
+                        }
+                    }
+                }
+            }
+        }
     )
 )
 class FishCatchWithDetailsViewSet(viewsets.ModelViewSet):
@@ -128,6 +261,29 @@ class FishCatchWithDetailsViewSet(viewsets.ModelViewSet):
             
         return queryset.prefetch_related('catch_details', 'catch_details__fish_species', 'ship')
 
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated],
+            parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Ingest many catch reports (JSON array or NDJSON stream) and return per-item results
+        """
+        reports = request.data
+        if isinstance(reports, dict) or isinstance(reports, str):
+            return Response(
+                {'error': 'Body harus berupa array laporan tangkapan atau NDJSON'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        summary = ingest_catch_reports(reports)
+
+        if summary['failed'] == 0:
+            response_status = status.HTTP_201_CREATED
+        elif summary['created'] > 0:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(summary, status=response_status)
+
 @extend_schema_view(
     list=extend_schema(
         tags=['Fish Catches'],
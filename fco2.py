@@ -1,125 +1,576 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
+try:
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+except ImportError:  # Server tanpa Tk: hanya mode headless yang tersedia
+    tk = None
 import pandas as pd
 import numpy as np
 import torch
 import torch.nn as nn
 from sklearn.preprocessing import MinMaxScaler
-from platypus import NSGAIII, Problem, Real
+from platypus import NSGAIII, Problem, Real, Evaluator
 import threading
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import hashlib
 import json
 import time
 import datetime
+import argparse
+import sys
+import uuid
 
 # -----------------------------------------------------------------------------------
 # Bagian 1: Logika Inti (Simulasi, LSTM, NSGA-III)
 # -----------------------------------------------------------------------------------
 
-def generate_synthetic_data(num_wpps=10, num_ships_per_wpp=10, start_date='2023-01-01', end_date='2025-01-01'):
+def iter_synthetic_data(num_wpps=10, num_ships_per_wpp=10, start_date='2023-01-01', end_date='2025-01-01',
+                        ships_per_chunk=None):
     """
-    Membuat data tangkapan ikan sintetis.
+    Membuat data tangkapan ikan sintetis per potongan (chunk) tanpa membangun list baris.
+    Setiap potongan adalah DataFrame berisi ships_per_chunk series (WPP x kapal) lengkap,
+    dengan kolom WPP dan Kapal bertipe kategori yang sama di semua potongan.
     """
     dates = pd.date_range(start=start_date, end=end_date, freq='D')
     num_days = len(dates)
-    
-    data = []
     wpp_ids = [f'WPP {711 + i}' for i in range(num_wpps)]
-    
-    for wpp_id in wpp_ids:
-        for ship_id in range(1, num_ships_per_wpp + 1):
-            ship_id_str = f'Kapal {ship_id}'
-            
-            trend = np.linspace(50, 150, num_days)
-            seasonal = 30 * np.sin(2 * np.pi * dates.dayofyear / 365)
-            noise = np.random.normal(0, 10, num_days)
-            
-            catches = np.maximum(0, trend + seasonal + noise).astype(int)
-            
-            for date, catch in zip(dates, catches):
-                data.append({
-                    'Tanggal': date,
-                    'WPP': wpp_id,
-                    'Kapal': ship_id_str,
-                    'Hasil_Tangkapan_Kg': catch
-                })
-                
-    return pd.DataFrame(data)
+    ship_ids = [f'Kapal {i}' for i in range(1, num_ships_per_wpp + 1)]
+    wpp_dtype = pd.CategoricalDtype(wpp_ids)
+    ship_dtype = pd.CategoricalDtype(ship_ids)
+
+    num_series = num_wpps * num_ships_per_wpp
+    ships_per_chunk = ships_per_chunk or num_series
+
+    trend = np.linspace(50, 150, num_days)
+    seasonal = 30 * np.sin(2 * np.pi * dates.dayofyear.values / 365)
+    base = trend + seasonal
+
+    for first in range(0, num_series, ships_per_chunk):
+        series = np.arange(first, min(first + ships_per_chunk, num_series))
+        noise = np.random.normal(0, 10, (len(series), num_days))
+        catches = np.maximum(0, base + noise).astype(int)
+
+        yield pd.DataFrame({
+            'Tanggal': np.tile(dates.values, len(series)),
+            'WPP': pd.Categorical.from_codes(np.repeat(series // num_ships_per_wpp, num_days), dtype=wpp_dtype),
+            'Kapal': pd.Categorical.from_codes(np.repeat(series % num_ships_per_wpp, num_days), dtype=ship_dtype),
+            'Hasil_Tangkapan_Kg': catches.ravel(),
+        })
+
+# Jenis ikan tangkapan utama kapal-kapal sintetis (bergiliran per nomor kapal)
+SYNTHETIC_SPECIES = ['Tuna', 'Cakalang', 'Tongkol', 'Kakap', 'Kerapu']
+
+def synthetic_ship_species(num_ships_per_wpp=10):
+    """Jenis ikan utama setiap kapal sintetis: dict {Kapal: Jenis_Ikan}."""
+    return {f'Kapal {i}': SYNTHETIC_SPECIES[(i - 1) % len(SYNTHETIC_SPECIES)] for i in range(1, num_ships_per_wpp + 1)}
+
+def generate_synthetic_data(num_wpps=10, num_ships_per_wpp=10, start_date='2023-01-01', end_date='2025-01-01'):
+    """
+    Membuat data tangkapan ikan sintetis.
+    """
+    return next(iter_synthetic_data(num_wpps, num_ships_per_wpp, start_date, end_date))
+
+def write_synthetic_data(path, num_wpps=10, num_ships_per_wpp=10, start_date='2023-01-01', end_date='2025-01-01',
+                         ships_per_chunk=100):
+    """
+    Menulis data sintetis ke file Parquet atau CSV (berdasarkan ekstensi path) potongan demi potongan,
+    sehingga armada besar dapat dibuat tanpa menyimpan seluruh data di memori.
+    Mengembalikan jumlah baris yang ditulis.
+    """
+    chunks = iter_synthetic_data(num_wpps, num_ships_per_wpp, start_date, end_date, ships_per_chunk)
+    rows = 0
+
+    if path.endswith('.parquet'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        rows += len(chunk)
+    return rows
 
 class LSTM(nn.Module):
     """
     Model Jaringan Saraf Tiruan LSTM untuk prediksi time series.
+    Input berbentuk (batch, window, input_size); output adalah prediksi langkah berikutnya (batch, output_size).
     """
     def __init__(self, input_size=1, hidden_layer_size=50, output_size=1):
         super().__init__()
         self.hidden_layer_size = hidden_layer_size
-        self.lstm = nn.LSTM(input_size, hidden_layer_size)
+        self.lstm = nn.LSTM(input_size, hidden_layer_size, batch_first=True)
         self.linear = nn.Linear(hidden_layer_size, output_size)
-        self.hidden_cell = (torch.zeros(1,1,self.hidden_layer_size),
-                            torch.zeros(1,1,self.hidden_layer_size))
 
-    def forward(self, input_seq):
-        lstm_out, self.hidden_cell = self.lstm(input_seq.view(len(input_seq), 1, -1), self.hidden_cell)
-        predictions = self.linear(lstm_out.view(len(input_seq), -1))
-        return predictions[-1]
+    def features(self, input_seq, *extra):
+        """Menyiapkan fitur input untuk LSTM (subclass dapat menambahkan fitur lain)."""
+        return input_seq
+
+    def forward(self, input_seq, *extra):
+        lstm_out, _ = self.lstm(self.features(input_seq, *extra))
+        return self.linear(lstm_out[:, -1, :])
+
+    def encode(self, input_seq, *extra):
+        """
+        Menjalankan window awal sekali dan mengembalikan prediksi langkah berikutnya beserta hidden state.
+        """
+        lstm_out, hidden_cell = self.lstm(self.features(input_seq, *extra))
+        return self.linear(lstm_out[:, -1, :]), hidden_cell
+
+    def step(self, input_step, hidden_cell, *extra):
+        """
+        Satu langkah decoder: memproses satu nilai per series dengan hidden state yang dibawa dari langkah sebelumnya.
+        """
+        lstm_out, hidden_cell = self.lstm(self.features(input_step, *extra), hidden_cell)
+        return self.linear(lstm_out[:, -1, :]), hidden_cell
+
+class GlobalLSTM(LSTM):
+    """
+    Model LSTM global untuk banyak series sekaligus. Setiap series (kapal) memiliki embedding
+    yang digabungkan ke setiap langkah input, sehingga satu model dapat mempelajari pola semua kapal.
+    """
+    def __init__(self, num_series, embedding_dim=4, hidden_layer_size=50, output_size=1):
+        super().__init__(input_size=1 + embedding_dim, hidden_layer_size=hidden_layer_size, output_size=output_size)
+        self.embedding = nn.Embedding(num_series, embedding_dim)
+
+    def features(self, input_seq, series_ids):
+        embedded = self.embedding(series_ids).unsqueeze(1).expand(-1, input_seq.size(1), -1)
+        return torch.cat((input_seq, embedded), dim=-1)
+
+def make_windows(series, tw):
+    """
+    Membuat tensor window (batch, tw, 1) dan label (batch, 1) dari series 1-D menggunakan unfold,
+    tanpa loop Python.
+    """
+    windows = series.unfold(0, tw + 1, 1)
+    return windows[:, :tw].unsqueeze(-1), windows[:, tw:]
+
+def split_windows(tensors, validation_split=0.1):
+    """
+    Membagi tensor window secara kronologis menjadi data latih dan validasi (bagian akhir).
+    """
+    n_windows = len(tensors[0])
+    n_val = int(n_windows * validation_split) if n_windows >= 20 else 0
+    train = tuple(t[:n_windows - n_val] for t in tensors)
+    val = tuple(t[n_windows - n_val:] for t in tensors)
+    return train, val
 
-def create_inout_sequences(input_data, tw):
+def train_lstm_model(model, train_set, val_set=None, epochs=150, batch_size=64, lr=0.001, patience=10):
     """
-    Membuat sequence input dan output untuk model LSTM.
+    Melatih model dengan mini-batch dan early stopping pada data validasi.
+    train_set/val_set berupa tuple (inputs, labels) atau (inputs, labels, series_ids).
+    Mengembalikan model dengan bobot validasi terbaik.
     """
-    inout_seq = []
-    L = len(input_data)
-    for i in range(L-tw):
-        train_seq = input_data[i:i+tw]
-        train_label = input_data[i+tw:i+tw+1]
-        inout_seq.append((train_seq, train_label))
-    return inout_seq
+    def run(dataset, index=None):
+        inputs, labels, *extra = dataset if index is None else [t[index] for t in dataset]
+        return model(inputs, *extra), labels
+
+    has_validation = val_set is not None and len(val_set[0]) > 0
+    loss_function = nn.MSELoss()
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+
+    best_loss = float('inf')
+    best_state = None
+    epochs_without_improvement = 0
+
+    for epoch in range(epochs):
+        model.train()
+        permutation = torch.randperm(len(train_set[0]))
+        for start in range(0, len(permutation), batch_size):
+            optimizer.zero_grad()
+            y_pred, y_true = run(train_set, permutation[start:start + batch_size])
+            loss = loss_function(y_pred, y_true)
+            loss.backward()
+            optimizer.step()
+
+        if not has_validation:
+            continue
+
+        model.eval()
+        with torch.no_grad():
+            val_loss = loss_function(*run(val_set)).item()
+        if val_loss < best_loss - 1e-6:
+            best_loss = val_loss
+            best_state = {k: v.detach().clone() for k, v in model.state_dict().items()}
+            epochs_without_improvement = 0
+        else:
+            epochs_without_improvement += 1
+            if epochs_without_improvement >= patience:
+                break
 
-def predict_lstm(data_frame, wpp_id, ship_id, forecast_days=30, epochs=150):
+    if best_state is not None:
+        model.load_state_dict(best_state)
+    model.eval()
+    return model
+
+def forecast_autoregressive(model, last_windows, steps, series_ids=None):
+    """
+    Decoder inkremental: window terakhir dijalankan sekali, lalu hidden state dibawa maju satu langkah
+    per hari dengan prediksi sebelumnya sebagai input. Semua series diprediksi dalam satu batch.
+    last_windows berbentuk (batch, window, 1); hasil berbentuk (batch, steps).
+    """
+    extra = () if series_ids is None else (series_ids,)
+    forecasts = torch.empty(last_windows.size(0), steps)
+    if steps <= 0:
+        return forecasts
+    with torch.no_grad():
+        prediction, hidden_cell = model.encode(last_windows, *extra)
+        forecasts[:, 0] = prediction[:, 0]
+        for i in range(1, steps):
+            prediction, hidden_cell = model.step(prediction.unsqueeze(1), hidden_cell, *extra)
+            forecasts[:, i] = prediction[:, 0]
+    return forecasts
+
+def scaler_to_dict(scaler):
+    """Menyimpan parameter MinMaxScaler sebagai tipe dasar agar dapat disimpan di checkpoint."""
+    return {
+        'feature_range': list(scaler.feature_range),
+        'min_': scaler.min_.tolist(),
+        'scale_': scaler.scale_.tolist(),
+        'data_min_': scaler.data_min_.tolist(),
+        'data_max_': scaler.data_max_.tolist(),
+        'data_range_': scaler.data_range_.tolist(),
+        'n_samples_seen_': int(scaler.n_samples_seen_),
+    }
+
+def scaler_from_dict(params):
+    """Membangun kembali MinMaxScaler dari parameter checkpoint."""
+    scaler = MinMaxScaler(feature_range=tuple(params['feature_range']))
+    for name in ('min_', 'scale_', 'data_min_', 'data_max_', 'data_range_'):
+        setattr(scaler, name, np.array(params[name]))
+    scaler.n_samples_seen_ = params['n_samples_seen_']
+    scaler.n_features_in_ = len(params['min_'])
+    return scaler
+
+def series_fingerprint(values):
+    """Sidik jari data satu series: jumlah baris dan hash SHA-256 dari nilainya."""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    return {'rows': len(values), 'digest': hashlib.sha256(values.tobytes()).hexdigest()}
+
+def compare_fingerprint(fingerprint, values):
+    """
+    Membandingkan data saat ini dengan sidik jari checkpoint.
+    Mengembalikan 'unchanged', 'appended' (data lama tetap sama, ada baris baru) atau 'changed'.
+    """
+    if not fingerprint:
+        return 'changed'
+    rows = fingerprint['rows']
+    if len(values) == rows and series_fingerprint(values)['digest'] == fingerprint['digest']:
+        return 'unchanged'
+    if len(values) > rows and series_fingerprint(values[:rows])['digest'] == fingerprint['digest']:
+        return 'appended'
+    return 'changed'
+
+def fine_tune_epochs(epochs):
+    """Jumlah epoch untuk fine-tuning pada data baru."""
+    return max(5, epochs // 10)
+
+def _scale_series(values, scaler=None):
+    if scaler is None:
+        scaler = MinMaxScaler(feature_range=(-1, 1)).fit(values.reshape(-1, 1))
+    scaled = scaler.transform(values.reshape(-1, 1))
+    return scaler, torch.FloatTensor(scaled).squeeze(-1)
+
+def _predict_ship(values, forecast_days=30, epochs=150, train_window=12, checkpoint_entry=None):
+    """
+    Melatih (atau melanjutkan dari checkpoint) model LSTM untuk satu series dan memprediksi.
+    Mengembalikan (prediksi, entri checkpoint baru).
+    """
+    status = compare_fingerprint(checkpoint_entry.get('fingerprint') if checkpoint_entry else None, values)
+    model = LSTM()
+
+    if status == 'changed':
+        scaler, series = _scale_series(values)
+        train_set, val_set = split_windows(make_windows(series, train_window))
+        model = train_lstm_model(model, train_set, val_set, epochs=epochs)
+    else:
+        scaler, series = _scale_series(values, scaler_from_dict(checkpoint_entry['scaler']))
+        model.load_state_dict(checkpoint_entry['state_dict'])
+        model.eval()
+        if status == 'appended':
+            # Fine-tune hanya pada window yang labelnya merupakan data baru
+            old_rows = checkpoint_entry['fingerprint']['rows']
+            new_windows = make_windows(series[max(0, old_rows - train_window):], train_window)
+            model = train_lstm_model(model, new_windows, epochs=fine_tune_epochs(epochs), lr=0.0005)
+
+    last_seq = series[-train_window:].view(1, train_window, 1)
+    future_predicts = forecast_autoregressive(model, last_seq, forecast_days)[0].numpy()
+    predicts_unscaled = scaler.inverse_transform(future_predicts.reshape(-1, 1)).flatten()
+
+    entry = {
+        'state_dict': model.state_dict(),
+        'scaler': scaler_to_dict(scaler),
+        'fingerprint': series_fingerprint(values),
+        'status': status,
+    }
+    return predicts_unscaled, entry
+
+def predict_lstm(data_frame, wpp_id, ship_id, forecast_days=30, epochs=150, checkpoint=None):
     """
     Melatih model LSTM dan memprediksi hasil tangkapan di masa depan.
+    Jika checkpoint (dict per WPP) diberikan, model kapal dimuat/di-fine-tune dari checkpoint
+    dan entri kapal di dalamnya diperbarui.
     """
-    device = torch.device('cpu')
     ship_data = data_frame[(data_frame['WPP'] == wpp_id) & (data_frame['Kapal'] == ship_id)]
     
     if ship_data.empty or len(ship_data) < 20:
         return np.zeros(forecast_days)
         
     ship_data = ship_data.sort_values(by='Tanggal')
-    
-    scaler = MinMaxScaler(feature_range=(-1, 1))
-    scaled_data = scaler.fit_transform(ship_data['Hasil_Tangkapan_Kg'].values.reshape(-1, 1))
-    
-    train_window = 12
-    train_sequences = create_inout_sequences(torch.FloatTensor(scaled_data).to(device).squeeze(), train_window)
+    values = ship_data['Hasil_Tangkapan_Kg'].values.astype(np.float64)
 
-    model = LSTM().to(device)
-    loss_function = nn.MSELoss()
-    optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+    entry = checkpoint['ships'].get(ship_id) if checkpoint is not None else None
+    prediction, entry = _predict_ship(values, forecast_days, epochs, checkpoint_entry=entry)
+    if checkpoint is not None:
+        checkpoint['ships'][ship_id] = entry
+    return prediction
 
-    for i in range(epochs):
-        for seq, labels in train_sequences:
-            optimizer.zero_grad()
-            model.hidden_cell = (torch.zeros(1, 1, model.hidden_layer_size).to(device),
-                                 torch.zeros(1, 1, model.hidden_layer_size).to(device))
-            y_pred = model(seq)
-            single_loss = loss_function(y_pred, labels)
-            single_loss.backward()
-            optimizer.step()
+def predict_lstm_global(data_frame, wpp_id=None, ships=None, forecast_days=30, epochs=150, train_window=12,
+                        checkpoint=None):
+    """
+    Mode global: melatih satu model LSTM untuk semua kapal (dan WPP) sekaligus dan memprediksi
+    semua kapal dalam satu forward pass per langkah. Setiap series dinormalisasi dengan
+    MinMaxScaler-nya sendiri dan dibedakan dengan embedding kapal.
+    Jika checkpoint diberikan dan daftar series sama, model dimuat dan hanya di-fine-tune pada data baru.
+    Mengembalikan dict {(WPP, Kapal): array prediksi}.
+    """
+    frame = data_frame if wpp_id is None else data_frame[data_frame['WPP'] == wpp_id]
+    if ships is not None:
+        frame = frame[frame['Kapal'].isin(list(ships))]
+    frame = frame.sort_values(by='Tanggal')
+
+    results = {}
+    series_keys, series_values = [], []
+    for key, group in frame.groupby(['WPP', 'Kapal'], sort=False, observed=True):
+        if len(group) < 20:
+            results[key] = np.zeros(forecast_days)
+            continue
+        series_keys.append(key)
+        series_values.append(group['Hasil_Tangkapan_Kg'].values.astype(np.float64))
+
+    if not series_keys:
+        return results
+
+    saved = checkpoint.get('global') if checkpoint is not None else None
+    statuses = ['changed'] * len(series_keys)
+    if saved and [tuple(key) for key in saved['series_keys']] == series_keys:
+        statuses = [compare_fingerprint(fp, values) for fp, values in zip(saved['fingerprints'], series_values)]
+    warm_start = 'changed' not in statuses
+
+    scalers, series_list = [], []
+    for i, values in enumerate(series_values):
+        scaler, series = _scale_series(values, scaler_from_dict(saved['scalers'][i]) if warm_start else None)
+        scalers.append(scaler)
+        series_list.append(series)
+
+    model = GlobalLSTM(num_series=len(series_keys))
+    train_parts, val_parts = [], []
+    for series_id, series in enumerate(series_list):
+        if warm_start:
+            if statuses[series_id] != 'appended':
+                continue
+            # Hanya window dengan label baru
+            series = series[max(0, saved['fingerprints'][series_id]['rows'] - train_window):]
+        inputs, labels = make_windows(series, train_window)
+        ids = torch.full((len(inputs),), series_id, dtype=torch.long)
+        if warm_start:
+            train_parts.append((inputs, labels, ids))
+            continue
+        train_part, val_part = split_windows((inputs, labels, ids))
+        train_parts.append(train_part)
+        val_parts.append(val_part)
+
+    if warm_start:
+        model.load_state_dict(saved['state_dict'])
+        model.eval()
+        if train_parts:
+            train_set = tuple(torch.cat(parts) for parts in zip(*train_parts))
+            model = train_lstm_model(model, train_set, epochs=fine_tune_epochs(epochs), batch_size=256, lr=0.0005)
+    else:
+        train_set = tuple(torch.cat(parts) for parts in zip(*train_parts))
+        val_set = tuple(torch.cat(parts) for parts in zip(*val_parts))
+        # Ukuran batch lebih besar karena data berasal dari seluruh armada
+        model = train_lstm_model(model, train_set, val_set, epochs=epochs, batch_size=256)
+
+    series_ids = torch.arange(len(series_keys))
+    last_seq = torch.stack([series[-train_window:] for series in series_list]).unsqueeze(-1)
+    forecasts = forecast_autoregressive(model, last_seq, forecast_days, series_ids).numpy()
+    for key, scaler, forecast in zip(series_keys, scalers, forecasts):
+        results[key] = scaler.inverse_transform(forecast.reshape(-1, 1)).flatten()
+
+    if checkpoint is not None:
+        checkpoint['global'] = {
+            'series_keys': [list(key) for key in series_keys],
+            'state_dict': model.state_dict(),
+            'scalers': [scaler_to_dict(scaler) for scaler in scalers],
+            'fingerprints': [series_fingerprint(values) for values in series_values],
+            'status': 'changed' if not warm_start else ('appended' if train_parts else 'unchanged'),
+        }
+    return results
 
-    future_predicts = []
-    last_seq = train_sequences[-1][0] if train_sequences else torch.zeros(train_window)  ### PERBAIKAN: Handle jika sequences kosong
+# -----------------------------------------------------------------------------------
+# Checkpoint model per WPP
+# -----------------------------------------------------------------------------------
 
-    with torch.no_grad():
-        for i in range(forecast_days):
-            model.hidden_cell = (torch.zeros(1, 1, model.hidden_layer_size).to(device),
-                                 torch.zeros(1, 1, model.hidden_layer_size).to(device))
-            future_pred = model(last_seq)
-            future_predicts.append(future_pred.item())
-            last_seq = torch.cat((last_seq[1:], future_pred), dim=0)
+CHECKPOINT_DIR = os.environ.get(
+    'FCO2_CHECKPOINT_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'checkpoints')
+)
+CHECKPOINT_VERSION = 1
+
+def new_checkpoint(wpp_id):
+    """Checkpoint kosong untuk satu WPP (model per kapal dan/atau model global)."""
+    return {'version': CHECKPOINT_VERSION, 'wpp_id': wpp_id, 'ships': {}, 'global': None}
+
+def checkpoint_path(wpp_id, checkpoint_dir=None):
+    filename = "".join(c if c.isalnum() else "_" for c in str(wpp_id)) + ".pt"
+    return os.path.join(checkpoint_dir or CHECKPOINT_DIR, filename)
+
+def save_checkpoint(checkpoint, checkpoint_dir=None):
+    """Menyimpan checkpoint WPP ke disk (ditulis ke file sementara lalu di-rename)."""
+    path = checkpoint_path(checkpoint['wpp_id'], checkpoint_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    torch.save(checkpoint, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+def load_checkpoints(checkpoint_dir=None):
+    """Memuat semua checkpoint WPP dari disk. Mengembalikan dict {wpp_id: checkpoint}."""
+    checkpoint_dir = checkpoint_dir or CHECKPOINT_DIR
+    checkpoints = {}
+    if not os.path.isdir(checkpoint_dir):
+        return checkpoints
+    for filename in sorted(os.listdir(checkpoint_dir)):
+        if not filename.endswith(".pt"):
+            continue
+        try:
+            checkpoint = torch.load(os.path.join(checkpoint_dir, filename), weights_only=True)
+        except Exception as e:
+            print(f"Checkpoint {filename} tidak dapat dimuat: {e}")
+            continue
+        if checkpoint.get('version') == CHECKPOINT_VERSION:
+            checkpoints[checkpoint['wpp_id']] = checkpoint
+    return checkpoints
+
+def _init_training_worker(torch_threads):
+    """
+    Inisialisasi proses worker: batasi jumlah thread torch agar worker tidak saling berebut core.
+    """
+    torch.set_num_threads(max(1, torch_threads))
+
+
+def _predict_ship_task(ship_frame, wpp_id, ship_id, forecast_days, epochs, checkpoint_entry=None):
+    """
+    Tugas per kapal yang dijalankan di proses worker.
+    Mengembalikan entri checkpoint yang diperbarui agar dapat disimpan oleh proses utama.
+    """
+    checkpoint = {'ships': {ship_id: checkpoint_entry} if checkpoint_entry else {}}
+    prediction = predict_lstm(ship_frame, wpp_id, ship_id, forecast_days=forecast_days, epochs=epochs,
+                              checkpoint=checkpoint)
+    return ship_id, prediction, checkpoint['ships'].get(ship_id)
+
+
+def default_worker_count():
+    """Jumlah worker default: satu proses per core."""
+    return max(1, os.cpu_count() or 1)
 
-    predicts_unscaled = scaler.inverse_transform(np.array(future_predicts).reshape(-1, 1)).flatten()
-    return predicts_unscaled
+
+def predict_wpp_parallel(data_frame, wpp_id, ships=None, forecast_days=30, epochs=150,
+                         max_workers=None, torch_threads=1, progress_callback=None, checkpoint=None):
+    """
+    Melatih dan memprediksi LSTM untuk setiap kapal di satu WPP secara paralel
+    menggunakan process pool. Mengembalikan dict {kapal: array prediksi}.
+
+    progress_callback(selesai, total, kapal) dipanggil di proses utama setiap kali
+    satu kapal selesai dilatih. Jika checkpoint diberikan, entri setiap kapal diperbarui.
+    """
+    wpp_data = data_frame[data_frame['WPP'] == wpp_id]
+    if ships is None:
+        ships = wpp_data['Kapal'].unique()
+    ships = list(ships)
+    total = len(ships)
+    max_workers = max_workers or default_worker_count()
+
+    results = {}
+    if max_workers <= 1 or total <= 1:
+        torch.set_num_threads(max(1, torch_threads))
+        for done, ship in enumerate(ships, start=1):
+            results[ship] = predict_lstm(wpp_data, wpp_id, ship, forecast_days=forecast_days, epochs=epochs,
+                                         checkpoint=checkpoint)
+            if progress_callback:
+                progress_callback(done, total, ship)
+        return results
+
+    # Gunakan 'spawn' agar worker tidak mewarisi state Tk/thread dari proses utama
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(max_workers, total), mp_context=context,
+                             initializer=_init_training_worker, initargs=(torch_threads,)) as executor:
+        futures = [
+            executor.submit(_predict_ship_task, wpp_data[wpp_data['Kapal'] == ship],
+                            wpp_id, ship, forecast_days, epochs,
+                            checkpoint['ships'].get(ship) if checkpoint is not None else None)
+            for ship in ships
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            ship, prediction, entry = future.result()
+            results[ship] = prediction
+            if checkpoint is not None and entry is not None:
+                checkpoint['ships'][ship] = entry
+            if progress_callback:
+                progress_callback(done, total, ship)
+
+    # Kembalikan sesuai urutan kapal semula
+    return {ship: results[ship] for ship in ships}
+
+def nsga3_objectives(scales, predicted):
+    """
+    Menghitung tujuan NSGA-III untuk satu populasi sekaligus.
+    scales: array (populasi, kapal) faktor skala kuota, predicted: array (kapal,) prediksi LSTM.
+    Mengembalikan array (populasi, 3): [-total tangkapan, ketidakadilan (std), biaya + penalti].
+    """
+    ### PERBAIKAN: Skala quotas berdasarkan prediksi LSTM per kapal, bukan fixed 10000
+    quotas = np.atleast_2d(scales) * predicted
+    total_catch = quotas.sum(axis=1)
+    fairness = quotas.std(axis=1)
+    costs = total_catch * 0.5
+    ### PERBAIKAN: Ubah threshold penalty menjadi > predicted (lebih ketat, agar tidak over-allocate terlalu jauh)
+    penalty = np.clip(quotas - predicted, 0, None).sum(axis=1) * 100
+    return np.column_stack((-total_catch, fairness, costs + penalty))
+
+class BatchEvaluator(Evaluator):
+    """
+    Evaluator Platypus yang mengevaluasi seluruh populasi dalam satu panggilan fungsi vektor,
+    sebagai ganti memanggil fungsi tujuan sekali per solusi.
+    """
+    def __init__(self, batch_function):
+        super().__init__()
+        self.batch_function = batch_function
+
+    def evaluate_all(self, jobs, **kwargs):
+        jobs = list(jobs)
+        if not jobs:
+            return jobs
+        solutions = [job.solution for job in jobs]
+        objectives = self.batch_function(np.array([solution.variables for solution in solutions], dtype=float))
+        for solution, values in zip(solutions, objectives):
+            solution.objectives[:] = values.tolist()
+            solution.constraint_violation = 0.0
+            solution.feasible = True
+            solution.evaluated = True
+        return jobs
 
 def optimize_nsga3(ships_data):
     """
@@ -130,21 +581,11 @@ def optimize_nsga3(ships_data):
     if num_ships == 0:
         return np.zeros(0)
     
+    # Ambil prediksi dari DataFrame sekali saja, bukan per evaluasi
+    predicted = ships_data['Prediksi'].to_numpy(dtype=float)
+
     def objective_function(vars):
-        ### PERBAIKAN: Skala quotas berdasarkan prediksi LSTM per kapal, bukan fixed 10000
-        quotas = np.array(vars) * ships_data['Prediksi'].values
-        total_catch = sum(quotas)
-        fairness = np.std(quotas)
-        costs = sum(quotas * 0.5)
-        
-        penalty = 0
-        for i, quota in enumerate(quotas):
-            predicted = ships_data['Prediksi'].iloc[i]
-            ### PERBAIKAN: Ubah threshold penalty menjadi > predicted (lebih ketat, agar tidak over-allocate terlalu jauh)
-            if quota > predicted:
-                penalty += (quota - predicted) * 100
-        
-        return [-total_catch, fairness, costs + penalty]
+        return nsga3_objectives(np.array(vars, dtype=float), predicted)[0].tolist()
     
     problem = Problem(num_ships, 3)
     problem.types[:] = Real(0.5, 1.5)
@@ -153,13 +594,15 @@ def optimize_nsga3(ships_data):
     n_generations = 50  ### PERBAIKAN: Kurangi generations untuk mempercepat (dari 100 ke 50)
     n_population = 200
     
-    algorithm = NSGAIII(problem, divisions_outer=12, divisions_inner=2)
+    # Seluruh populasi per generasi dievaluasi dalam satu panggilan
+    evaluator = BatchEvaluator(lambda scales: nsga3_objectives(scales, predicted))
+    algorithm = NSGAIII(problem, divisions_outer=12, divisions_inner=2, evaluator=evaluator)
     algorithm.run(n_population * n_generations)
     
     if not algorithm.result:
         return np.zeros(num_ships)
 
-    best_quotas = np.array(algorithm.result[0].variables) * ships_data['Prediksi'].values  ### PERBAIKAN: Skala ulang quotas dengan prediksi
+    best_quotas = np.array(algorithm.result[0].variables) * predicted  ### PERBAIKAN: Skala ulang quotas dengan prediksi
     return best_quotas
 
 # -----------------------------------------------------------------------------------
@@ -218,6 +661,10 @@ class Blockchain:
         """Menambahkan transaksi baru ke daftar yang tertunda."""
         self.pending_transactions.append(transaction_data)
 
+    def add_transactions(self, transactions):
+        """Menambahkan banyak transaksi sekaligus ke daftar yang tertunda."""
+        self.pending_transactions.extend(transactions)
+
     def mine_pending_transactions(self):
         """
         Mencatat semua transaksi yang tertunda ke dalam blok baru dan menambahkannya ke rantai.
@@ -252,50 +699,221 @@ class Blockchain:
                 return False
         return True
 
+DEFAULT_FISH_PRICE = 35000  # Rp/kg untuk jenis ikan yang tidak ada di tabel harga
+
+def load_fish_prices(path=None):
+    """
+    Membaca tabel harga ikan (Rp/kg) per jenis dari file JSON ({"Tuna": 60000, ...}) atau
+    CSV (kolom Jenis_Ikan, Harga_Rp_Kg). Tanpa path dipakai variabel lingkungan
+    FCO2_FISH_PRICES; jika keduanya kosong dikembalikan tabel kosong (semua jenis memakai
+    DEFAULT_FISH_PRICE).
+    """
+    path = path or os.environ.get('FCO2_FISH_PRICES')
+    if not path:
+        return {}
+    if path.endswith('.csv'):
+        table = pd.read_csv(path)
+        return dict(zip(table['Jenis_Ikan'].astype(str), table['Harga_Rp_Kg'].astype(float)))
+    with open(path, encoding='utf-8') as f:
+        return {str(name): float(price) for name, price in json.load(f).items()}
+
+def assign_ship_species(ship_table, ship_species):
+    """Menambahkan kolom Jenis_Ikan (jenis ikan utama per kapal) ke tabel alokasi jika diketahui."""
+    if ship_species:
+        species = ship_table['Kapal'].map(ship_species).astype(object)
+        ship_table['Jenis_Ikan'] = species.where(species.notna(), None)
+    return ship_table
+
 class SmartContract:
     """
     Kelas ini menyimulasikan smart contract.
     """
-    def __init__(self, blockchain):
+    def __init__(self, blockchain=None, fish_prices=None, default_fish_price=DEFAULT_FISH_PRICE):
         self.blockchain = blockchain
         self.base_pnbp_fee = 10000000
         self.quota_fee_percentage = 0.05
+        # Harga ikan per jenis (Rp/kg); jenis yang tidak ada di tabel memakai harga default
+        self.fish_prices = dict(fish_prices or {})
+        self.default_fish_price = default_fish_price
+
+    def calculate_pnbp(self, wpp_id, ship_quotas, ship_data, manual_catches=None):
+        """
+        Menghitung transaksi PNBP per kapal tanpa mencatatnya ke blockchain,
+        sehingga dapat dijalankan di proses worker.
+        Perhitungan dilakukan sebagai operasi kolom atas seluruh tabel alokasi. Harga ikan diambil
+        dari fish_prices berdasarkan kolom Jenis_Ikan (jika ada), selain itu default_fish_price.
+        """
+        ship_ids = ship_data['Kapal'].to_numpy()
+        kuota_kg = np.asarray(ship_quotas, dtype=float)
+
+        if 'Jenis_Ikan' in ship_data.columns:
+            harga_ikan_rp = ship_data['Jenis_Ikan'].map(self.fish_prices).fillna(self.default_fish_price).to_numpy(dtype=float)
+        else:
+            harga_ikan_rp = np.full(len(ship_ids), float(self.default_fish_price))
+
+        # Gunakan hasil tangkap manual jika tersedia, jika tidak gunakan kuota sebagai default
+        actual_catch_kg = kuota_kg
+        if manual_catches:
+            manual = pd.Series(ship_ids).map(manual_catches).to_numpy(dtype=float)
+            actual_catch_kg = np.where(np.isnan(manual), kuota_kg, manual)
+        actual_catch_kg = np.maximum(0, actual_catch_kg)  # Pastikan tidak negatif
+
+        hasil_tangkap_rp = actual_catch_kg * harga_ikan_rp
+        biaya_5_persen = hasil_tangkap_rp * self.quota_fee_percentage
+        total_pnbp_final = self.base_pnbp_fee + biaya_5_persen
+
+        return pd.DataFrame({
+            "wpp_id": wpp_id,
+            "ship_id": ship_ids,
+            "kuota_kg": kuota_kg,
+            "hasil_tangkap_kg": actual_catch_kg,
+            "jenis_ikan": ship_data['Jenis_Ikan'].to_numpy() if 'Jenis_Ikan' in ship_data.columns else None,
+            "harga_ikan_rp": harga_ikan_rp,
+            "biaya_awal_rp": self.base_pnbp_fee,
+            "hasil_tangkapan_rp": hasil_tangkap_rp,
+            "biaya_5_persen_rp": biaya_5_persen,
+            "total_pnbp_final_rp": total_pnbp_final
+        }).to_dict('records')
+
+    def record_transactions(self, transactions):
+        """Mencatat transaksi PNBP ke blockchain dan menambang satu blok baru."""
+        self.blockchain.add_transactions(transactions)
+        return self.blockchain.mine_pending_transactions()
 
     def execute_pnbp_process(self, wpp_id, ship_quotas, ship_data, manual_catches=None):
         """
         Fungsi ini mengotomatisasi alokasi kuota dan perhitungan PNBP, menggunakan hasil tangkap manual jika tersedia.
         """
-        transactions = []
-        for idx, row in ship_data.iterrows():
-            ship_id = row['Kapal']
-            kuota_kg = ship_quotas[idx]
-            harga_ikan_rp = 35000
-            
-            # Gunakan hasil tangkap manual jika tersedia, jika tidak gunakan kuota sebagai default
-            actual_catch_kg = manual_catches.get(ship_id, kuota_kg) if manual_catches else kuota_kg
-            actual_catch_kg = max(0, actual_catch_kg)  # Pastikan tidak negatif
-            
-            hasil_tangkap_rp = actual_catch_kg * harga_ikan_rp
-            biaya_5_persen = hasil_tangkap_rp * self.quota_fee_percentage
-            total_pnbp_final = self.base_pnbp_fee + biaya_5_persen
-            
-            transaction = {
-                "wpp_id": wpp_id,
-                "ship_id": ship_id,
-                "kuota_kg": kuota_kg,
-                "hasil_tangkap_kg": actual_catch_kg,
-                "biaya_awal_rp": self.base_pnbp_fee,
-                "hasil_tangkapan_rp": hasil_tangkap_rp,
-                "biaya_5_persen_rp": biaya_5_persen,
-                "total_pnbp_final_rp": total_pnbp_final
-            }
-            transactions.append(transaction)
-            self.blockchain.add_transaction(transaction)
-        
-        self.blockchain.mine_pending_transactions()
-        
+        transactions = self.calculate_pnbp(wpp_id, ship_quotas, ship_data, manual_catches)
+        self.record_transactions(transactions)
         return transactions
 
+# -----------------------------------------------------------------------------------
+# Proses lengkap per WPP (LSTM -> NSGA-III -> PNBP) dan mode semua WPP
+# -----------------------------------------------------------------------------------
+
+def run_wpp_pipeline(wpp_data, wpp_id, forecast_days=30, epochs=150, use_global=False,
+                     checkpoint=None, manual_catches=None, ship_species=None, fish_prices=None):
+    """
+    Menjalankan prediksi LSTM, alokasi NSGA-III dan perhitungan PNBP untuk satu WPP.
+    Transaksi PNBP tidak dicatat ke blockchain; pencatatan dilakukan oleh pemanggil.
+    ship_species ({Kapal: Jenis_Ikan}) dan fish_prices ({Jenis_Ikan: Rp/kg}) menentukan harga ikan
+    per kapal dalam perhitungan PNBP.
+    Mengembalikan dict berisi tabel kapal (Kapal, Prediksi, Kuota_Kg, Jenis_Ikan), transaksi dan checkpoint.
+    """
+    started = time.time()
+    timings = {}
+    wpp_data = wpp_data[wpp_data['WPP'] == wpp_id]
+    ships = wpp_data['Kapal'].unique()
+
+    if use_global:
+        global_predictions = predict_lstm_global(wpp_data, wpp_id, ships, forecast_days=forecast_days,
+                                                 epochs=epochs, checkpoint=checkpoint)
+        predictions = {ship: global_predictions[(wpp_id, ship)] for ship in ships}
+    else:
+        predictions = {
+            ship: predict_lstm(wpp_data, wpp_id, ship, forecast_days=forecast_days, epochs=epochs,
+                               checkpoint=checkpoint)
+            for ship in ships
+        }
+    timings['lstm'] = time.time() - started
+
+    stage_started = time.time()
+    ship_table = pd.DataFrame(
+        [{'Kapal': ship, 'Prediksi': sum(prediction)} for ship, prediction in predictions.items()],
+        columns=['Kapal', 'Prediksi']
+    )
+    quotas = optimize_nsga3(ship_table)
+    ship_table['Kuota_Kg'] = quotas.round(2)
+    assign_ship_species(ship_table, ship_species)
+    timings['nsga3'] = time.time() - stage_started
+
+    stage_started = time.time()
+    transactions = SmartContract(fish_prices=fish_prices).calculate_pnbp(
+        wpp_id, ship_table['Kuota_Kg'].values, ship_table, manual_catches
+    )
+    timings['pnbp'] = time.time() - stage_started
+
+    return {
+        'wpp_id': wpp_id,
+        'ships': ship_table,
+        'transactions': transactions,
+        'checkpoint': checkpoint,
+        'timings': timings,
+        'elapsed': time.time() - started,
+    }
+
+def _run_wpp_task(wpp_data, wpp_id, forecast_days, epochs, use_global, checkpoint, ship_species, fish_prices):
+    """Tugas per WPP yang dijalankan di proses worker."""
+    return run_wpp_pipeline(wpp_data, wpp_id, forecast_days=forecast_days, epochs=epochs,
+                            use_global=use_global, checkpoint=checkpoint,
+                            ship_species=ship_species, fish_prices=fish_prices)
+
+def run_all_wpps(data_frame, wpp_ids=None, forecast_days=30, epochs=150, use_global=False,
+                 max_workers=None, torch_threads=1, checkpoints=None, progress_callback=None,
+                 ship_species=None, fish_prices=None):
+    """
+    Menjalankan proses lengkap untuk setiap WPP secara paralel dalam process pool,
+    sehingga waktu total mendekati waktu WPP yang paling lambat.
+    Mengembalikan dict {wpp_id: hasil run_wpp_pipeline} dalam urutan wpp_ids.
+
+    Jika checkpoints (dict {wpp_id: checkpoint}) diberikan, checkpoint setiap WPP
+    diperbarui dengan hasil dari worker. progress_callback(selesai, total, wpp_id)
+    dipanggil di proses utama setiap kali satu WPP selesai. ship_species dan fish_prices
+    diteruskan ke run_wpp_pipeline.
+    """
+    if wpp_ids is None:
+        wpp_ids = sorted(data_frame['WPP'].unique())
+    wpp_ids = list(wpp_ids)
+    if max_workers is None:
+        max_workers = default_worker_count()
+    max_workers = max(1, min(max_workers, len(wpp_ids)))
+
+    def task_args(wpp_id):
+        checkpoint = None
+        if checkpoints is not None:
+            checkpoint = checkpoints.setdefault(wpp_id, new_checkpoint(wpp_id))
+        return (data_frame[data_frame['WPP'] == wpp_id], wpp_id, forecast_days, epochs, use_global, checkpoint,
+                ship_species, fish_prices)
+
+    results = {}
+    if max_workers <= 1:
+        for done, wpp_id in enumerate(wpp_ids, start=1):
+            results[wpp_id] = _run_wpp_task(*task_args(wpp_id))
+            if progress_callback:
+                progress_callback(done, len(wpp_ids), wpp_id)
+        return results
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                             initializer=_init_training_worker, initargs=(torch_threads,)) as executor:
+        futures = {executor.submit(_run_wpp_task, *task_args(wpp_id)): wpp_id for wpp_id in wpp_ids}
+        for done, future in enumerate(as_completed(futures), start=1):
+            wpp_id = futures[future]
+            results[wpp_id] = future.result()
+            if checkpoints is not None:
+                # Checkpoint di worker adalah salinan; ambil versi yang sudah diperbarui
+                checkpoints[wpp_id] = results[wpp_id]['checkpoint']
+            if progress_callback:
+                progress_callback(done, len(wpp_ids), wpp_id)
+
+    return {wpp_id: results[wpp_id] for wpp_id in wpp_ids}
+
+def consolidate_results(results):
+    """Menggabungkan hasil semua WPP menjadi satu tabel per kapal."""
+    rows = []
+    for wpp_id, result in results.items():
+        for transaction, (_, ship) in zip(result['transactions'], result['ships'].iterrows()):
+            rows.append({
+                'WPP': wpp_id,
+                'Kapal': ship['Kapal'],
+                'Prediksi_Kg': ship['Prediksi'],
+                'Kuota_Kg': ship['Kuota_Kg'],
+                'Hasil_Tangkap_Kg': transaction['hasil_tangkap_kg'],
+                'Total_PNBP_Rp': transaction['total_pnbp_final_rp'],
+            })
+    return pd.DataFrame(rows, columns=['WPP', 'Kapal', 'Prediksi_Kg', 'Kuota_Kg', 'Hasil_Tangkap_Kg', 'Total_PNBP_Rp'])
+
 # -----------------------------------------------------------------------------------
 # Bagian 3: Antarmuka Pengguna (GUI)
 # -----------------------------------------------------------------------------------
@@ -307,9 +925,12 @@ class FisheriesPNBPApp:
         self.root.geometry("1400x900")
 
         self.blockchain = Blockchain()
-        self.smart_contract = SmartContract(self.blockchain)
+        self.fish_prices = load_fish_prices()
+        self.smart_contract = SmartContract(self.blockchain, self.fish_prices)
 
         self.all_data = generate_synthetic_data()
+        self.ship_species = synthetic_ship_species()
+        self.checkpoints = load_checkpoints()
         self.wpp_list = sorted(self.all_data['WPP'].unique())
         self.current_wpp = None
         self.predicted_data = None
@@ -348,6 +969,14 @@ class FisheriesPNBPApp:
         self.epochs_spinbox = ttk.Spinbox(self.control_frame, from_=10, to=200, increment=10, textvariable=self.epochs_var, width=5)
         self.epochs_spinbox.pack(side="left", padx=(0, 10))
 
+        ttk.Label(self.control_frame, text="Worker:").pack(side="left", padx=(10, 2))
+        self.workers_var = tk.IntVar(value=default_worker_count())
+        self.workers_spinbox = ttk.Spinbox(self.control_frame, from_=1, to=max(32, default_worker_count()), increment=1, textvariable=self.workers_var, width=4)
+        self.workers_spinbox.pack(side="left", padx=(0, 10))
+
+        self.global_model_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.control_frame, text="Model global", variable=self.global_model_var).pack(side="left", padx=(0, 10))
+
         self.lstm_button = ttk.Button(self.control_frame, text="1. Jalankan Prediksi LSTM", command=self.start_lstm_thread, state="disabled")
         self.lstm_button.pack(side="left", padx=10)
         
@@ -357,6 +986,9 @@ class FisheriesPNBPApp:
         self.pnbp_button = ttk.Button(self.control_frame, text="3. Hitung & Catat PNBP ke Blockchain", command=self.start_pnbp_thread, state="disabled")
         self.pnbp_button.pack(side="left", padx=10)
 
+        self.all_wpp_button = ttk.Button(self.control_frame, text="Jalankan Semua WPP", command=self.start_all_wpps_thread)
+        self.all_wpp_button.pack(side="left", padx=10)
+
         self.status_label = ttk.Label(self.control_frame, text="Status: Silakan pilih WPP", font=("TkDefaultFont", 10, "italic"))
         self.status_label.pack(side="left", padx=10)
 
@@ -367,14 +999,17 @@ class FisheriesPNBPApp:
         self.tab_lstm = ttk.Frame(self.notebook)
         self.tab_nsga3 = ttk.Frame(self.notebook)
         self.tab_pnbp = ttk.Frame(self.notebook)
+        self.tab_all_wpp = ttk.Frame(self.notebook)
         
         self.notebook.add(self.tab_lstm, text="Prediksi LSTM")
         self.notebook.add(self.tab_nsga3, text="Optimasi NSGA-III")
         self.notebook.add(self.tab_pnbp, text="PNBP & Blockchain")
+        self.notebook.add(self.tab_all_wpp, text="Semua WPP")
         
         self.create_lstm_tab()
         self.create_nsga3_tab()
         self.create_pnbp_tab()
+        self.create_all_wpp_tab()
 
     def create_lstm_tab(self):
         self.lstm_tree = ttk.Treeview(self.tab_lstm, columns=("Kapal", "Prediksi Total (kg)"))
@@ -404,6 +1039,20 @@ class FisheriesPNBPApp:
         
         self.pnbp_tree.pack(fill="both", expand=True)
 
+    def create_all_wpp_tab(self):
+        self.all_wpp_results = None
+        columns = ("WPP", "Kapal", "Prediksi (kg)", "Kuota (kg)", "Hasil Tangkap (kg)", "Total PNBP (Rp)")
+        self.all_wpp_tree = ttk.Treeview(self.tab_all_wpp, columns=columns)
+        self.all_wpp_tree.heading("#0", text="", anchor="w")
+        self.all_wpp_tree.column("#0", width=0, stretch=tk.NO)
+
+        for col in columns:
+            self.all_wpp_tree.heading(col, text=col, anchor="center")
+            self.all_wpp_tree.column(col, anchor="center", width=150)
+
+        self.all_wpp_tree.pack(fill="both", expand=True)
+        ttk.Button(self.tab_all_wpp, text="Simpan CSV", command=self.save_all_wpp_results).pack(pady=5)
+
     def open_manual_catch_input(self):
         if not self.current_wpp:
             messagebox.showwarning("Peringatan", "Pilih WPP terlebih dahulu!")
@@ -475,16 +1124,29 @@ class FisheriesPNBPApp:
     def run_lstm_prediction(self):
         try:
             epochs = self.epochs_var.get()
+            max_workers = self.workers_var.get()
             wpp_data = self.all_data[self.all_data['WPP'] == self.current_wpp].copy()
             ships = wpp_data['Kapal'].unique()
+            checkpoint = self.checkpoints.setdefault(self.current_wpp, new_checkpoint(self.current_wpp))
+
+            if self.global_model_var.get():
+                global_predictions = predict_lstm_global(wpp_data, self.current_wpp, ships, epochs=epochs,
+                                                         checkpoint=checkpoint)
+                predictions = {ship: global_predictions[(self.current_wpp, ship)] for ship in ships}
+            else:
+                predictions = predict_wpp_parallel(
+                    wpp_data, self.current_wpp, ships, epochs=epochs,
+                    max_workers=max_workers, progress_callback=self.report_lstm_progress,
+                    checkpoint=checkpoint
+                )
+            save_checkpoint(checkpoint)
 
             self.predicted_data = []
-            for ship in ships:
-                prediction = predict_lstm(wpp_data, self.current_wpp, ship, epochs=epochs)
+            for ship, prediction in predictions.items():
                 total_pred = sum(prediction)
                 self.predicted_data.append({'Kapal': ship, 'Prediksi': total_pred})
             
-            self.predicted_data = pd.DataFrame(self.predicted_data)
+            self.predicted_data = assign_ship_species(pd.DataFrame(self.predicted_data), self.ship_species)
             self.display_lstm_results()
 
         except Exception as e:
@@ -496,6 +1158,11 @@ class FisheriesPNBPApp:
             self.nsga3_button.config(state="normal")
             self.notebook.select(self.tab_lstm)
 
+    def report_lstm_progress(self, done, total, ship):
+        # Update label melalui event loop Tk karena dipanggil dari thread latar belakang
+        self.root.after(0, lambda: self.status_label.config(
+            text=f"Status: Prediksi LSTM {done}/{total} kapal selesai ({ship})..."))
+
     def display_lstm_results(self):
         self.clear_trees()
         for _, row in self.predicted_data.iterrows():
@@ -561,6 +1228,72 @@ class FisheriesPNBPApp:
             self.enable_buttons()
             self.notebook.select(self.tab_pnbp)
 
+    def start_all_wpps_thread(self):
+        self.status_label.config(text="Status: Menjalankan semua WPP secara paralel. Harap tunggu...")
+        self.disable_buttons()
+        process_thread = threading.Thread(target=self.run_all_wpps)
+        process_thread.start()
+
+    def run_all_wpps(self):
+        try:
+            results = run_all_wpps(
+                self.all_data, self.wpp_list, epochs=self.epochs_var.get(),
+                use_global=self.global_model_var.get(), max_workers=self.workers_var.get(),
+                checkpoints=self.checkpoints, progress_callback=self.report_all_wpps_progress,
+                ship_species=self.ship_species, fish_prices=self.fish_prices
+            )
+            for wpp_id, result in results.items():
+                save_checkpoint(self.checkpoints[wpp_id])
+                # Satu blok per WPP, dicatat di proses utama agar rantai tetap berurutan
+                self.smart_contract.record_transactions(result['transactions'])
+
+            self.all_wpp_results = consolidate_results(results)
+            self.root.after(0, self.display_all_wpp_results)
+        except Exception as e:
+            messagebox.showerror("Error", f"Terjadi kesalahan pada proses semua WPP: {e}")
+            print(f"Error semua WPP: {e}")
+        finally:
+            self.status_label.config(text="Status: Proses semua WPP selesai!")
+            self.enable_buttons()
+            self.notebook.select(self.tab_all_wpp)
+
+    def report_all_wpps_progress(self, done, total, wpp_id):
+        self.root.after(0, lambda: self.status_label.config(
+            text=f"Status: {done}/{total} WPP selesai ({wpp_id})..."))
+
+    def display_all_wpp_results(self):
+        for item in self.all_wpp_tree.get_children():
+            self.all_wpp_tree.delete(item)
+
+        for _, row in self.all_wpp_results.iterrows():
+            self.all_wpp_tree.insert("", "end", values=(
+                row['WPP'],
+                row['Kapal'],
+                f"{row['Prediksi_Kg']:.2f} kg",
+                f"{row['Kuota_Kg']:.2f} kg",
+                f"{row['Hasil_Tangkap_Kg']:.2f} kg",
+                f"Rp {row['Total_PNBP_Rp']:,.0f}".replace(",", "#").replace(".", ",").replace("#", ".")
+            ))
+
+        totals = self.all_wpp_results[['Prediksi_Kg', 'Kuota_Kg', 'Hasil_Tangkap_Kg', 'Total_PNBP_Rp']].sum()
+        self.all_wpp_tree.insert("", "end", values=(
+            "TOTAL", "",
+            f"{totals['Prediksi_Kg']:.2f} kg",
+            f"{totals['Kuota_Kg']:.2f} kg",
+            f"{totals['Hasil_Tangkap_Kg']:.2f} kg",
+            f"Rp {totals['Total_PNBP_Rp']:,.0f}".replace(",", "#").replace(".", ",").replace("#", ".")
+        ))
+
+    def save_all_wpp_results(self):
+        if self.all_wpp_results is None:
+            messagebox.showwarning("Peringatan", "Jalankan semua WPP terlebih dahulu!")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")],
+                                            initialfile="hasil_semua_wpp.csv")
+        if path:
+            self.all_wpp_results.to_csv(path, index=False)
+            messagebox.showinfo("Sukses", f"Hasil disimpan ke {path}")
+
     def display_pnbp_data(self, pnbp_transactions):
         for item in self.pnbp_tree.get_children():
             self.pnbp_tree.delete(item)
@@ -615,11 +1348,13 @@ class FisheriesPNBPApp:
         self.lstm_button.config(state="disabled")
         self.nsga3_button.config(state="disabled")
         self.pnbp_button.config(state="disabled")
+        self.all_wpp_button.config(state="disabled")
 
     def enable_buttons(self):
         self.lstm_button.config(state="normal")
         self.nsga3_button.config(state="normal")
         self.pnbp_button.config(state="normal")
+        self.all_wpp_button.config(state="normal")
 
     def show_blockchain_ledger(self):
         ledger_window = tk.Toplevel(self.root)
@@ -662,7 +1397,191 @@ class FisheriesPNBPApp:
         else:
             messagebox.showwarning("Verifikasi Gagal", "Rantai blockchain tidak valid! Data mungkin telah diubah.")
 
+# -----------------------------------------------------------------------------------
+# Bagian 4: Mode headless (CLI dan API)
+# -----------------------------------------------------------------------------------
+
+def setup_django(settings_module='fco_project.settings'):
+    """Menyiapkan Django agar model proyek dapat dipakai dari skrip ini."""
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    if project_dir not in sys.path:
+        sys.path.insert(0, project_dir)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+def load_catch_data_from_django(wpp_ids=None, settings_module='fco_project.settings', use_cache=True):
+    """
+    Membangun DataFrame Tanggal/WPP/Kapal/Hasil_Tangkapan_Kg dari tabel FishCatch/CatchDetail.
+    WPP diambil dari kode wilayah penangkapan laporan dan Kapal dari nomor registrasi kapal.
+    Frame disimpan di cache disk (CATCH_DATASET_CACHE_DIR) dan dibangun ulang hanya jika
+    data tangkapan berubah; lihat catches/datasets.py.
+    """
+    setup_django(settings_module)
+    from catches.datasets import load_catch_frame
+
+    return load_catch_frame(wpp_ids, use_cache=use_cache)
+
+def load_ship_species_from_django(wpp_ids=None, settings_module='fco_project.settings'):
+    """
+    Jenis ikan utama (total tangkapan terbesar) setiap kapal: dict {nomor registrasi: Jenis_Ikan}.
+    Lihat catches/datasets.py.
+    """
+    setup_django(settings_module)
+    from catches.datasets import ship_main_species
+
+    return ship_main_species(wpp_ids)
+
+def record_to_django_ledger(wpp_transactions, run_id=None, block_size=500, settings_module='fco_project.settings'):
+    """
+    Menyimpan transaksi PNBP ke ledger Django (BlockchainBlock/PNBPTransaction).
+    wpp_transactions: dict {wpp_id: daftar transaksi}. Setiap WPP disegel dalam satu kali proses
+    menjadi blok-blok berisi block_size transaksi. Mengembalikan ringkasan penyimpanan.
+    """
+    setup_django(settings_module)
+    from blockchain.utils import record_pnbp_transactions
+
+    run_id = run_id or uuid.uuid4().hex
+    summary = {'run_id': run_id, 'transactions': 0, 'blocks': 0}
+    for wpp_id, transactions in wpp_transactions.items():
+        records = record_pnbp_transactions(wpp_id, transactions, run_id=run_id, block_size=block_size)
+        summary['transactions'] += len(records)
+        summary['blocks'] += len({record.block_id for record in records})
+    return summary
+
+def run_pipeline(data_frame, wpp_ids=None, forecast_days=30, epochs=150, use_global=False,
+                 max_workers=None, checkpoints=None, blockchain=None, progress_callback=None,
+                 ship_species=None, fish_prices=None):
+    """
+    Menjalankan proses LSTM -> NSGA-III -> PNBP -> blockchain untuk WPP yang diberikan tanpa GUI.
+    PNBP dihitung dengan harga per jenis ikan dari fish_prices untuk jenis ikan utama setiap kapal
+    (ship_species); kapal atau jenis tanpa harga memakai DEFAULT_FISH_PRICE.
+    Mengembalikan laporan (dict yang dapat di-serialisasi ke JSON) berisi hasil per kapal,
+    transaksi PNBP, waktu per tahap dan ringkasan blockchain.
+    """
+    started = time.time()
+    blockchain = blockchain or Blockchain()
+    smart_contract = SmartContract(blockchain, fish_prices)
+
+    results = run_all_wpps(data_frame, wpp_ids, forecast_days=forecast_days, epochs=epochs,
+                           use_global=use_global, max_workers=max_workers,
+                           checkpoints=checkpoints, progress_callback=progress_callback,
+                           ship_species=ship_species, fish_prices=fish_prices)
+
+    blockchain_started = time.time()
+    wpp_reports = []
+    for wpp_id, result in results.items():
+        block = smart_contract.record_transactions(result['transactions'])
+        wpp_reports.append({
+            'wpp_id': wpp_id,
+            'timings': result['timings'],
+            'elapsed': result['elapsed'],
+            'block_hash': block.hash if block else None,
+            'ships': result['ships'].to_dict('records'),
+            'transactions': result['transactions'],
+        })
+    blockchain_elapsed = time.time() - blockchain_started
+
+    return {
+        'wpps': wpp_reports,
+        'blockchain': {
+            'blocks': len(blockchain.chain),
+            'last_hash': blockchain.last_block.hash,
+            'valid': blockchain.is_chain_valid(),
+        },
+        'timings': {
+            'blockchain': blockchain_elapsed,
+            'total': time.time() - started,
+        },
+    }
+
+def _json_default(value):
+    """Konversi tipe NumPy/pandas untuk json.dumps."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"Tipe {type(value).__name__} tidak dapat di-serialisasi ke JSON")
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Aplikasi PNBP Perikanan (LSTM -> NSGA-III -> PNBP -> Blockchain)")
+    parser.add_argument('--headless', action='store_true', help="Jalankan tanpa GUI dan cetak hasil sebagai JSON")
+    parser.add_argument('--wpp', action='append', dest='wpps', help="WPP yang diproses (dapat diulang); default semua WPP")
+    parser.add_argument('--source', choices=['synthetic', 'django'], default='synthetic', help="Sumber data tangkapan")
+    parser.add_argument('--no-data-cache', action='store_true', help="Bangun ulang data Django tanpa cache disk")
+    parser.add_argument('--fish-prices', help="Tabel harga ikan per jenis (JSON atau CSV Jenis_Ikan,Harga_Rp_Kg); "
+                                              "default variabel lingkungan FCO2_FISH_PRICES")
+    parser.add_argument('--num-wpps', type=int, default=10, help="Jumlah WPP untuk data sintetis")
+    parser.add_argument('--ships-per-wpp', type=int, default=10, help="Jumlah kapal per WPP untuk data sintetis")
+    parser.add_argument('--epochs', type=int, default=50, help="Epoch pelatihan LSTM")
+    parser.add_argument('--forecast-days', type=int, default=30, help="Jumlah hari yang diprediksi")
+    parser.add_argument('--global-model', action='store_true', help="Gunakan satu model LSTM global per WPP")
+    parser.add_argument('--workers', type=int, default=default_worker_count(), help="Jumlah proses worker (per WPP)")
+    parser.add_argument('--no-checkpoints', action='store_true', help="Jangan memuat/menyimpan checkpoint model")
+    parser.add_argument('--django-ledger', action='store_true', help="Simpan transaksi PNBP ke ledger Django")
+    parser.add_argument('--block-size', type=int, default=500, help="Jumlah transaksi per blok di ledger Django")
+    parser.add_argument('--output', help="Tulis hasil JSON ke file ini (default stdout)")
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    if not args.headless:
+        if tk is None:
+            sys.exit("Tkinter tidak tersedia; gunakan --headless")
+        root = tk.Tk()
+        app = FisheriesPNBPApp(root)
+        root.mainloop()
+        return 0
+
+    load_started = time.time()
+    if args.source == 'django':
+        data_frame = load_catch_data_from_django(args.wpps, use_cache=not args.no_data_cache)
+        ship_species = load_ship_species_from_django(args.wpps)
+    else:
+        data_frame = generate_synthetic_data(args.num_wpps, args.ships_per_wpp)
+        ship_species = synthetic_ship_species(args.ships_per_wpp)
+    fish_prices = load_fish_prices(args.fish_prices)
+    load_elapsed = time.time() - load_started
+
+    wpp_ids = args.wpps or sorted(data_frame['WPP'].unique())
+    missing = sorted(set(wpp_ids) - set(data_frame['WPP'].unique()))
+    if missing:
+        sys.exit(f"WPP tidak ditemukan dalam data: {', '.join(missing)}")
+
+    checkpoints = None if args.no_checkpoints else load_checkpoints()
+
+    def report_progress(done, total, wpp_id):
+        print(f"{done}/{total} WPP selesai ({wpp_id})", file=sys.stderr)
+
+    report = run_pipeline(data_frame, wpp_ids, forecast_days=args.forecast_days, epochs=args.epochs,
+                          use_global=args.global_model, max_workers=args.workers,
+                          checkpoints=checkpoints, progress_callback=report_progress,
+                          ship_species=ship_species, fish_prices=fish_prices)
+    report['timings']['load'] = load_elapsed
+
+    if checkpoints is not None:
+        for wpp_id in wpp_ids:
+            save_checkpoint(checkpoints[wpp_id])
+
+    if args.django_ledger:
+        ledger_started = time.time()
+        report['django_ledger'] = record_to_django_ledger(
+            {wpp['wpp_id']: wpp['transactions'] for wpp in report['wpps']}, block_size=args.block_size
+        )
+        report['timings']['django_ledger'] = time.time() - ledger_started
+
+    for wpp in report['wpps']:
+        stages = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in wpp['timings'].items())
+        print(f"{wpp['wpp_id']}: {stages}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2, default=_json_default)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = FisheriesPNBPApp(root)
-    root.mainloop()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Streaming CSV/XLSX exports.
+
+Rows are read with ``values_list(...).iterator(chunk_size=...)``, so no model
+instances are built and the database cursor is consumed chunk by chunk.
+CSV is written to the client line by line through a ``StreamingHttpResponse``;
+XLSX is built with xlsxwriter's constant-memory mode in a temporary file that
+is then streamed back, so neither format holds the export in memory.
+
+An export is described by a list of ``(header, lookup)`` columns, where
+``lookup`` is any field path accepted by ``values_list`` (``owner__full_name``).
+"""
+
+import csv
+import tempfile
+from datetime import date, datetime
+from django.http import FileResponse, StreamingHttpResponse
+import xlsxwriter
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ('csv', 'xlsx')
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output"""
+    def write(self, value):
+        return value
+
+
+def get_export_format(request):
+    """The requested export format (``?file_format=csv|xlsx``, default csv), or None if unsupported"""
+    file_format = request.query_params.get('file_format', 'csv').lower()
+    return file_format if file_format in EXPORT_FORMATS else None
+
+
+def iter_values(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield one tuple per row with the values of ``columns``"""
+    lookups = [lookup for _, lookup in columns]
+    return queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+def iter_csv(headers, rows):
+    """Yield CSV lines: the header line, then one line per row"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def csv_response(queryset, columns, filename, chunk_size=EXPORT_CHUNK_SIZE):
+    """Stream ``queryset`` as a CSV attachment"""
+    rows = iter_values(queryset, columns, chunk_size)
+    response = StreamingHttpResponse(iter_csv([header for header, _ in columns], rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def write_xlsx(output, headers, rows, sheet_name='Data'):
+    """
+    Write rows to ``output`` (a path or binary file) as an XLSX workbook.
+    Constant-memory mode flushes every row to disk as soon as the next one starts.
+    """
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True, 'remove_timezone': True})
+    try:
+        worksheet = workbook.add_worksheet(sheet_name[:31])
+        bold = workbook.add_format({'bold': True})
+        date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+        datetime_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+        worksheet.write_row(0, 0, headers, bold)
+        for row_num, row in enumerate(rows, start=1):
+            for col, value in enumerate(row):
+                if value is None:
+                    continue
+                if isinstance(value, datetime):
+                    worksheet.write_datetime(row_num, col, value, datetime_format)
+                elif isinstance(value, date):
+                    worksheet.write_datetime(row_num, col, value, date_format)
+                else:
+                    worksheet.write(row_num, col, value)
+    finally:
+        workbook.close()
+
+
+def xlsx_response(queryset, columns, filename, sheet_name='Data', chunk_size=EXPORT_CHUNK_SIZE):
+    """Build ``queryset`` as an XLSX workbook in a temporary file and stream it as an attachment"""
+    output = tempfile.TemporaryFile()
+    try:
+        write_xlsx(output, [header for header, _ in columns], iter_values(queryset, columns, chunk_size), sheet_name)
+    except Exception:
+        output.close()
+        raise
+    output.seek(0)
+    # FileResponse reads the file in blocks and closes (and so deletes) it when done
+    return FileResponse(output, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
+
+
+def export_response(queryset, columns, basename, file_format='csv', sheet_name='Data'):
+    """Export ``queryset`` as ``<basename>.csv`` or ``<basename>.xlsx``"""
+    if file_format == 'xlsx':
+        return xlsx_response(queryset, columns, f'{basename}.xlsx', sheet_name)
+    return csv_response(queryset, columns, f'{basename}.csv')
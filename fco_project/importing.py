@@ -0,0 +1,265 @@
+"""
+Shared helpers for the CSV/Excel import endpoints.
+
+Uploads are read as a stream of row dicts: CSV is decoded incrementally from
+the upload's chunks and Excel workbooks are read row by row in openpyxl
+read-only mode, so memory use does not grow with the file. Importers consume
+the rows in batches (``batched``) and write each batch with ``upsert_rows``,
+which can also run as a dry run that only reports the per-field diff.
+"""
+
+import codecs
+import csv
+import math
+from datetime import date, datetime, time
+from io import StringIO
+from itertools import islice
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse
+from openpyxl import load_workbook
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_ENCODING = 'utf-8-sig'  # plain UTF-8, minus the BOM Excel puts in front of CSV exports
+READ_CHUNK_SIZE = 64 * 1024
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+
+
+def get_import_source(request, file_fields=('csv_file', 'csv_data'), text_field='csv_data'):
+    """
+    Find the import payload of a request.
+
+    Returns ``(upload, text)``: the first uploaded file found in ``file_fields``,
+    or else the CSV string sent in ``text_field``. Both are None when the
+    request carries neither.
+    """
+    for field in file_fields:
+        upload = request.FILES.get(field)
+        if upload:
+            return upload, None
+
+    data = request.data.get(text_field)
+    if hasattr(data, 'read'):  # File-like object (e.g., InMemoryUploadedFile)
+        return data, None
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return None, data or None
+
+
+def get_flag(request, name):
+    """Read a boolean option sent as JSON or as a form value (``true``/``1``/``yes``)"""
+    value = request.data.get(name, False)
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', '1', 'yes', 'on')
+    return bool(value)
+
+
+def _iter_chunks(upload, chunk_size):
+    if hasattr(upload, 'chunks'):
+        yield from upload.chunks(chunk_size)
+        return
+    while True:
+        chunk = upload.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_lines(upload, encoding=DEFAULT_ENCODING, chunk_size=READ_CHUNK_SIZE):
+    """Decode a binary upload chunk by chunk and yield its lines (line endings kept)"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ''
+    for chunk in _iter_chunks(upload, chunk_size):
+        lines = (pending + decoder.decode(chunk)).split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line + '\n'
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def iter_csv_rows(upload=None, text=None, encoding=DEFAULT_ENCODING):
+    """Yield the rows of a CSV upload or string as dicts keyed by the header row"""
+    lines = StringIO(text) if upload is None else iter_lines(upload, encoding)
+    return csv.DictReader(lines)
+
+
+def _cell_text(value):
+    """Render a spreadsheet cell the way it would appear in a CSV export"""
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ''
+        if value.is_integer():
+            return str(int(value))
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_excel_rows(upload):
+    """
+    Yield the rows of the first worksheet as dicts of strings keyed by the header row.
+    Blank rows are skipped, like blank lines in a CSV file.
+    """
+    if getattr(upload, 'name', '').lower().endswith('.xls'):
+        # Legacy .xls workbooks are not supported by openpyxl
+        import pandas as pd
+        records = pd.read_excel(upload, dtype=object).to_dict('records')
+        for record in records:
+            row = {str(key): _cell_text(value) for key, value in record.items()}
+            if any(row.values()):
+                yield row
+        return
+
+    workbook = load_workbook(upload, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.active
+        if worksheet is None:
+            return
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        keys = [_cell_text(value).strip() for value in header]
+        for values in rows:
+            row = {key: _cell_text(value) for key, value in zip(keys, values) if key}
+            if any(row.values()):
+                yield row
+    finally:
+        workbook.close()
+
+
+def iter_rows(upload=None, text=None):
+    """Yield row dicts from a CSV/Excel upload (chosen by file extension) or a CSV string"""
+    if upload is not None and getattr(upload, 'name', '').lower().endswith(EXCEL_EXTENSIONS):
+        return iter_excel_rows(upload)
+    return iter_csv_rows(upload, text)
+
+
+def batched(items, size=DEFAULT_BATCH_SIZE):
+    """Yield lists of up to ``size`` items"""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def run_field_validators(model, values):
+    """
+    Run the model field validators (max_length, max_digits, ...) on the given
+    values. Errors are raised keyed by field name, like ``full_clean()``.
+    """
+    errors = {}
+    for name, value in values.items():
+        if value is not None:
+            try:
+                model._meta.get_field(name).run_validators(value)
+            except ValidationError as e:
+                errors[name] = e.messages
+    if errors:
+        raise ValidationError(errors)
+
+
+def diff_entry(key, previous, values):
+    """
+    Describe what importing ``values`` does to the record ``key``:
+    ``{'key', 'action': 'created'|'updated', 'changes': {field: {'old', 'new'}}}``.
+    ``previous`` is None for a new record; only fields that change are listed.
+    """
+    if previous is None:
+        changes = {name: {'old': None, 'new': value} for name, value in values.items() if value is not None}
+    else:
+        changes = {
+            name: {'old': previous.get(name), 'new': value}
+            for name, value in values.items() if previous.get(name) != value
+        }
+    return {'key': key, 'action': 'created' if previous is None else 'updated', 'changes': changes}
+
+
+def diff_csv_response(diff, filename):
+    """Render a dry-run diff as a CSV attachment with one line per changed field"""
+    response = HttpResponse(content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    writer = csv.writer(response)
+    writer.writerow(['key', 'action', 'field', 'old', 'new'])
+    for entry in diff:
+        for name, change in entry['changes'].items():
+            writer.writerow([
+                entry['key'], entry['action'], name,
+                '' if change['old'] is None else change['old'],
+                '' if change['new'] is None else change['new'],
+            ])
+    return response
+
+
+def upsert_rows(model, key_field, rows, result, dry_run=False, diff=None, applied=None):
+    """
+    Insert or update a batch of rows keyed by a unique field.
+
+    ``rows`` is a list of ``(key, values)`` in file order, where ``values`` maps
+    field attnames to new values; fields missing from ``values`` keep their
+    current value. Rows are applied as if one after another: a key not yet in
+    the table counts as created, a row that changes its record counts as updated
+    and an unchanged row counts as unchanged. The current values of all keys are
+    read with one query and the new or changed records are written with a single
+    ``bulk_create(update_conflicts=True)``.
+
+    With ``dry_run`` nothing is written. When a ``diff`` list is given, one
+    entry per created or updated row is appended to it (see ``diff_entry``).
+    A dry run over several batches passes the same ``applied`` dict to every
+    call: it holds the records earlier batches would have written, which are
+    used in place of the stored values, so a key repeated in a later batch is
+    counted the same way as in a real import.
+
+    Returns ``{key: values}`` for the records that were (or would be) written.
+    """
+    if not rows:
+        return {}
+    fields = list(dict.fromkeys(name for _, values in rows for name in values))
+    current = {
+        record.pop(key_field): record
+        for record in model._default_manager.filter(
+            **{f'{key_field}__in': {key for key, _ in rows}}
+        ).values(key_field, *fields)
+    }
+    if applied:
+        for key, _ in rows:
+            if key in applied:
+                current[key] = dict(current.get(key, {}), **applied[key])
+
+    changed = {}
+    for key, values in rows:
+        previous = current.get(key)
+        if previous is None:
+            result['created'] += 1
+            merged = dict(values)
+        else:
+            merged = dict(previous, **values)
+            if merged == previous:
+                result['unchanged'] = result.get('unchanged', 0) + 1
+                continue
+            result['updated'] += 1
+        if diff is not None:
+            diff.append(diff_entry(key, previous, merged))
+        current[key] = merged
+        changed[key] = merged
+
+    if applied is not None:
+        applied.update(changed)
+    if changed and not dry_run:
+        update_fields = [model._meta.get_field(name).name for name in fields]
+        update_fields += [
+            field.name for field in model._meta.concrete_fields
+            if getattr(field, 'auto_now', False) and field.name not in update_fields
+        ]
+        model._default_manager.bulk_create(
+            [model(**{key_field: key}, **values) for key, values in changed.items()],
+            update_conflicts=True,
+            unique_fields=[key_field],
+            update_fields=update_fields,
+        )
+    return changed
@@ -0,0 +1,123 @@
+"""
+Structured, non-blocking logging.
+
+- ``JsonFormatter`` renders a record as one JSON object per line, including the
+  fields passed with ``extra=``.
+- ``SamplingFilter`` lets through only one in N per-row events (records logged
+  with ``log_row()``); all other records pass.
+- ``QueueHandler`` formats records in the calling thread but leaves the write
+  to a background listener thread, so request and import code never waits on a
+  slow stdout/stderr pipe.
+
+The handlers are wired in ``LOGGING`` in fco_project/settings.py. Per-row import
+events are only emitted when ``IMPORT_ROW_LOGGING`` is enabled.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler as BaseQueueHandler, QueueListener
+from django.conf import settings
+
+# Attributes every LogRecord has; anything else was passed with extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects"""
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Pass one in ``rate`` records marked as sampled (per-row events); other records always pass"""
+
+    def __init__(self, rate=100):
+        super().__init__()
+        self.rate = max(1, int(rate))
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if not getattr(record, 'sampled', False):
+            return True
+        with self._lock:
+            self._count += 1
+            return (self._count - 1) % self.rate == 0
+
+
+class QueueHandler(BaseQueueHandler):
+    """
+    Queue records for a background thread that writes them to ``stream``.
+    When the queue is full, records are dropped instead of blocking the caller.
+    The listener is started on first use in each process, so it also works in
+    workers forked after settings were loaded.
+    """
+
+    def __init__(self, stream=None, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.stream = stream
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # A listener inherited through fork has no thread in this process
+            self.queue = queue.Queue(self.queue.maxsize)  # type: ignore
+            self._listener = QueueListener(self.queue, logging.StreamHandler(self.stream))
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Wait until all queued records have been written"""
+        with self._start_lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+                self._listener.start()
+
+    def close(self):
+        # Called by logging.shutdown() at exit, after flush()
+        with self._start_lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._pid = None
+        super().close()
+
+
+def row_logging_enabled(logger):
+    """True when per-row debug events should be logged (``IMPORT_ROW_LOGGING`` and DEBUG level)"""
+    return getattr(settings, 'IMPORT_ROW_LOGGING', False) and logger.isEnabledFor(logging.DEBUG)
+
+
+def log_row(logger, message, **fields):
+    """Log a sampled per-row debug event; check ``row_logging_enabled()`` once per batch first"""
+    logger.debug(message, extra=dict(fields, sampled=True))
@@ -48,6 +48,7 @@ INSTALLED_APPS = [
     'catches',
     'regions',
     'blockchain',  # Add the blockchain module
+    'imports',
 ]
 
 MIDDLEWARE = [
@@ -158,6 +159,62 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Background job workers (quota prediction and import jobs). 0 runs jobs inline.
+BACKGROUND_JOB_WORKERS = int(os.environ.get('BACKGROUND_JOB_WORKERS', 2))
+
+# Seconds between updated_at refreshes of a running quota prediction job; keep it
+# well below the --stale-after of resume_quota_prediction_jobs (300 by default)
+QUOTA_JOB_HEARTBEAT_SECONDS = 60
+
+# Uploaded files (import job uploads are kept under MEDIA_ROOT/imports/)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Rows per committed batch (and checkpoint) of a background import job
+IMPORT_JOB_BATCH_SIZE = 500
+
+# On-disk cache of the fco2 training frame built from the catch tables (catches/datasets.py)
+CATCH_DATASET_CACHE_DIR = BASE_DIR / 'cache' / 'datasets'
+
+# Ship registration number lookup cache (process-local LRU + Django cache)
+SHIP_LOOKUP_LRU_SIZE = 4096
+SHIP_LOOKUP_LOCAL_TIMEOUT = 60  # seconds
+SHIP_LOOKUP_CACHE_TIMEOUT = 3600  # seconds
+
+# Logging: JSON lines (or plain text) written to stderr by a background thread
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # 'json' or 'plain'
+# Per-row import debug events; keep off in production (also needs LOG_LEVEL=DEBUG)
+IMPORT_ROW_LOGGING = os.environ.get('IMPORT_ROW_LOGGING', '') == '1'
+IMPORT_ROW_LOG_SAMPLE_RATE = int(os.environ.get('IMPORT_ROW_LOG_SAMPLE_RATE', 100))  # log 1 in N row events
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'fco_project.log.JsonFormatter'},
+        'plain': {'format': '%(asctime)s %(levelname)s %(name)s: %(message)s'},
+    },
+    'filters': {
+        'row_sampling': {'()': 'fco_project.log.SamplingFilter', 'rate': IMPORT_ROW_LOG_SAMPLE_RATE},
+    },
+    'handlers': {
+        'queue': {
+            '()': 'fco_project.log.QueueHandler',
+            'formatter': LOG_FORMAT,
+            'filters': ['row_sampling'],
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': LOG_LEVEL,
+    },
+    'loggers': {
+        'django': {'level': 'INFO'},
+        'django.db.backends': {'level': 'WARNING'},
+    },
+}
+
 # Explicit encoding settings
 DEFAULT_CHARSET = 'utf-8'
 
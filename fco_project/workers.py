@@ -0,0 +1,56 @@
+"""
+Local background worker pool for long-running jobs.
+
+Jobs are submitted with ``submit()`` and executed on a process-wide thread pool
+so that web workers are not blocked while a job runs. The job state itself lives
+in the database, so clients can poll it independently of the request that
+created it.
+
+Setting ``BACKGROUND_JOB_WORKERS`` to 0 runs jobs inline in the calling thread
+(useful for tests and management commands).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_worker_count():
+    """Return the configured number of background workers"""
+    return int(getattr(settings, 'BACKGROUND_JOB_WORKERS', 2))
+
+
+def get_executor():
+    """Return the shared executor, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, get_worker_count()),
+                thread_name_prefix='fco-job'
+            )
+        return _executor
+
+
+def _run_job(func, args, kwargs):
+    """Run a job with its own database connection lifecycle"""
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+def submit(func, *args, **kwargs):
+    """
+    Submit a job to the background pool.
+
+    Returns a Future, or the job's return value when running inline.
+    """
+    if get_worker_count() <= 0:
+        return func(*args, **kwargs)
+    return get_executor().submit(_run_job, func, args, kwargs)
@@ -0,0 +1,157 @@
+"""
+Import of fish species and individual fish from CSV/Excel rows.
+
+Species rows are read in batches and each batch is upserted by species name
+with one read and one write query. Fish rows resolve their species from a
+preloaded name map (see fish/lookup.py) and each batch is inserted with one
+bulk_create. Created/updated/error counts match the row-by-row imports.
+"""
+
+import logging
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from fco_project.importing import DEFAULT_BATCH_SIZE, batched, run_field_validators, upsert_rows
+from fco_project.log import log_row, row_logging_enabled
+from .lookup import SpeciesResolver
+from .models import FishSpecies, Fish
+
+logger = logging.getLogger(__name__)
+
+
+def parse_species_row(row_num, row):
+    """Return ((name, values), None) for a valid row or (None, error message)"""
+    name = (row.get('name') or '').strip()
+    scientific_name = (row.get('scientific_name') or '').strip() or None
+    description = (row.get('description') or '').strip() or None
+
+    if not name:
+        return None, f'Row {row_num}: Nama Ikan tidak boleh kosong'
+
+    # Empty columns keep the values of an existing species
+    values = {}
+    if scientific_name:
+        values['scientific_name'] = scientific_name
+    if description:
+        values['description'] = description
+    try:
+        run_field_validators(FishSpecies, dict(values, name=name))
+    except ValidationError as e:
+        return None, f'Row {row_num}: Validation error - {str(e)}'
+    return (name, values), None
+
+
+def import_species_batch(batch, result):
+    """Import one batch of ``(row_num, row)`` pairs, adding its counts and errors to ``result``"""
+    log_rows = row_logging_enabled(logger)
+    rows = []
+    for row_num, row in batch:
+        parsed, error = parse_species_row(row_num, row)
+        if log_rows:
+            log_row(logger, 'Import row', row=row_num, error=error)
+        if error:
+            result['error_details'].append(error)
+        else:
+            rows.append(parsed)
+    with transaction.atomic():
+        upsert_rows(FishSpecies, 'name', rows, result)
+    logger.debug('Imported species batch', extra={
+        'first_row': batch[0][0], 'last_row': batch[-1][0], 'error_count': len(batch) - len(rows)
+    })
+
+
+def import_species(reader, clear_existing=False, chunk_size=DEFAULT_BATCH_SIZE):
+    """
+    Import fish species from an iterable of row dicts (see ``fco_project.importing.iter_rows``).
+
+    Returns a dict with the created/updated/error counts, the error messages
+    and the number of rows read.
+    """
+    if clear_existing:
+        FishSpecies._default_manager.all().delete()  # type: ignore
+
+    result = {'created': 0, 'updated': 0, 'error_details': [], 'rows': 0}
+    for batch in batched(enumerate(reader, start=1), chunk_size):
+        import_species_batch(batch, result)
+        result['rows'] = batch[-1][0]
+
+    result['errors'] = len(result['error_details'])
+    logger.info('Species import finished', extra={
+        'rows': result['rows'], 'created_count': result['created'],
+        'updated_count': result['updated'], 'error_count': result['errors']
+    })
+    return result
+
+
+def parse_fish_row(row_num, row, species):
+    """Return (Fish, None) for a valid row or (None, error message); ``species`` is a SpeciesResolver"""
+    species_name = (row.get('nama_jenis') or '').strip()
+    name = (row.get('name') or '').strip() or None
+    weight = (row.get('berat_kg') or '').strip()
+    notes = (row.get('catatan') or '').strip() or None
+
+    if not species_name:
+        return None, f'Row {row_num}: Missing species_name'
+
+    species_id = species.resolve(species_name)
+    if species_id is None:
+        return None, f'Row {row_num}: Fish species "{species_name}" not found'
+
+    weight_decimal = None
+    if weight:
+        try:
+            weight_decimal = Fish._meta.get_field('weight').to_python(weight)  # type: ignore
+        except ValidationError:
+            return None, f'Row {row_num}: Invalid weight value "{weight}"'
+
+    try:
+        run_field_validators(Fish, {'name': name, 'weight': weight_decimal, 'notes': notes})
+    except ValidationError as e:
+        return None, f'Row {row_num}: Validation error - {str(e)}'
+    return Fish(species_id=species_id, name=name, weight=weight_decimal, notes=notes), None
+
+
+def import_fish_batch(batch, result, species=None):
+    """
+    Import one batch of ``(row_num, row)`` fish rows with a single insert, adding
+    its counts and errors to ``result``. Pass the import's SpeciesResolver as
+    ``species`` to avoid reloading species for every batch.
+    """
+    species = species if species is not None else SpeciesResolver()
+    log_rows = row_logging_enabled(logger)
+    fish = []
+    for row_num, row in batch:
+        parsed, error = parse_fish_row(row_num, row, species)
+        if log_rows:
+            log_row(logger, 'Import row', row=row_num, error=error)
+        if error:
+            result['error_details'].append(error)
+        else:
+            fish.append(parsed)
+    if fish:
+        Fish._default_manager.bulk_create(fish)  # type: ignore
+        result['created'] += len(fish)
+    logger.debug('Imported fish batch', extra={
+        'first_row': batch[0][0], 'last_row': batch[-1][0], 'error_count': len(batch) - len(fish)
+    })
+
+
+def import_fish(reader, clear_existing=False, chunk_size=DEFAULT_BATCH_SIZE):
+    """
+    Import individual fish from an iterable of row dicts (see ``fco_project.importing.iter_rows``).
+
+    Returns a dict with the created/error counts (fish are never updated), the
+    error messages and the number of rows read.
+    """
+    if clear_existing:
+        Fish._default_manager.all().delete()  # type: ignore
+
+    # Species are resolved from one preloaded name map for the whole file
+    species = SpeciesResolver()
+    result = {'created': 0, 'updated': 0, 'error_details': [], 'rows': 0}
+    for batch in batched(enumerate(reader, start=1), chunk_size):
+        import_fish_batch(batch, result, species)
+        result['rows'] = batch[-1][0]
+
+    result['errors'] = len(result['error_details'])
+    logger.info('Fish import finished', extra={'rows': result['rows'], 'created_count': result['created'], 'error_count': result['errors']})
+    return result
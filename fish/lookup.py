@@ -0,0 +1,39 @@
+"""
+Fish species name -> id resolution for imports.
+
+A ``SpeciesResolver`` loads every species once (a single query) and resolves
+names from a dictionary, so an import costs one species query however many
+rows it has. Names are matched ignoring case and repeated whitespace, and the
+scientific name of a species works as an alias for it.
+"""
+
+from .models import FishSpecies
+
+
+def normalize_name(name):
+    """Case- and whitespace-insensitive form of a species name"""
+    return ' '.join(str(name).split()).casefold()
+
+
+class SpeciesResolver:
+    """Preloaded map of normalised species and scientific names to species ids"""
+
+    def __init__(self, queryset=None):
+        queryset = queryset if queryset is not None else FishSpecies._default_manager.all()  # type: ignore
+        self._ids = {}
+        aliases = {}
+        for species_id, name, scientific_name in queryset.values_list('pk', 'name', 'scientific_name'):
+            self._ids[normalize_name(name)] = species_id
+            if scientific_name:
+                aliases.setdefault(normalize_name(scientific_name), set()).add(species_id)
+
+        # Common names win over aliases; a scientific name shared by several species is ambiguous
+        for alias, species_ids in aliases.items():
+            if alias not in self._ids and len(species_ids) == 1:
+                self._ids[alias] = species_ids.pop()
+
+    def resolve(self, name):
+        """Return the id of the species with this name or scientific name, or None"""
+        if not name:
+            return None
+        return self._ids.get(normalize_name(name))
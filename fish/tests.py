@@ -6,6 +6,9 @@ from django.contrib.auth import get_user_model
 from django.apps import apps
 from typing import Any, cast
 from rest_framework.response import Response
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from fish.lookup import SpeciesResolver
 
 class FishSpeciesImportTestCase(TestCase):
     def setUp(self):
@@ -239,3 +242,45 @@ class FishTemplateDownloadTest(TestCase):
         # Check that the response contains CSV data
         content = response.content.decode('utf-8')
         self.assertIn('species_name,name,length,weight,notes', content)
+
+
+class FishBulkImportTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.import_url = reverse('fish-import-fish')
+        User = get_user_model()
+        self.client.force_authenticate(user=User.objects.create_user(username='testuser', password='testpass123'))
+        FishSpecies = apps.get_model('fish', 'FishSpecies')
+        self.tuna = FishSpecies._default_manager.create(name='Tuna Sirip Kuning', scientific_name='Thunnus albacares')  # type: ignore
+        FishSpecies._default_manager.create(name='Kakap Merah', scientific_name='Lutjanus spp.')  # type: ignore
+        FishSpecies._default_manager.create(name='Kakap Putih', scientific_name='Lutjanus spp.')  # type: ignore
+
+    def test_species_resolver_normalises_names_and_aliases(self):
+        """Names match regardless of case and spacing; unique scientific names are aliases"""
+        with self.assertNumQueries(1):
+            species = SpeciesResolver()
+        self.assertEqual(species.resolve('  tuna   SIRIP kuning '), self.tuna.pk)
+        self.assertEqual(species.resolve('thunnus ALBACARES'), self.tuna.pk)
+        # Shared by two species, so not usable as an alias
+        self.assertIsNone(species.resolve('Lutjanus spp.'))
+        self.assertIsNone(species.resolve('Ikan Tidak Ada'))
+
+    def test_import_fish_query_count_does_not_grow_with_rows(self):
+        """Species are resolved once and fish are inserted in bulk"""
+        def run(count):
+            rows = ''.join(f'tuna sirip kuning,Ikan {i},{i % 90 + 1}.5,\n' for i in range(count))
+            with CaptureQueriesContext(connection) as queries:
+                response = cast(Response, self.client.post(self.import_url, {
+                    'csv_data': 'nama_jenis,name,berat_kg,catatan\n' + rows + 'Ikan Tidak Ada,X,1,\nThunnus albacares,Y,abc,\n'
+                }, format='json'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['created'], count)  # type: ignore
+            self.assertEqual(response.data['error_details'], [  # type: ignore
+                f'Row {count + 1}: Fish species "Ikan Tidak Ada" not found',
+                f'Row {count + 2}: Invalid weight value "abc"',
+            ])
+            return len(queries)
+
+        small = run(10)
+        # Allow for SQLite splitting large inserts into batches
+        self.assertLessEqual(run(400), small + 3)
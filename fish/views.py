@@ -1,13 +1,11 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.core.exceptions import ValidationError
-from django.apps import apps
 from django.http import HttpResponse
-from io import StringIO
-import csv
 from .models import FishSpecies, Fish
 from .serializers import FishSpeciesSerializer, FishSerializer
+from .importers import import_species, import_fish
+from fco_project.importing import get_flag, get_import_source, iter_rows
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiExample
 from drf_spectacular.types import OpenApiTypes
 
@@ -100,90 +98,26 @@ class FishSpeciesViewSet(viewsets.ModelViewSet):
         """
         Import fish species from CSV data provided in the request
         """
-        csv_data = request.data.get('csv_data')
-        clear_existing = request.data.get('clear_existing', False)
+        upload, csv_data = get_import_source(request, file_fields=('csv_data',))
+        clear_existing = get_flag(request, 'clear_existing')
         
-        if not csv_data:
+        if upload is None and not csv_data:
             return Response(
                 {'error': 'csv_data is required'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get the FishSpecies model dynamically
-        FishSpecies = apps.get_model('fish', 'FishSpecies')
-        
-        # Clear existing data if requested
-        if clear_existing:
-            FishSpecies._default_manager.all().delete()  # type: ignore
-        
         # Process CSV data
         try:
-            # Handle different types of csv_data
-            if hasattr(csv_data, 'read'):  # File-like object (e.g., InMemoryUploadedFile)
-                csv_string = csv_data.read().decode('utf-8')
-            elif isinstance(csv_data, bytes):
-                csv_string = csv_data.decode('utf-8')
-            else:
-                csv_string = str(csv_data)
-            # Use StringIO to treat string as file-like object
-            csv_file = StringIO(csv_string)
-            reader = csv.DictReader(csv_file)
-            
-            created_count = 0
-            updated_count = 0
-            error_count = 0
-            error_details = []
-            
-            for row_num, row in enumerate(reader, start=1):
-                try:
-                    # Extract data from CSV row
-                    name = row.get('name', '').strip()
-                    scientific_name = row.get('scientific_name', '').strip() or None
-                    description = row.get('description', '').strip() or None
-                    
-                    # Validate required fields
-                    if not name:
-                        error_details.append(f'Row {row_num}: Nama Ikan tidak boleh kosong')
-                        error_count += 1
-                        continue
-                    
-                    # Create or update the fish species
-                    fish_species, created = FishSpecies._default_manager.get_or_create(  # type: ignore
-                        name=name,
-                        defaults={
-                            'scientific_name': scientific_name,
-                            'description': description,
-                        }
-                    )
-                    
-                    if created:
-                        created_count += 1
-                    else:
-                        # Update existing record if there's new data
-                        updated = False
-                        if scientific_name and fish_species.scientific_name != scientific_name:
-                            fish_species.scientific_name = scientific_name
-                            updated = True
-                        if description and fish_species.description != description:
-                            fish_species.description = description
-                            updated = True
-                        
-                        if updated:
-                            fish_species.save()
-                            updated_count += 1
-            
-                except ValidationError as e:
-                    error_details.append(f'Row {row_num}: Validation error - {str(e)}')
-                    error_count += 1
-                except Exception as e:
-                    error_details.append(f'Row {row_num}: Unexpected error - {str(e)}')
-                    error_count += 1
+            # Rows are streamed from the upload and written in batches
+            result = import_species(iter_rows(upload, csv_data), clear_existing=clear_existing)
+            error_details = result['error_details']
             
             return Response({
                 'message': 'Import completed',
-                'created': created_count,
-                'updated': updated_count,
-                'errors': error_count,
+                'created': result['created'],
+                'updated': result['updated'],
+                'errors': result['errors'],
                 'error_details': error_details if error_details else None
             })
             
@@ -317,99 +251,26 @@ class FishViewSet(viewsets.ModelViewSet):
         """
         Import fish from CSV data provided in the request
         """
-        csv_data = request.data.get('csv_data')
-        clear_existing = request.data.get('clear_existing', False)
+        upload, csv_data = get_import_source(request, file_fields=('csv_data',))
+        clear_existing = get_flag(request, 'clear_existing')
         
-        if not csv_data:
+        if upload is None and not csv_data:
             return Response(
                 {'error': 'csv_data is required'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get the Fish and FishSpecies models dynamically
-        Fish = apps.get_model('fish', 'Fish')
-        FishSpecies = apps.get_model('fish', 'FishSpecies')
-        
-        # Clear existing data if requested
-        if clear_existing:
-            Fish._default_manager.all().delete()  # type: ignore
-        
         # Process CSV data
         try:
-            # Handle different types of csv_data
-            if hasattr(csv_data, 'read'):  # File-like object (e.g., InMemoryUploadedFile)
-                csv_string = csv_data.read().decode('utf-8')
-            elif isinstance(csv_data, bytes):
-                csv_string = csv_data.decode('utf-8')
-            else:
-                csv_string = str(csv_data)
-            # Use StringIO to treat string as file-like object
-            csv_file = StringIO(csv_string)
-            reader = csv.DictReader(csv_file)
-            
-            created_count = 0
-            updated_count = 0
-            error_count = 0
-            error_details = []
-            
-            for row_num, row in enumerate(reader, start=1):
-                try:
-                    # Extract data from CSV row
-                    species_name = row.get('nama_jenis', '').strip()
-                    name = row.get('name', '').strip() or None
-                    weight = row.get('berat_kg', '').strip()
-                    notes = row.get('catatan', '').strip() or None
-                    
-                    # Validate required fields
-                    if not species_name:
-                        error_details.append(f'Row {row_num}: Missing species_name')
-                        error_count += 1
-                        continue
-                    
-                    # Find the fish species
-                    try:
-                        species = FishSpecies._default_manager.get(name=species_name)  # type: ignore
-                    except FishSpecies.DoesNotExist:  # type: ignore
-                        error_details.append(f'Row {row_num}: Fish species "{species_name}" not found')
-                        error_count += 1
-                        continue
-                    
-                    # Convert weight to Decimal if provided
-                    weight_decimal = None
-
-                    if weight:
-                        try:
-                            weight_decimal = float(weight)
-                        except ValueError:
-                            error_details.append(f'Row {row_num}: Invalid weight value "{weight}"')
-                            error_count += 1
-                            continue
-                    
-                    # Create fish instance
-                    fish = Fish(
-                        species=species,
-                        name=name,
-                        weight=weight_decimal,
-                        notes=notes
-                    )
-                    
-                    try:
-                        fish.full_clean()  # Validate model fields
-                        fish.save()
-                        created_count += 1
-                    except ValidationError as e:
-                        error_details.append(f'Row {row_num}: Validation error - {str(e)}')
-                        error_count += 1
-            
-                except Exception as e:
-                    error_details.append(f'Row {row_num}: Unexpected error - {str(e)}')
-                    error_count += 1
+            # Rows are streamed from the upload instead of being decoded into one string
+            result = import_fish(iter_rows(upload, csv_data), clear_existing=clear_existing)
+            error_details = result['error_details']
             
             return Response({
                 'message': 'Import completed',
-                'created': created_count,
-                'updated': updated_count,
-                'errors': error_count,
+                'created': result['created'],
+                'updated': result['updated'],
+                'errors': result['errors'],
                 'error_details': error_details if error_details else None
             })
             
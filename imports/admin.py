@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import ImportJob, ImportJobError
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'original_name', 'status', 'rows_processed', 'total_rows', 'error_count', 'created_at')
+    list_filter = ('kind', 'status')
+    search_fields = ('original_name',)
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'updated_at')
+
+@admin.register(ImportJobError)
+class ImportJobErrorAdmin(admin.ModelAdmin):
+    list_display = ('job', 'message')
+    search_fields = ('message',)
@@ -0,0 +1,135 @@
+"""
+Background CSV/Excel import jobs.
+
+The uploaded file is stored on disk and the job is executed by the local
+background worker pool. Rows are imported in batches; each batch is committed
+in one transaction together with its rejected rows and the job's row offset,
+so a job interrupted by a crash resumes after the last committed batch (see the
+``resume_import_jobs`` management command) without importing any row twice.
+"""
+
+import logging
+from functools import partial
+from itertools import islice
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from fco_project import workers
+from fco_project.importing import DEFAULT_BATCH_SIZE, batched, iter_rows
+from fish import importers as fish_importers
+from fish.lookup import SpeciesResolver
+from fish.models import Fish, FishSpecies
+from regions import importers as region_importers
+from regions.models import FishingArea
+from ships import importers as ship_importers
+from ships.models import Ship
+from .models import ImportJob, ImportJobError
+
+logger = logging.getLogger(__name__)
+
+
+def _fish_batch_importer():
+    # Species are resolved from one preloaded name map for the whole job
+    return partial(fish_importers.import_fish_batch, species=SpeciesResolver())
+
+
+# kind -> (model cleared by clear_existing, factory returning the batch importer for one run)
+IMPORTERS = {
+    ImportJob.KIND_SHIPS: (Ship, lambda: ship_importers.import_batch),
+    ImportJob.KIND_AREAS: (FishingArea, lambda: region_importers.import_batch),
+    ImportJob.KIND_SPECIES: (FishSpecies, lambda: fish_importers.import_species_batch),
+    ImportJob.KIND_FISH: (Fish, _fish_batch_importer),
+}
+
+
+def get_batch_size():
+    return int(getattr(settings, 'IMPORT_JOB_BATCH_SIZE', DEFAULT_BATCH_SIZE))
+
+
+def _claim(job):
+    """
+    Mark the job as running unless another worker touched it since it was read.
+    Returns False when the job was claimed elsewhere.
+    """
+    now = timezone.now()
+    claimed = ImportJob.objects.filter(pk=job.pk, updated_at=job.updated_at).update(
+        status=ImportJob.STATUS_RUNNING,
+        started_at=job.started_at or now,
+        updated_at=now
+    )
+    if claimed:
+        job.refresh_from_db()
+    return bool(claimed)
+
+
+def _count_rows(job):
+    with job.file.open('rb') as upload:
+        return sum(1 for _ in iter_rows(upload))
+
+
+def _import_batch(job, import_batch, batch):
+    """Import one batch and checkpoint the job in the same transaction"""
+    result = {'created': 0, 'updated': 0, 'error_details': []}
+    with transaction.atomic():
+        import_batch(batch, result)
+        ImportJobError.objects.bulk_create([
+            ImportJobError(job=job, message=message) for message in result['error_details']
+        ])
+        job.rows_processed = batch[-1][0]
+        job.created_count += result['created']
+        job.updated_count += result['updated']
+        job.error_count += len(result['error_details'])
+        job.save(update_fields=['rows_processed', 'created_count', 'updated_count', 'error_count', 'updated_at'])
+    logger.debug('Import job checkpoint', extra={'job_id': job.pk, 'rows_processed': job.rows_processed})
+
+
+def run_import_job(job_id):
+    """Execute (or resume) an import job from its last checkpoint"""
+    job = ImportJob.objects.get(pk=job_id)
+    if job.is_finished or not _claim(job):
+        return job
+
+    model, make_importer = IMPORTERS[job.kind]
+    try:
+        if job.total_rows is None:
+            job.total_rows = _count_rows(job)
+            job.save(update_fields=['total_rows', 'updated_at'])
+
+        # Nothing is committed before the first checkpoint, so clearing again on resume is safe
+        if job.clear_existing and job.rows_processed == 0:
+            model._default_manager.all().delete()  # type: ignore
+
+        import_batch = make_importer()
+        with job.file.open('rb') as upload:
+            rows = islice(enumerate(iter_rows(upload), start=1), job.rows_processed, None)
+            for batch in batched(rows, get_batch_size()):
+                _import_batch(job, import_batch, batch)
+
+        job.status = ImportJob.STATUS_COMPLETED
+    except Exception as e:
+        logger.exception('Import job failed', extra={'job_id': job.pk, 'kind': job.kind, 'rows_processed': job.rows_processed})
+        job.error = str(e)
+        job.status = ImportJob.STATUS_FAILED
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+    if job.status == ImportJob.STATUS_COMPLETED:
+        logger.info('Import job completed', extra={
+            'job_id': job.pk, 'kind': job.kind, 'rows_processed': job.rows_processed,
+            'created_count': job.created_count, 'updated_count': job.updated_count, 'error_count': job.error_count
+        })
+    return job
+
+
+def enqueue_import_job(job):
+    """Hand a saved job to the worker pool once the creating transaction commits"""
+    transaction.on_commit(lambda: workers.submit(run_import_job, job.pk))
+    return job
+
+
+def resumable_jobs(stale_after):
+    """Unfinished jobs that no worker has touched for ``stale_after`` (a timedelta)"""
+    return ImportJob.objects.filter(
+        status__in=[ImportJob.STATUS_PENDING, ImportJob.STATUS_RUNNING],
+        updated_at__lt=timezone.now() - stale_after
+    ).order_by('created_at')
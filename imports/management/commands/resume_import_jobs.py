@@ -0,0 +1,44 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from imports.jobs import run_import_job, resumable_jobs
+from imports.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = 'Resume import jobs interrupted by a crash or restart from their last checkpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_ids', nargs='*', type=int, help='Jobs to resume (failed jobs are retried); default: all stale unfinished jobs')
+        parser.add_argument('--stale-after', type=int, default=300, help='Seconds without progress before a pending/running job is considered interrupted (default: 300)')
+
+    def handle(self, *args, **options):
+        if options['job_ids']:
+            jobs = list(ImportJob.objects.filter(pk__in=options['job_ids']).order_by('created_at'))
+            missing = set(options['job_ids']) - {job.pk for job in jobs}
+            if missing:
+                raise CommandError(f'Import job(s) not found: {", ".join(map(str, sorted(missing)))}')
+            for job in jobs:
+                if job.status == ImportJob.STATUS_FAILED:
+                    # Retry from the checkpoint; committed batches are kept
+                    job.status = ImportJob.STATUS_PENDING
+                    job.error = None
+                    job.finished_at = None
+                    job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+        else:
+            jobs = list(resumable_jobs(timedelta(seconds=options['stale_after'])))
+
+        if not jobs:
+            self.stdout.write('No import jobs to resume')
+            return
+
+        for job in jobs:
+            if job.status == ImportJob.STATUS_COMPLETED:
+                self.stdout.write(f'Job {job.pk} already completed, skipped')
+                continue
+            self.stdout.write(f'Resuming job {job.pk} ({job.kind}) from row {job.rows_processed}...')
+            job = run_import_job(job.pk)
+            style = self.style.SUCCESS if job.status == ImportJob.STATUS_COMPLETED else self.style.ERROR
+            self.stdout.write(style(
+                f'Job {job.pk} {job.status}: {job.rows_processed} rows, {job.created_count} created, '
+                f'{job.updated_count} updated, {job.error_count} errors'
+            ))
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('ships', 'Kapal'), ('areas', 'Wilayah Penangkapan'), ('species', 'Spesies Ikan'), ('fish', 'Ikan')], max_length=20, verbose_name='Jenis Data')),
+                ('file', models.FileField(upload_to='imports/%Y/%m/', verbose_name='Berkas')),
+                ('original_name', models.CharField(blank=True, max_length=255, verbose_name='Nama Berkas Asli')),
+                ('clear_existing', models.BooleanField(default=False, verbose_name='Hapus Data Lama')),
+                ('status', models.CharField(choices=[('pending', 'Menunggu'), ('running', 'Berjalan'), ('completed', 'Selesai'), ('failed', 'Gagal')], default='pending', max_length=20, verbose_name='Status')),
+                ('total_rows', models.IntegerField(blank=True, null=True, verbose_name='Jumlah Baris')),
+                ('rows_processed', models.IntegerField(default=0, verbose_name='Baris Diproses')),
+                ('created_count', models.IntegerField(default=0, verbose_name='Dibuat')),
+                ('updated_count', models.IntegerField(default=0, verbose_name='Diperbarui')),
+                ('error_count', models.IntegerField(default=0, verbose_name='Kesalahan Baris')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='Kesalahan')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Diminta Oleh')),
+            ],
+            options={
+                'verbose_name': 'Job Impor',
+                'verbose_name_plural': 'Job Impor',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportJobError',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message', models.TextField(verbose_name='Pesan')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='row_errors', to='imports.importjob', verbose_name='Job Impor')),
+            ],
+            options={
+                'verbose_name': 'Kesalahan Impor',
+                'verbose_name_plural': 'Kesalahan Impor',
+                'ordering': ['id'],
+            },
+        ),
+    ]
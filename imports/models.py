@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.db import models
+
+class ImportJob(models.Model):
+    """Model representing a background CSV/Excel import of ships, fishing areas, fish species or fish"""
+    KIND_SHIPS = 'ships'
+    KIND_AREAS = 'areas'
+    KIND_SPECIES = 'species'
+    KIND_FISH = 'fish'
+    KIND_CHOICES = [
+        (KIND_SHIPS, 'Kapal'),
+        (KIND_AREAS, 'Wilayah Penangkapan'),
+        (KIND_SPECIES, 'Spesies Ikan'),
+        (KIND_FISH, 'Ikan'),
+    ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Menunggu'),
+        (STATUS_RUNNING, 'Berjalan'),
+        (STATUS_COMPLETED, 'Selesai'),
+        (STATUS_FAILED, 'Gagal'),
+    ]
+
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='import_jobs', verbose_name="Diminta Oleh")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Jenis Data")
+    file = models.FileField(upload_to='imports/%Y/%m/', verbose_name="Berkas")
+    original_name = models.CharField(max_length=255, blank=True, verbose_name="Nama Berkas Asli")
+    clear_existing = models.BooleanField(default=False, verbose_name="Hapus Data Lama")  # type: ignore
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Status")
+    total_rows = models.IntegerField(blank=True, null=True, verbose_name="Jumlah Baris")
+    # Checkpoint: rows of the file whose results are committed; a resumed job continues after it
+    rows_processed = models.IntegerField(default=0, verbose_name="Baris Diproses")  # type: ignore
+    created_count = models.IntegerField(default=0, verbose_name="Dibuat")  # type: ignore
+    updated_count = models.IntegerField(default=0, verbose_name="Diperbarui")  # type: ignore
+    error_count = models.IntegerField(default=0, verbose_name="Kesalahan Baris")  # type: ignore
+    error = models.TextField(blank=True, null=True, verbose_name="Kesalahan")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def progress(self):
+        """Progress as a percentage of processed rows"""
+        if not self.total_rows:
+            return 100 if self.status == self.STATUS_COMPLETED else 0
+        return round(self.rows_processed * 100 / self.total_rows)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED)
+
+    def __str__(self):
+        return f"Import job {self.pk} ({self.kind}, {self.status})"
+
+    class Meta:
+        verbose_name = "Job Impor"
+        verbose_name_plural = "Job Impor"
+        ordering = ['-created_at']
+
+
+class ImportJobError(models.Model):
+    """Model representing one rejected row of an import job"""
+    job = models.ForeignKey(ImportJob, on_delete=models.CASCADE, related_name='row_errors', verbose_name="Job Impor")
+    message = models.TextField(verbose_name="Pesan")
+
+    def __str__(self):
+        return self.message
+
+    class Meta:
+        verbose_name = "Kesalahan Impor"
+        verbose_name_plural = "Kesalahan Impor"
+        ordering = ['id']
@@ -0,0 +1,43 @@
+from rest_framework import serializers
+from fco_project.importing import EXCEL_EXTENSIONS
+from .models import ImportJob
+
+IMPORT_FILE_EXTENSIONS = ('.csv',) + EXCEL_EXTENSIONS
+
+
+class ImportJobInputSerializer(serializers.Serializer):
+    """Serializer for submitting a background import job"""
+    kind = serializers.ChoiceField(
+        choices=ImportJob.KIND_CHOICES,
+        help_text="Jenis data yang diimpor: ships, areas, species atau fish"
+    )
+    file = serializers.FileField(
+        help_text="Berkas CSV atau Excel dengan header yang sama seperti endpoint impor langsung"
+    )
+    clear_existing = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Jika true, hapus data lama sebelum mengimpor"
+    )
+
+    def validate_file(self, value):
+        if not value.name.lower().endswith(IMPORT_FILE_EXTENSIONS):
+            raise serializers.ValidationError(
+                f"Format berkas tidak didukung, gunakan {', '.join(IMPORT_FILE_EXTENSIONS)}"
+            )
+        return value
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Serializer for the status and progress of a background import job"""
+    progress = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id', 'kind', 'original_name', 'clear_existing', 'status',
+            'total_rows', 'rows_processed', 'progress',
+            'created_count', 'updated_count', 'error_count', 'error',
+            'created_at', 'started_at', 'finished_at', 'updated_at'
+        ]
+        read_only_fields = fields
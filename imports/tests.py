@@ -0,0 +1,134 @@
+import json
+import logging
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from typing import cast
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from regions.models import FishingArea
+from ships.models import Ship
+from fco_project.log import JsonFormatter, SamplingFilter, log_row, row_logging_enabled
+from imports.models import ImportJob
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(BACKGROUND_JOB_WORKERS=0, MEDIA_ROOT=MEDIA_ROOT, IMPORT_JOB_BATCH_SIZE=2)
+class ImportJobTestCase(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        User = get_user_model()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+    def submit(self, kind, name, content):
+        upload = SimpleUploadedFile(name, content.encode('utf-8'))
+        with self.captureOnCommitCallbacks(execute=True):
+            return cast(Response, self.client.post(
+                reverse('submit_import_job'), {'kind': kind, 'file': upload}, format='multipart'
+            ))
+
+    def test_ship_import_job_reports_progress_and_errors(self):
+        """The upload is imported in the background and rejected rows can be downloaded"""
+        response = self.submit('ships', 'kapal.csv', (
+            'name,registration_number,owner_name\n'
+            'Kapal Satu,REG001,Pemilik\n'
+            ',REG002,Pemilik\n'
+            'Kapal Tiga,REG003,Pemilik\n'
+            'Kapal Empat,,Pemilik\n'
+            'Kapal Lima,REG005,Pemilik\n'
+        ))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        job_status = cast(Response, self.client.get(reverse('import_job_status', args=[response.data['id']])))  # type: ignore
+        self.assertEqual(job_status.data['status'], ImportJob.STATUS_COMPLETED)  # type: ignore
+        self.assertEqual(job_status.data['total_rows'], 5)  # type: ignore
+        self.assertEqual(job_status.data['rows_processed'], 5)  # type: ignore
+        self.assertEqual(job_status.data['created_count'], 3)  # type: ignore
+        self.assertEqual(job_status.data['error_count'], 2)  # type: ignore
+        self.assertEqual(Ship.objects.count(), 3)
+
+        report = self.client.get(reverse('import_job_errors', args=[response.data['id']]))  # type: ignore
+        self.assertEqual(report.status_code, status.HTTP_200_OK)
+        lines = b''.join(report.streaming_content).decode('utf-8').splitlines()  # type: ignore
+        self.assertEqual(lines, [
+            'error',
+            'Row 2: Missing name/nama_kapal',
+            'Row 4: Missing registration_number/no_buku_kapal',
+        ])
+
+    def test_unsupported_file_is_rejected(self):
+        response = self.submit('areas', 'areas.txt', 'nama,code\n')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ImportJob.objects.exists())
+
+    def test_interrupted_job_resumes_from_checkpoint(self):
+        """Rows before the checkpoint are not imported again"""
+        content = 'nama,code\n' + ''.join(f'Wilayah {i},WPP 71{i}\n' for i in range(1, 6))
+        job = ImportJob.objects.create(
+            requested_by=self.user,
+            kind=ImportJob.KIND_AREAS,
+            file=ContentFile(content.encode('utf-8'), name='areas.csv'),
+            original_name='areas.csv',
+            status=ImportJob.STATUS_RUNNING,
+            total_rows=5,
+            rows_processed=2,
+            created_count=2
+        )
+        # Simulate a worker that died ten minutes ago
+        ImportJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(minutes=10))
+
+        call_command('resume_import_jobs', stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_COMPLETED)
+        self.assertEqual(job.rows_processed, 5)
+        self.assertEqual(job.created_count, 5)
+        self.assertEqual(
+            sorted(FishingArea.objects.values_list('code', flat=True)),  # type: ignore
+            ['WPP 713', 'WPP 714', 'WPP 715']
+        )
+
+
+class StructuredLoggingTestCase(TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger('imports.tests.rows')
+        self.logger.setLevel(logging.DEBUG)
+        self.addCleanup(self.logger.setLevel, logging.NOTSET)
+
+    def test_row_logging_is_off_unless_enabled(self):
+        self.assertFalse(row_logging_enabled(self.logger))
+        with self.settings(IMPORT_ROW_LOGGING=True):
+            self.assertTrue(row_logging_enabled(self.logger))
+
+    def test_row_events_are_sampled_and_rendered_as_json(self):
+        """Only one in N row events passes; extra fields end up in the JSON line"""
+        sampling = SamplingFilter(rate=3)
+        with self.assertLogs(self.logger, logging.DEBUG) as logs:
+            for row_num in range(1, 7):
+                log_row(self.logger, 'Import row', row=row_num, error=None)
+            self.logger.info('Import finished', extra={'rows': 6})
+
+        passed = [record for record in logs.records if sampling.filter(record)]
+        self.assertEqual([getattr(record, 'row', None) for record in passed], [1, 4, None])
+
+        entry = json.loads(JsonFormatter().format(passed[-1]))
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['logger'], 'imports.tests.rows')
+        self.assertEqual(entry['message'], 'Import finished')
+        self.assertEqual(entry['rows'], 6)
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import submit_import_job, import_job_status, import_job_errors
+
+urlpatterns = [
+    path('jobs/', submit_import_job, name='submit_import_job'),
+    path('jobs/<int:job_id>/', import_job_status, name='import_job_status'),
+    path('jobs/<int:job_id>/errors/', import_job_errors, name='import_job_errors'),
+]
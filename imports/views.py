@@ -0,0 +1,121 @@
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from fco_project.exports import EXPORT_CHUNK_SIZE, iter_csv
+from .jobs import enqueue_import_job
+from .models import ImportJob
+from .serializers import ImportJobInputSerializer, ImportJobSerializer
+
+
+def _get_visible_job(request, job_id):
+    """Return the job if it exists and the user may see it, otherwise None"""
+    job = ImportJob.objects.filter(pk=job_id).first()
+    if job is None:
+        return None
+    user = request.user
+    if job.requested_by_id == user.id or user.is_staff or getattr(user, 'role', None) in ('admin', 'regulator'):
+        return job
+    return None
+
+
+def _stream_errors(job):
+    """Yield the job's error report as CSV lines without loading all rows at once"""
+    return iter_csv(['error'], job.row_errors.values_list('message').iterator(chunk_size=EXPORT_CHUNK_SIZE))
+
+
+@extend_schema(
+    tags=['Imports'],
+    summary='Kirim Job Impor (Asinkron)',
+    description='''Mengunggah berkas CSV/Excel kapal, wilayah penangkapan, spesies ikan atau ikan
+    dan mengimpornya di latar belakang.
+
+    Cara kerja:
+    1. Kirim berkas dan terima ID job (HTTP 202)
+    2. Pantau progres (baris diproses, kesalahan sejauh ini) melalui GET /imports/jobs/{id}/
+    3. Unduh laporan lengkap baris yang ditolak melalui GET /imports/jobs/{id}/errors/
+
+    Job yang terhenti (misalnya server mati) dilanjutkan dari checkpoint terakhir
+    dengan perintah `manage.py resume_import_jobs`.''',
+    request={'multipart/form-data': ImportJobInputSerializer},
+    responses={
+        202: ImportJobSerializer,
+        400: {
+            'type': 'object',
+            'properties': {
+                'error': {'type': 'string', 'description': 'Pesan kesalahan validasi'}
+            }
+        }
+    }
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser, FormParser])
+def submit_import_job(request):
+    """
+    Endpoint untuk mengirim job impor CSV/Excel yang dijalankan di latar belakang
+    """
+    serializer = ImportJobInputSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(
+            {'error': 'Invalid input data', 'details': serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    validated_data = serializer.validated_data
+    upload = validated_data['file']  # type: ignore
+    job = ImportJob.objects.create(
+        requested_by=request.user,
+        kind=validated_data['kind'],  # type: ignore
+        file=upload,
+        original_name=upload.name,
+        clear_existing=validated_data.get('clear_existing', False)  # type: ignore
+    )
+    enqueue_import_job(job)
+
+    response = Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+    response['Location'] = f'/api/imports/jobs/{job.pk}/'
+    return response
+
+
+@extend_schema(
+    tags=['Imports'],
+    summary='Status Job Impor',
+    description='Mengambil status dan progres job impor: baris diproses, data dibuat/diperbarui dan jumlah kesalahan sejauh ini',
+    responses={200: ImportJobSerializer}
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def import_job_status(request, job_id):
+    """
+    Endpoint untuk memantau status dan progres job impor
+    """
+    job = _get_visible_job(request, job_id)
+    if job is None:
+        return Response({'error': 'Job tidak ditemukan'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(ImportJobSerializer(job).data)
+
+
+@extend_schema(
+    tags=['Imports'],
+    summary='Laporan Kesalahan Job Impor',
+    description='Mengunduh semua baris yang ditolak oleh job impor sebagai CSV (dapat diunduh selama job berjalan)',
+    responses={(200, 'text/csv'): OpenApiTypes.BINARY}
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def import_job_errors(request, job_id):
+    """
+    Endpoint untuk mengunduh laporan kesalahan job impor
+    """
+    job = _get_visible_job(request, job_id)
+    if job is None:
+        return Response({'error': 'Job tidak ditemukan'}, status=status.HTTP_404_NOT_FOUND)
+
+    response = StreamingHttpResponse(_stream_errors(job), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="import_job_{job.pk}_errors.csv"'
+    return response
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import Q
 from ships.models import Ship
+from ships.lookup import get_ship
 
 User = get_user_model()
 
@@ -23,7 +24,7 @@ class ShipNumberOrUsernameBackend(ModelBackend):
         except User.DoesNotExist:
             # If not found, check if it's a ship registration number
             try:
-                ship = Ship._default_manager.get(registration_number=username)
+                ship = get_ship(username, Ship._default_manager.select_related('owner', 'captain'))
                 # Get the owner or captain associated with this ship
                 if ship.owner and ship.owner.user:
                     user = ship.owner.user
@@ -6,6 +6,10 @@ from django.contrib.auth import get_user_model
 from django.apps import apps
 from typing import Any, cast
 from rest_framework.response import Response
+from django.core.files.uploadedfile import SimpleUploadedFile
+from io import BytesIO
+from openpyxl import Workbook
+from fco_project.importing import iter_lines, iter_csv_rows
 
 class FishingAreaImportTestCase(TestCase):
     def setUp(self):
@@ -94,4 +98,91 @@ Area Penangkapan Barat,,Wilayah penangkapan di barat"""
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response['Content-Type'], 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        self.assertIn('attachment; filename="fishingarea_import_template.xlsx"', response['Content-Disposition'])
\ No newline at end of file
+        self.assertIn('attachment; filename="fishingarea_import_template.xlsx"', response['Content-Disposition'])
+
+class StreamingImportTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.import_url = reverse('fishingarea-import-areas')
+        User = get_user_model()
+        self.client.force_authenticate(user=User.objects.create_user(username='testuser', password='testpass123'))
+
+    def test_csv_lines_are_decoded_across_chunk_boundaries(self):
+        """Multi-byte characters and quoted newlines split between chunks are decoded intact"""
+        content = '\ufeffnama,code,deskripsi\n"Perairan Selatan\nJawa",WPP 573,Ikan tongkol — cakalang\n'.encode('utf-8')
+        lines = list(iter_lines(BytesIO(content), chunk_size=3))
+        self.assertEqual(''.join(lines), content.decode('utf-8-sig'))
+
+        rows = list(iter_csv_rows(BytesIO(content)))
+        self.assertEqual(rows, [{'nama': 'Perairan Selatan\nJawa', 'code': 'WPP 573', 'deskripsi': 'Ikan tongkol — cakalang'}])
+
+    def test_import_areas_from_excel_upload(self):
+        """Excel uploads are read row by row and written in batches"""
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet.append(['nama', 'code', 'deskripsi'])  # type: ignore
+        worksheet.append(['Samudera Hindia', 711, None])  # type: ignore
+        worksheet.append([None, None, None])  # type: ignore
+        worksheet.append(['Selat Makassar', 'WPP 713', 'Laut Flores'])  # type: ignore
+        worksheet.append(['', 'WPP 714', 'Tanpa nama'])  # type: ignore
+        output = BytesIO()
+        workbook.save(output)
+
+        upload = SimpleUploadedFile('areas.xlsx', output.getvalue())
+        response = cast(Response, self.client.post(self.import_url, {'csv_file': upload}, format='multipart'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 2)  # type: ignore
+        self.assertEqual(response.data['error_details'], ['Row 3: Missing nama'])  # type: ignore
+        FishingArea = apps.get_model('regions', 'FishingArea')
+        area = FishingArea._default_manager.get(code='711')  # type: ignore
+        self.assertIsNone(area.deskripsi)
+
+    def test_dry_run_returns_diff_without_writing(self):
+        """A dry run reports created/updated/unchanged rows and the changed fields only"""
+        FishingArea = apps.get_model('regions', 'FishingArea')
+        FishingArea._default_manager.create(nama='Selat Malaka', code='WPP 571', deskripsi='Lama')  # type: ignore
+        FishingArea._default_manager.create(nama='Laut Jawa', code='WPP 712', deskripsi='Tetap')  # type: ignore
+        csv_data = (
+            'nama,code,deskripsi\n'
+            'Selat Malaka,WPP 571,Baru\n'
+            'Laut Jawa,WPP 712,Tetap\n'
+            'Laut Banda,WPP 714,\n'
+        )
+
+        response = cast(Response, self.client.post(
+            self.import_url, {'csv_data': csv_data, 'dry_run': 'true'}, format='multipart'
+        ))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [response.data[key] for key in ('created', 'updated', 'unchanged', 'errors')],  # type: ignore
+            [1, 1, 1, 0]
+        )
+        self.assertEqual(response.data['diff'], [  # type: ignore
+            {'key': 'WPP 571', 'action': 'updated', 'changes': {'deskripsi': {'old': 'Lama', 'new': 'Baru'}}},
+            {'key': 'WPP 714', 'action': 'created', 'changes': {'nama': {'old': None, 'new': 'Laut Banda'}}},
+        ])
+        self.assertEqual(FishingArea._default_manager.get(code='WPP 571').deskripsi, 'Lama')  # type: ignore
+        self.assertFalse(FishingArea._default_manager.filter(code='WPP 714').exists())  # type: ignore
+
+        report = self.client.post(
+            self.import_url, {'csv_data': csv_data, 'dry_run': 'true', 'diff_format': 'csv'}, format='multipart'
+        )
+        self.assertEqual(report['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(report.content.decode('utf-8').splitlines(), [
+            'key,action,field,old,new',
+            'WPP 571,updated,deskripsi,Lama,Baru',
+            'WPP 714,created,nama,,Laut Banda',
+        ])
+
+    def test_dry_run_with_clear_existing_false_form_value(self):
+        """clear_existing=false sent as a form value does not clash with dry_run"""
+        FishingArea = apps.get_model('regions', 'FishingArea')
+        FishingArea._default_manager.create(nama='Selat Malaka', code='WPP 571')  # type: ignore
+        response = cast(Response, self.client.post(self.import_url, {
+            'csv_data': 'nama,code,deskripsi\nLaut Banda,WPP 714,\n', 'dry_run': 'true', 'clear_existing': 'false',
+        }, format='multipart'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 1)  # type: ignore
+        self.assertEqual(FishingArea._default_manager.count(), 1)  # type: ignore
@@ -1,17 +1,15 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.core.exceptions import ValidationError
-from django.apps import apps
 from io import StringIO, BytesIO
 import csv
 from .models import FishingArea
 from .serializers import FishingAreaSerializer
+from .importers import import_areas
+from fco_project.importing import diff_csv_response, get_flag, get_import_source, iter_rows
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from django.http import HttpResponse
-import pandas as pd
 import xlsxwriter
-import numpy as np
 from typing import List, Any
 
 @extend_schema_view(
@@ -90,6 +88,17 @@ from typing import List, Any
                         'type': 'boolean',
                         'description': 'Jika true, hapus semua area penangkapan yang ada sebelum mengimpor',
                         'default': False
+                    },
+                    'dry_run': {
+                        'type': 'boolean',
+                        'description': 'Jika true, tidak ada data yang disimpan; respons berisi jumlah data yang akan dibuat/diperbarui/tidak berubah beserta perbedaan per kolom',
+                        'default': False
+                    },
+                    'diff_format': {
+                        'type': 'string',
+                        'enum': ['json', 'csv'],
+                        'description': 'Format perbedaan pada dry run: json (dalam respons) atau csv (file unduhan)',
+                        'default': 'json'
                     }
                 }
             }
@@ -101,10 +110,23 @@ from typing import List, Any
                     'message': {'type': 'string'},
                     'created': {'type': 'integer'},
                     'updated': {'type': 'integer'},
+                    'unchanged': {'type': 'integer'},
                     'errors': {'type': 'integer'},
                     'error_details': {
                         'type': 'array',
                         'items': {'type': 'string'}
+                    },
+                    'diff': {
+                        'type': 'array',
+                        'description': 'Hanya pada dry run: satu entri per data yang akan dibuat atau diperbarui',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'key': {'type': 'string'},
+                                'action': {'type': 'string', 'enum': ['created', 'updated']},
+                                'changes': {'type': 'object'}
+                            }
+                        }
                     }
                 }
             }
@@ -125,153 +147,38 @@ class FishingAreaViewSet(viewsets.ModelViewSet):
         """
         Import fishing areas from CSV/Excel data provided in the request
         """
-        csv_data = request.data.get('csv_data')
-        csv_file_upload = request.FILES.get('csv_file')
-        clear_existing = request.data.get('clear_existing', False)
-
-        print(f"Starting fishing area CSV/Excel import...")
-        print(f"Request data keys: {list(request.data.keys())}")
-        print(f"Request FILES keys: {list(request.FILES.keys())}")
+        upload, csv_data = get_import_source(request)
+        clear_existing = get_flag(request, 'clear_existing')
+        dry_run = get_flag(request, 'dry_run')
 
-        # Handle the case where csv_data is sent as a file (InMemoryUploadedFile)
-        if hasattr(csv_data, 'read'):  # Check if csv_data is a file-like object
-            print("Detected csv_data as file-like object, switching to file processing mode")
-            csv_file_upload = csv_data
-            csv_data = None
-
-        if not csv_data and not csv_file_upload:
+        if upload is None and not csv_data:
             return Response(
                 {'error': 'csv_data (string) or csv_file (upload) is required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Get the FishingArea model dynamically
-        FishingArea = apps.get_model('regions', 'FishingArea')
-        
-        # Clear existing data if requested
-        if clear_existing:
-            FishingArea._default_manager.all().delete()  # type: ignore
-        
+
         # Process CSV/Excel data
         try:
-            if csv_file_upload:
-                # Handle file upload
-                print(f"✓ Processing as file upload: {getattr(csv_file_upload, 'name', 'unnamed')}, size: {getattr(csv_file_upload, 'size', 'unknown')}")
-                
-                # Check file extension to determine processing method
-                file_name = getattr(csv_file_upload, 'name', '')
-                if file_name.endswith('.xlsx') or file_name.endswith('.xls'):
-                    # Process Excel file
-                    print("Processing as Excel file")
-                    df = pd.read_excel(csv_file_upload)
-                    reader = df.to_dict('records')
-                else:
-                    # Process CSV file
-                    print("Processing as CSV file")
-                    file_content = csv_file_upload.read().decode('utf-8')
-                    print(f"File content length: {len(file_content)}")
-                    print(f"File content preview: {file_content[:100]}...")
-                    csv_file = StringIO(file_content)
-                    reader = csv.DictReader(csv_file)
-            else:
-                # Handle string data (CSV only)
-                print(f"✓ Processing as string data, length: {len(csv_data) if csv_data else 0}")
-                print(f"String content preview: {csv_data[:100] if csv_data else 'None'}...")
-                csv_file = StringIO(csv_data)
-                reader = csv.DictReader(csv_file)
-
-            print(f"Headers detected: {getattr(reader, 'fieldnames', 'Excel data')}")
-
-            created_count = 0
-            updated_count = 0
-            error_count = 0
-            error_details = []
-            
-            # Handle both CSV DictReader and Excel dict records
-            rows = reader if isinstance(reader, list) else list(reader)
-            
-            # Initialize row_num to avoid unbound variable error
-            row_num = 0
-            
-            for row_num, row in enumerate(rows, start=1):
-                print(f"Processing row {row_num}: {row}")
-                try:
-                    # Extract data from CSV/Excel row
-                    nama = row.get('nama', '').strip()
-                    code = row.get('code', '').strip()
-                    deskripsi = row.get('deskripsi', '').strip() or None
-                    print(f"  Extracted data: nama='{nama}', code='{code}', deskripsi='{deskripsi}'")
-
-                    # Validate required fields
-                    if not nama:
-                        print(f"  ✗ Row {row_num}: Missing nama")
-                        error_details.append(f'Row {row_num}: Missing nama')
-                        error_count += 1
-                        continue
-
-                    if not code:
-                        print(f"  ✗ Row {row_num}: Missing code")
-                        error_details.append(f'Row {row_num}: Missing code')
-                        error_count += 1
-                        continue
-                    
-                    # Create or update the fishing area
-                    fishing_area, created = FishingArea._default_manager.get_or_create(  # type: ignore
-                        code=code,
-                        defaults={
-                            'nama': nama,
-                            'deskripsi': deskripsi,
-                    
-                        }
-                    )
-                    
-                    if created:
-                        created_count += 1
-                        print(f"  ✓ Created new fishing area: {fishing_area.nama} ({fishing_area.code})")
-                    else:
-                        # Update existing record if there's new data
-                        updated = False
-                        if fishing_area.nama != nama:
-                            fishing_area.nama = nama
-                            updated = True
-                        if fishing_area.deskripsi != deskripsi:
-                            fishing_area.deskripsi = deskripsi
-                            updated = True
-
-                        if updated:
-                            fishing_area.save()
-                            updated_count += 1
-                            print(f"  ✓ Updated existing fishing area: {fishing_area.nama} ({fishing_area.code})")
-                        else:
-                            print(f"  - No changes needed for fishing area: {fishing_area.nama} ({fishing_area.code})")
-            
-                except ValidationError as e:
-                    print(f"  ✗ Row {row_num}: Validation error - {str(e)}")
-                    error_details.append(f'Row {row_num}: Validation error - {str(e)}')
-                    error_count += 1
-                except Exception as e:
-                    print(f"  ✗ Row {row_num}: Unexpected error - {str(e)}")
-                    error_details.append(f'Row {row_num}: Unexpected error - {str(e)}')
-                    error_count += 1
-
-            print(f"\nImport Summary:")
-            print(f"  Total rows processed: {row_num}")
-            print(f"  Created: {created_count}")
-            print(f"  Updated: {updated_count}")
-            print(f"  Errors: {error_count}")
-            if error_details:
-                print(f"  Error details: {error_details}")
-
-            return Response({
-                'message': 'Import completed',
-                'created': created_count,
-                'updated': updated_count,
-                'errors': error_count,
+            # Rows are streamed from the upload and written in batches
+            result = import_areas(iter_rows(upload, csv_data), clear_existing=clear_existing, dry_run=dry_run)
+            error_details = result['error_details']
+
+            if dry_run and request.data.get('diff_format') == 'csv':
+                return diff_csv_response(result['diff'], 'fishing_areas_import_diff.csv')
+
+            response_data = {
+                'message': 'Dry run completed, no data was saved' if dry_run else 'Import completed',
+                'created': result['created'],
+                'updated': result['updated'],
+                'unchanged': result['unchanged'],
+                'errors': result['errors'],
                 'error_details': error_details if error_details else None
-            })
+            }
+            if dry_run:
+                response_data['diff'] = result['diff']
+            return Response(response_data)
 
         except Exception as e:
-            print(f"DEBUG: Exception in CSV/Excel processing: {str(e)}")
             return Response(
                 {'error': f'Error processing CSV/Excel data: {str(e)}'},
                 status=status.HTTP_400_BAD_REQUEST
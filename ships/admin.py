@@ -1,9 +1,15 @@
 from django.contrib import admin
-from .models import Ship
+from .models import Ship, QuotaPredictionJob
 
 @admin.register(Ship)
 class ShipAdmin(admin.ModelAdmin):
     list_display = ('name', 'registration_number', 'owner', 'captain', 'active', 'year_built')
     list_filter = ('active', 'year_built', 'owner', 'captain')
     search_fields = ('name', 'registration_number')
-    ordering = ('name',)
\ No newline at end of file
+    ordering = ('name',)
+
+@admin.register(QuotaPredictionJob)
+class QuotaPredictionJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'total_ships', 'processed_ships', 'requested_by', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    readonly_fields = ('result', 'error', 'created_at', 'started_at', 'finished_at')
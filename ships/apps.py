@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class ShipsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ships'
-    verbose_name = 'Manajemen Kapal'
\ No newline at end of file
+    verbose_name = 'Manajemen Kapal'
+
+    def ready(self):
+        import ships.signals
\ No newline at end of file
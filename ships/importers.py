@@ -0,0 +1,211 @@
+"""
+Bulk import of ships from CSV rows.
+
+Rows are processed in chunks: the owners and captains a chunk refers to are
+loaded with one IN query each, missing owners are created with bulk_create and
+new or changed ships are upserted with ``upsert_rows`` inside a transaction. Rows behave as if
+they were applied one after another, so the created/updated/error counts match
+the row-by-row import (a registration number repeated later in the file
+updates the ship created by its first row).
+"""
+
+import logging
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from fco_project.importing import DEFAULT_BATCH_SIZE, batched, run_field_validators, upsert_rows
+from fco_project.log import log_row, row_logging_enabled
+from owners.models import Owner, Captain
+from .lookup import invalidate
+from .models import Ship
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OWNER_NAME = 'Default Owner'
+
+DECIMAL_COLUMNS = ('length', 'width', 'gross_tonnage')
+
+
+def _column(row, english, indonesian, default=''):
+    """Read a column by its English or Indonesian header"""
+    value = row.get(english)
+    if value is None:
+        value = row.get(indonesian)
+    return (value if value is not None else default).strip()
+
+
+def parse_row(row_num, row):
+    """
+    Extract and convert the fields of one CSV row without touching the database.
+    Returns (parsed, error); ``parsed['deferred_error']`` holds a conversion error
+    that is only reported once owner and captain have been resolved, mirroring the
+    order of checks of the row-by-row import.
+    """
+    name = _column(row, 'name', 'nama_kapal')
+    registration_number = _column(row, 'registration_number', 'no_buku_kapal')
+    if not name:
+        return None, f'Row {row_num}: Missing name/nama_kapal'
+    if not registration_number:
+        return None, f'Row {row_num}: Missing registration_number/no_buku_kapal'
+
+    active = _column(row, 'active', 'aktif', 'true').lower()
+    parsed = {
+        'row_num': row_num,
+        'registration_number': registration_number,
+        'owner_name': _column(row, 'owner_name', 'nama_pemilik') or DEFAULT_OWNER_NAME,
+        'captain_name': _column(row, 'captain_name', 'nama_nahkoda') or None,
+        'deferred_error': None,
+        'values': {
+            'name': name,
+            'home_port': _column(row, 'home_port', 'pelabuhan_asal') or None,
+            # Default to True if not provided
+            'active': active in ['true', '1', 'yes', 'y'] if active else True,
+        },
+    }
+
+    try:
+        run_field_validators(Ship, {
+            'name': name,
+            'registration_number': registration_number,
+            'home_port': parsed['values']['home_port'],
+        })
+
+        for column, indonesian in zip(DECIMAL_COLUMNS, ('panjang', 'lebar', 'tonase_kotor')):
+            raw = _column(row, column, indonesian)
+            value = None
+            if raw:
+                field = Ship._meta.get_field(column)
+                try:
+                    value = field.to_python(raw)  # type: ignore
+                except ValidationError:
+                    parsed['deferred_error'] = f'Row {row_num}: Invalid {column} value "{raw}"'
+                    return parsed, None
+                field.run_validators(value)  # type: ignore
+            parsed['values'][column] = value
+
+        year_built = _column(row, 'year_built', 'tahun_dibuat')
+        try:
+            parsed['values']['year_built'] = int(year_built) if year_built else None
+        except ValueError:
+            parsed['deferred_error'] = f'Row {row_num}: Invalid year_built value "{year_built}"'
+    except ValidationError as e:
+        parsed['deferred_error'] = f'Row {row_num}: Validation error - {str(e)}'
+    return parsed, None
+
+
+def _ids_by_name(model, names):
+    """Map full_name -> list of ids for the given names with one IN query"""
+    ids = {}
+    if names:
+        rows = model._default_manager.filter(full_name__in=names).order_by('pk').values_list('full_name', 'pk')
+        for full_name, pk in rows:
+            ids.setdefault(full_name, []).append(pk)
+    return ids
+
+
+def _resolve_owners(names, dry_run=False):
+    """
+    Return {full_name: owner_id}, creating missing owners with one bulk insert.
+    In a dry run missing owners are not created and map to their name instead.
+    """
+    owners = {full_name: pks[0] for full_name, pks in _ids_by_name(Owner, names).items()}
+    missing = [full_name for full_name in names if full_name not in owners]
+    if missing and dry_run:
+        owners.update({full_name: full_name for full_name in missing})
+    elif missing:
+        Owner._default_manager.bulk_create([  # type: ignore
+            Owner(full_name=full_name, owner_type='individual') for full_name in missing
+        ])
+        # Not every backend returns primary keys from bulk inserts
+        owners.update({full_name: pks[0] for full_name, pks in _ids_by_name(Owner, missing).items()})
+    return owners
+
+
+def import_batch(batch, result, dry_run=False, applied=None):
+    """
+    Import one batch of ``(row_num, row)`` pairs, adding its counts and errors
+    (in row order) to ``result``. With ``dry_run`` nothing is written and the
+    per-field changes are collected in ``result['diff']`` when present;
+    ``applied`` carries the simulated writes from batch to batch (see
+    ``upsert_rows``).
+    """
+    log_rows = row_logging_enabled(logger)
+    errors = []
+    parsed_rows = []
+    for row_num, row in batch:
+        parsed, error = parse_row(row_num, row)
+        if log_rows:
+            log_row(logger, 'Import row', row=row_num, error=error)
+        if error:
+            errors.append((row_num, error))
+        else:
+            parsed_rows.append(parsed)
+    if parsed_rows:
+        _write_chunk(parsed_rows, errors, result, dry_run, applied)
+    result['error_details'].extend(error for _, error in sorted(errors, key=lambda item: item[0]))
+    logger.debug('Imported ship batch', extra={
+        'first_row': batch[0][0], 'last_row': batch[-1][0], 'error_count': len(errors)
+    })
+
+
+def _write_chunk(parsed_rows, errors, result, dry_run=False, applied=None):
+    """Resolve owners and captains for parsed rows and upsert the new or changed ships"""
+    with transaction.atomic():
+        owners = _resolve_owners(list(dict.fromkeys(parsed['owner_name'] for parsed in parsed_rows)), dry_run)
+        captains = _ids_by_name(Captain, {parsed['captain_name'] for parsed in parsed_rows if parsed['captain_name']})
+        rows = []
+        for parsed in parsed_rows:
+            row_num = parsed['row_num']
+            captain_name = parsed['captain_name']
+            captain_id = None
+            if captain_name:
+                captain_ids = captains.get(captain_name, [])
+                if not captain_ids:
+                    errors.append((row_num, f'Row {row_num}: Captain "{captain_name}" not found'))
+                    continue
+                if len(captain_ids) > 1:
+                    errors.append((row_num, f'Row {row_num}: Captain "{captain_name}" matches more than one captain'))
+                    continue
+                captain_id = captain_ids[0]
+            if parsed['deferred_error']:
+                errors.append((row_num, parsed['deferred_error']))
+                continue
+
+            values = dict(parsed['values'], owner_id=owners[parsed['owner_name']], captain_id=captain_id)
+            rows.append((parsed['registration_number'], values))
+
+        changed = upsert_rows(Ship, 'registration_number', rows, result, dry_run, result.get('diff'), applied)
+
+    # bulk_create does not send signals, so keep the registration lookup cache in sync here
+    if changed and not dry_run:
+        invalidate(*changed)
+
+
+def import_ships(reader, clear_existing=False, chunk_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Import ships from an iterable of row dicts (see ``fco_project.importing.iter_rows``).
+
+    Returns a dict with the created/updated/unchanged/error counts, the error
+    messages (ordered by row) and the number of rows read. A ``dry_run`` writes
+    nothing and adds the per-field changes as ``diff``.
+    """
+    if clear_existing and dry_run:
+        raise ValueError('clear_existing cannot be combined with dry_run')
+    if clear_existing:
+        Ship._default_manager.all().delete()  # type: ignore
+
+    result = {'created': 0, 'updated': 0, 'unchanged': 0, 'error_details': [], 'rows': 0}
+    applied = None
+    if dry_run:
+        result['diff'] = []
+        applied = {}
+    for batch in batched(enumerate(reader, start=1), chunk_size):
+        import_batch(batch, result, dry_run, applied)
+        result['rows'] = batch[-1][0]
+
+    result['errors'] = len(result['error_details'])
+    logger.info('Ship import finished', extra={
+        'rows': result['rows'], 'created_count': result['created'],
+        'updated_count': result['updated'], 'unchanged_count': result['unchanged'],
+        'error_count': result['errors'], 'dry_run': dry_run
+    })
+    return result
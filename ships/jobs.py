@@ -0,0 +1,208 @@
+"""
+Asynchronous quota prediction jobs.
+A job is stored in the database, executed by the local background worker pool
+and polled by the client until it is finished. Jobs left pending or running by
+a restart are picked up again with the ``resume_quota_prediction_jobs``
+management command; a job only reads catch data, so it is simply run again.
+A worker claims a job through ``JobLease`` and refreshes its ``updated_at``
+while it runs, so a live job is never run twice at the same time.
+"""
+
+import logging
+import threading
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from fco_project import workers
+from .models import Ship, QuotaPredictionJob
+from .serializers_quota import QuotaPredictionResponseSerializer
+from .ml_models import (
+    predict_and_optimize_quota,
+    generate_quota_recommendation
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEARTBEAT_SECONDS = 60
+
+
+def build_quota_prediction(ship, prediction_months=12):
+    """
+    Run LSTM -> NSGA-III for one ship and build the prediction response.
+    Returns a tuple (serializer, error_message); the serializer has already been
+    validated, so callers only need to check serializer.errors.
+    """
+    optimized_results = predict_and_optimize_quota(ship.registration_number, prediction_months)
+
+    if isinstance(optimized_results, dict) and "error" in optimized_results:
+        return None, optimized_results["error"]
+
+    recommendation = generate_quota_recommendation(optimized_results)
+
+    lstm_predictions = []
+    nsga3_predictions = []
+    for result in optimized_results:
+        lstm_predictions.append({
+            "date": result["date"],  # type: ignore
+            "predicted_quota": result["lstm_predicted_quota"],  # type: ignore
+            "confidence_interval": result["confidence_interval"]  # type: ignore
+        })
+        nsga3_predictions.append({
+            "date": result["date"],  # type: ignore
+            "predicted_quota": result["optimized_quota"],  # type: ignore
+            "fitness_score": result["fitness_score"]  # type: ignore
+        })
+
+    response_serializer = QuotaPredictionResponseSerializer(data={
+        'ship_registration_number': ship.registration_number,
+        'ship_name': ship.name,
+        'prediction_period': f"{prediction_months} bulan ke depan",
+        'lstm_predictions': lstm_predictions,
+        'nsga3_predictions': nsga3_predictions,
+        'recommendation': recommendation
+    })
+    response_serializer.is_valid()
+    return response_serializer, None
+
+
+class JobLease:
+    """
+    A worker's claim on a job. Every write is conditional on the ``updated_at``
+    the worker last wrote, so once another worker (e.g. the resume command)
+    claims the job, this worker's writes match no row and it stops.
+    """
+
+    def __init__(self, job):
+        self.job_id = job.pk
+        self.updated_at = job.updated_at
+        self.lost = False
+        self._lock = threading.Lock()
+
+    def write(self, **fields):
+        """Update the job if this worker still owns it; returns False once the claim is lost"""
+        with self._lock:
+            if self.lost:
+                return False
+            now = timezone.now()
+            written = QuotaPredictionJob.objects.filter(pk=self.job_id, updated_at=self.updated_at).update(
+                updated_at=now, **fields
+            )
+            if written:
+                self.updated_at = now
+            else:
+                self.lost = True
+            return bool(written)
+
+
+def get_heartbeat_interval():
+    """Seconds between updated_at refreshes of a running job (QUOTA_JOB_HEARTBEAT_SECONDS)"""
+    return float(getattr(settings, 'QUOTA_JOB_HEARTBEAT_SECONDS', DEFAULT_HEARTBEAT_SECONDS))
+
+
+def _heartbeat(lease, stop, interval):
+    """Refresh the job's updated_at until stopped, so a long ship is not taken for a dead worker"""
+    try:
+        while not stop.wait(interval):
+            if not lease.write():
+                return
+    finally:
+        connection.close()
+
+
+def run_quota_prediction_job(job_id):
+    """Execute a quota prediction job, saving progress after every ship"""
+    job = QuotaPredictionJob.objects.get(pk=job_id)
+    if job.is_finished:
+        return job
+
+    # Claim the job; fails if another worker wrote to it since it was read
+    lease = JobLease(job)
+    started_at = timezone.now()
+    if not lease.write(
+        status=QuotaPredictionJob.STATUS_RUNNING,
+        started_at=started_at,
+        processed_ships=0,
+        total_ships=len(job.ship_registration_numbers)
+    ):
+        logger.info('Quota prediction job claimed by another worker', extra={'job_id': job.pk})
+        job.refresh_from_db()
+        return job
+
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat, args=(lease, stop, get_heartbeat_interval()),
+        name=f'quota-job-{job.pk}-heartbeat', daemon=True
+    )
+    heartbeat.start()
+
+    ship_results = []
+    succeeded = 0
+    processed = 0
+    fields = {}
+
+    try:
+        ships = Ship.objects.in_bulk(job.ship_registration_numbers, field_name='registration_number')
+        for registration_number in job.ship_registration_numbers:
+            ship = ships.get(registration_number)
+            if ship is None:
+                ship_results.append({
+                    'ship_registration_number': registration_number,
+                    'status': 'error',
+                    'error': f'Kapal dengan nomor registrasi {registration_number} tidak ditemukan'
+                })
+            else:
+                prediction, error = build_quota_prediction(ship, job.prediction_months)
+                if prediction is not None and prediction.errors:
+                    error = str(prediction.errors)
+                if error:
+                    ship_results.append({
+                        'ship_registration_number': registration_number,
+                        'status': 'error',
+                        'error': error
+                    })
+                else:
+                    succeeded += 1
+                    ship_results.append({
+                        'ship_registration_number': registration_number,
+                        'status': 'ok',
+                        'prediction': prediction.data  # type: ignore
+                    })
+
+            processed += 1
+            if not lease.write(processed_ships=processed):
+                break
+
+        fields = {
+            'result': {
+                'ships': ship_results,
+                'succeeded': succeeded,
+                'failed': len(ship_results) - succeeded
+            },
+            'status': QuotaPredictionJob.STATUS_COMPLETED,
+        }
+    except Exception as e:
+        logger.exception('Quota prediction job failed', extra={'job_id': job.pk})
+        fields = {'error': str(e), 'status': QuotaPredictionJob.STATUS_FAILED}
+    finally:
+        stop.set()
+        heartbeat.join()
+
+    if not lease.write(finished_at=timezone.now(), **fields):
+        # Another worker took the job over; its run owns the result
+        logger.warning('Quota prediction job taken over by another worker', extra={'job_id': job.pk})
+    job.refresh_from_db()
+    return job
+
+
+def enqueue_quota_prediction_job(job):
+    """Hand a saved job to the worker pool once the creating transaction commits"""
+    transaction.on_commit(lambda: workers.submit(run_quota_prediction_job, job.pk))
+    return job
+
+
+def stale_quota_prediction_jobs(stale_after):
+    """Unfinished jobs that no worker has touched for ``stale_after`` (a timedelta)"""
+    return QuotaPredictionJob.objects.filter(
+        status__in=[QuotaPredictionJob.STATUS_PENDING, QuotaPredictionJob.STATUS_RUNNING],
+        updated_at__lt=timezone.now() - stale_after
+    ).order_by('created_at')
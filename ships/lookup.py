@@ -0,0 +1,158 @@
+"""
+Ship registration number -> ship id resolution.
+
+Id lookups (``get_ship_id``/``get_ship_ids``) go through two cache tiers before touching the database:
+a process-local LRU (short-lived entries, no network round trip) and the
+shared Django cache. Entries are invalidated from the Ship post_save /
+post_delete signals (see ships/signals.py); code that changes ships without
+signals (bulk_create, queryset.update/delete) must call ``invalidate()``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from .models import Ship
+
+CACHE_PREFIX = 'ships:registration:'
+REVERSE_CACHE_PREFIX = 'ships:id:'
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class _LocalLRU:
+    """Small thread-safe LRU with per-entry expiry"""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        max_size = _setting('SHIP_LOOKUP_LRU_SIZE', 4096)
+        expires_at = time.monotonic() + _setting('SHIP_LOOKUP_LOCAL_TIMEOUT', 60)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_value(self, value):
+        with self._lock:
+            for key in [key for key, (entry_value, _) in self._entries.items() if entry_value == value]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_local = _LocalLRU()
+
+
+def _remember(registration_number, ship_id):
+    _local.set(registration_number, ship_id)
+    timeout = _setting('SHIP_LOOKUP_CACHE_TIMEOUT', 3600)
+    cache.set_many({
+        CACHE_PREFIX + registration_number: ship_id,
+        REVERSE_CACHE_PREFIX + str(ship_id): registration_number,
+    }, timeout)
+
+
+def get_ship_ids(registration_numbers):
+    """
+    Resolve many registration numbers at once.
+    Returns a dict {registration_number: ship_id} for the ships that exist.
+    """
+    resolved = {}
+    missing = []
+    for registration_number in set(registration_numbers):
+        ship_id = _local.get(registration_number)
+        if ship_id is None:
+            missing.append(registration_number)
+        else:
+            resolved[registration_number] = ship_id
+
+    if missing:
+        cached = cache.get_many([CACHE_PREFIX + registration_number for registration_number in missing])
+        still_missing = []
+        for registration_number in missing:
+            ship_id = cached.get(CACHE_PREFIX + registration_number)
+            if ship_id is None:
+                still_missing.append(registration_number)
+            else:
+                _local.set(registration_number, ship_id)
+                resolved[registration_number] = ship_id
+
+        if still_missing:
+            rows = Ship._default_manager.filter(  # type: ignore
+                registration_number__in=still_missing
+            ).values_list('registration_number', 'pk')
+            for registration_number, ship_id in rows:
+                _remember(registration_number, ship_id)
+                resolved[registration_number] = ship_id
+
+    return resolved
+
+
+def get_ship_id(registration_number):
+    """Return the id of the ship with this registration number, or None"""
+    if not registration_number:
+        return None
+    return get_ship_ids([registration_number]).get(registration_number)
+
+
+def get_ship(registration_number, queryset=None):
+    """
+    Return the Ship with this registration number.
+    Raises Ship.DoesNotExist like ``Ship.objects.get()``.
+
+    Loading the instance takes a query either way, so this is a plain lookup on
+    the unique ``registration_number`` index and does not use the id cache.
+    Callers that only need the key should use ``get_ship_id()`` instead.
+    """
+    queryset = queryset if queryset is not None else Ship._default_manager.all()  # type: ignore
+    return queryset.get(registration_number=registration_number)
+
+
+def invalidate(*registration_numbers, ship_id=None):
+    """Forget cached ids for these registration numbers and/or this ship id"""
+    keys = [CACHE_PREFIX + registration_number for registration_number in registration_numbers if registration_number]
+    for registration_number in registration_numbers:
+        if registration_number:
+            _local.delete(registration_number)
+
+    if ship_id is not None:
+        # The id may be cached under a registration number we don't know about
+        _local.delete_value(ship_id)
+        reverse_key = REVERSE_CACHE_PREFIX + str(ship_id)
+        cached_registration_number = cache.get(reverse_key)
+        if cached_registration_number:
+            keys.append(CACHE_PREFIX + cached_registration_number)
+        keys.append(reverse_key)
+
+    if keys:
+        cache.delete_many(keys)
+
+
+def clear_local_cache():
+    """Empty the process-local tier (the shared cache is left untouched)"""
+    _local.clear()
@@ -0,0 +1,58 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from ships.jobs import JobLease, run_quota_prediction_job, stale_quota_prediction_jobs
+from ships.models import QuotaPredictionJob
+
+
+class Command(BaseCommand):
+    help = 'Run quota prediction jobs interrupted by a crash or restart again, or mark them as failed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_ids', nargs='*', type=int, help='Jobs to run again (failed jobs are retried); default: all stale unfinished jobs')
+        parser.add_argument('--stale-after', type=int, default=300, help='Seconds without progress before a pending/running job is considered interrupted (default: 300)')
+        parser.add_argument('--fail', action='store_true', help='Mark the jobs as failed instead of running them again')
+
+    def handle(self, *args, **options):
+        stale_before = timezone.now() - timedelta(seconds=options['stale_after'])
+        if options['job_ids']:
+            jobs = list(QuotaPredictionJob.objects.filter(pk__in=options['job_ids']).order_by('created_at'))
+            missing = set(options['job_ids']) - {job.pk for job in jobs}
+            if missing:
+                raise CommandError(f'Quota prediction job(s) not found: {", ".join(map(str, sorted(missing)))}')
+        else:
+            jobs = list(stale_quota_prediction_jobs(timedelta(seconds=options['stale_after'])))
+
+        if not jobs:
+            self.stdout.write('No quota prediction jobs to resume')
+            return
+
+        for job in jobs:
+            if job.status == QuotaPredictionJob.STATUS_COMPLETED:
+                self.stdout.write(f'Job {job.pk} already completed, skipped')
+                continue
+            if job.status == QuotaPredictionJob.STATUS_RUNNING and job.updated_at >= stale_before:
+                # A live worker refreshes updated_at while it runs
+                self.stdout.write(f'Job {job.pk} is still running, skipped')
+                continue
+
+            if options['fail']:
+                if job.status != QuotaPredictionJob.STATUS_FAILED and not JobLease(job).write(
+                    status=QuotaPredictionJob.STATUS_FAILED,
+                    error='Job dihentikan karena server dimulai ulang',
+                    finished_at=timezone.now()
+                ):
+                    self.stdout.write(f'Job {job.pk} was picked up by a worker, skipped')
+                    continue
+                self.stdout.write(self.style.ERROR(f'Job {job.pk} marked as failed'))
+                continue
+
+            if job.status == QuotaPredictionJob.STATUS_FAILED:
+                job.status = QuotaPredictionJob.STATUS_PENDING
+                job.error = None
+                job.finished_at = None
+                job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+            self.stdout.write(f'Running job {job.pk} again ({len(job.ship_registration_numbers)} ships)...')
+            job = run_quota_prediction_job(job.pk)
+            style = self.style.SUCCESS if job.status == QuotaPredictionJob.STATUS_COMPLETED else self.style.ERROR
+            self.stdout.write(style(f'Job {job.pk} {job.status}: {job.processed_ships}/{job.total_ships} ships'))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ships', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuotaPredictionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ship_registration_numbers', models.JSONField(default=list, verbose_name='Nomor Registrasi Kapal')),
+                ('prediction_months', models.IntegerField(default=12, verbose_name='Jumlah Bulan Prediksi')),
+                ('status', models.CharField(choices=[('pending', 'Menunggu'), ('running', 'Berjalan'), ('completed', 'Selesai'), ('failed', 'Gagal')], default='pending', max_length=20, verbose_name='Status')),
+                ('total_ships', models.IntegerField(default=0, verbose_name='Jumlah Kapal')),
+                ('processed_ships', models.IntegerField(default=0, verbose_name='Kapal Diproses')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='Hasil')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='Kesalahan')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='quota_prediction_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Diminta Oleh')),
+            ],
+            options={
+                'verbose_name': 'Job Prediksi Kuota',
+                'verbose_name_plural': 'Job Prediksi Kuota',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
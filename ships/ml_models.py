@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from django.apps import apps
 from django.db.models import Sum, F
 from django.db.models.functions import TruncMonth
+from .lookup import get_ship_id
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -188,16 +189,18 @@ class NSGA3QuotaOptimizer:
 
 def get_historical_catch_data(ship_registration_number, months_back=24):
     """
-    Retrieve historical catch data for a specific ship
+    Retrieve historical catch data for a specific ship.
+    Returns (monthly totals, ship id), or ([], None) for an unknown ship.
     """
     try:
         # Get models dynamically
-        Ship = apps.get_model('ships', 'Ship')
         FishCatch = apps.get_model('catches', 'FishCatch')
         CatchDetail = apps.get_model('catches', 'CatchDetail')
         
-        # Get ship by registration number
-        ship = Ship._default_manager.get(registration_number=ship_registration_number)
+        # Only the ship id is needed to filter the catch reports
+        ship_id = get_ship_id(ship_registration_number)
+        if ship_id is None:
+            return [], None
         
         # Calculate date range
         end_date = datetime.now().date()
@@ -205,7 +208,7 @@ def get_historical_catch_data(ship_registration_number, months_back=24):
         
         # Get catch reports for this ship
         catch_reports = FishCatch.objects.filter(
-            ship=ship,
+            ship_id=ship_id,
             catch_date__gte=start_date,
             catch_date__lte=end_date
         ).order_by('catch_date')
@@ -223,7 +226,7 @@ def get_historical_catch_data(ship_registration_number, months_back=24):
             if item['total_catch'] is not None:
                 catch_data.append(float(item['total_catch']))
                 
-        return catch_data, ship
+        return catch_data, ship_id
     except Exception as e:
         return [], None
 
@@ -236,7 +239,7 @@ def predict_and_optimize_quota(ship_registration_number, prediction_months=12):
     2. NSGA-III optimizes the LSTM results
     """
     # Get historical data
-    historical_data, ship = get_historical_catch_data(ship_registration_number, months_back=24)
+    historical_data, ship_id = get_historical_catch_data(ship_registration_number, months_back=24)
     
     if not historical_data:
         return {"error": "No historical data found for this ship"}
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 from owners.models import Owner, Captain
 
@@ -40,4 +41,49 @@ class Quota(models.Model):
     class Meta:
         verbose_name = "Kuota"
         verbose_name_plural = "Kuota"
-        unique_together = ['ship', 'year']  # Ensure one quota per ship per year
\ No newline at end of file
+        unique_together = ['ship', 'year']  # Ensure one quota per ship per year
+
+class QuotaPredictionJob(models.Model):
+    """Model representing an asynchronous quota prediction job (single ship or fleet)"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Menunggu'),
+        (STATUS_RUNNING, 'Berjalan'),
+        (STATUS_COMPLETED, 'Selesai'),
+        (STATUS_FAILED, 'Gagal'),
+    ]
+
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='quota_prediction_jobs', verbose_name="Diminta Oleh")
+    ship_registration_numbers = models.JSONField(default=list, verbose_name="Nomor Registrasi Kapal")
+    prediction_months = models.IntegerField(default=12, verbose_name="Jumlah Bulan Prediksi")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Status")
+    total_ships = models.IntegerField(default=0, verbose_name="Jumlah Kapal")  # type: ignore
+    processed_ships = models.IntegerField(default=0, verbose_name="Kapal Diproses")  # type: ignore
+    result = models.JSONField(blank=True, null=True, verbose_name="Hasil")
+    error = models.TextField(blank=True, null=True, verbose_name="Kesalahan")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def progress(self):
+        """Progress as a percentage of processed ships"""
+        if not self.total_ships:
+            return 100 if self.status == self.STATUS_COMPLETED else 0
+        return round(self.processed_ships * 100 / self.total_ships)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED)
+
+    def __str__(self):
+        return f"Quota job {self.pk} ({self.status}) - {self.total_ships} kapal"
+
+    class Meta:
+        verbose_name = "Job Prediksi Kuota"
+        verbose_name_plural = "Job Prediksi Kuota"
+        ordering = ['-created_at']
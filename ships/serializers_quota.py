@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from .models import QuotaPredictionJob
 
 
 class QuotaPredictionInputSerializer(serializers.Serializer):
@@ -66,8 +67,8 @@ class ManualQuotaInputSerializer(serializers.Serializer):
 
     def validate_ship_registration_number(self, value):
         """Validate that the ship exists"""
-        from ships.models import Ship
-        if not Ship.objects.filter(registration_number=value).exists():
+        from ships.lookup import get_ship_id
+        if get_ship_id(value) is None:
             raise serializers.ValidationError(f"Kapal dengan nomor registrasi {value} tidak ditemukan")
         return value
 
@@ -95,4 +96,52 @@ class ManualQuotaResponseSerializer(serializers.Serializer):
     )
     message = serializers.CharField(
         help_text="Pesan konfirmasi pendaftaran kuota"
-    )
\ No newline at end of file
+    )
+
+class QuotaPredictionJobInputSerializer(serializers.Serializer):
+    """Serializer for submitting an asynchronous quota prediction job"""
+    ship_registration_number = serializers.CharField(
+        required=False,
+        help_text="Nomor registrasi satu kapal untuk prediksi kuota"
+    )
+    ship_registration_numbers = serializers.ListField(
+        child=serializers.CharField(),
+        required=False,
+        allow_empty=False,
+        help_text="Daftar nomor registrasi kapal untuk prediksi kuota armada"
+    )
+    fleet = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Jika true, prediksi kuota untuk semua kapal aktif"
+    )
+    prediction_months = serializers.IntegerField(
+        required=False,
+        default=12,
+        min_value=1,
+        help_text="Jumlah bulan untuk prediksi (default: 12)"
+    )
+
+    def validate(self, attrs):
+        """Exactly one of ship_registration_number, ship_registration_numbers or fleet must be given"""
+        modes = [
+            bool(attrs.get('ship_registration_number')),
+            bool(attrs.get('ship_registration_numbers')),
+            bool(attrs.get('fleet')),
+        ]
+        if sum(modes) != 1:
+            raise serializers.ValidationError(
+                "Isi salah satu dari ship_registration_number, ship_registration_numbers, atau fleet"
+            )
+        return attrs
+
+
+class QuotaPredictionJobSerializer(serializers.ModelSerializer):
+    """Serializer for the status of an asynchronous quota prediction job"""
+    progress = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = QuotaPredictionJob
+        fields = ['id', 'status', 'progress', 'total_ships', 'processed_ships', 'prediction_months',
+                  'ship_registration_numbers', 'error', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
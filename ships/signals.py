@@ -0,0 +1,20 @@
+"""
+Signals keeping the ship registration lookup cache in sync with the Ship table
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Ship
+from .lookup import invalidate
+
+
+@receiver(post_save, sender=Ship)
+def invalidate_ship_lookup_on_save(sender, instance, **kwargs):
+    """Drop cached lookups for a saved ship (the id also clears a renamed ship's old number)"""
+    invalidate(instance.registration_number, ship_id=instance.pk)
+
+
+@receiver(post_delete, sender=Ship)
+def invalidate_ship_lookup_on_delete(sender, instance, **kwargs):
+    """Drop cached lookups for a deleted ship"""
+    invalidate(instance.registration_number, ship_id=instance.pk)
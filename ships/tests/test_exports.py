@@ -0,0 +1,70 @@
+from datetime import date
+from io import BytesIO
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from openpyxl import load_workbook
+from rest_framework import status
+from rest_framework.test import APIClient
+from owners.models import Owner
+from regions.models import FishingArea
+from catches.models import FishCatch
+from ships.models import Ship, Quota
+
+
+class ExportTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        User = get_user_model()
+        self.client.force_authenticate(user=User.objects.create_user(username='testuser', password='testpass123'))
+
+        owner = Owner.objects.create(full_name='Pemilik Satu', owner_type='individual')
+        self.ship = Ship.objects.create(name='Kapal Satu', registration_number='REG001', owner=owner, length='12.50')
+        Ship.objects.create(name='Kapal Dua', registration_number='REG002', owner=owner, active=False)
+
+    def test_ship_csv_export_uses_import_headers(self):
+        response = self.client.get(reverse('ship-export'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)  # type: ignore
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="ships.csv"')
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()  # type: ignore
+        self.assertEqual(lines, [
+            'name,registration_number,owner_name,captain_name,length,width,gross_tonnage,year_built,home_port,active',
+            'Kapal Satu,REG001,Pemilik Satu,,12.50,,,,,True',
+            'Kapal Dua,REG002,Pemilik Satu,,,,,,,False',
+        ])
+
+    def test_catch_xlsx_export_applies_filters(self):
+        area = FishingArea.objects.create(nama='Laut Jawa', code='WPP 712')
+        for day, fishing_area in ((1, area), (20, None)):
+            FishCatch.objects.create(
+                ship=self.ship, catch_date=date(2024, 3, day), catch_type='pelagic',
+                location_latitude='-6.100000', location_longitude='106.800000', fishing_area=fishing_area
+            )
+
+        response = self.client.get(reverse('fishcatch-export'), {'file_format': 'xlsx', 'end_date': '2024-03-10'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="fish_catches.xlsx"')
+        workbook = load_workbook(BytesIO(b''.join(response.streaming_content)), read_only=True)  # type: ignore
+        rows = list(workbook.active.iter_rows(values_only=True))  # type: ignore
+        self.assertEqual(rows[0][:5], ('id', 'ship_registration_number', 'ship_name', 'catch_date', 'catch_type'))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][1], 'REG001')
+        self.assertEqual(rows[1][3].date(), date(2024, 3, 1))  # type: ignore
+        self.assertEqual(rows[1][7], 'WPP 712')
+
+    def test_quota_export_filters_by_year_and_rejects_unknown_format(self):
+        Quota.objects.create(ship=self.ship, year=2024, quota='1000.00', remaining_quota='250.00')
+        Quota.objects.create(ship=self.ship, year=2025, quota='1200.00', remaining_quota='1200.00')
+
+        response = self.client.get(reverse('export_quotas'), {'year': 2025})
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()  # type: ignore
+        self.assertEqual(lines, [
+            'ship_registration_number,ship_name,year,quota,remaining_quota,is_active',
+            'REG001,Kapal Satu,2025,1200.00,1200.00,True',
+        ])
+
+        response = self.client.get(reverse('export_quotas'), {'file_format': 'pdf'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,175 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from typing import cast
+from rest_framework.response import Response
+from owners.models import Owner
+from fish.models import FishSpecies
+from catches.models import FishCatch, CatchDetail
+from ships.models import Ship, QuotaPredictionJob
+from ships.jobs import run_quota_prediction_job
+
+
+@override_settings(BACKGROUND_JOB_WORKERS=0)
+class QuotaPredictionJobTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.submit_url = reverse('submit_quota_prediction_job')
+
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+        owner = Owner.objects.create(full_name='Test Owner', owner_type='individual')
+        self.ship = Ship.objects.create(name='Kapal Satu', registration_number='KS001', owner=owner)
+        self.empty_ship = Ship.objects.create(name='Kapal Dua', registration_number='KS002', owner=owner)
+
+        species = FishSpecies.objects.create(name='Tuna')
+        today = date.today()
+        for months_ago in range(1, 4):
+            catch = FishCatch.objects.create(
+                ship=self.ship,
+                catch_date=today - timedelta(days=31 * months_ago),
+                catch_type='pelagic',
+                location_latitude='1.000000',
+                location_longitude='2.000000'
+            )
+            CatchDetail.objects.create(fish_catch=catch, fish_species=species, quantity=100 * months_ago)
+
+    def submit(self, payload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return cast(Response, self.client.post(self.submit_url, payload, format='json'))
+
+    def test_submit_single_ship_job(self):
+        """A single-ship job is accepted and completes with a prediction"""
+        response = self.submit({'ship_registration_number': 'KS001', 'prediction_months': 3})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = QuotaPredictionJob.objects.get(pk=response.data['id'])  # type: ignore
+        self.assertEqual(job.status, QuotaPredictionJob.STATUS_COMPLETED)
+        self.assertEqual(job.progress, 100)
+
+        result = cast(Response, self.client.get(reverse('quota_prediction_job_result', args=[job.pk])))
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result.data['succeeded'], 1)  # type: ignore
+        prediction = result.data['ships'][0]['prediction']  # type: ignore
+        self.assertEqual(len(prediction['nsga3_predictions']), 3)
+
+    def test_submit_fleet_job_reports_per_ship_errors(self):
+        """A fleet job covers every active ship and records ships without data as errors"""
+        response = self.submit({'fleet': True})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['total_ships'], 2)  # type: ignore
+
+        result = cast(Response, self.client.get(reverse('quota_prediction_job_result', args=[response.data['id']])))  # type: ignore
+        self.assertEqual(result.data['succeeded'], 1)  # type: ignore
+        self.assertEqual(result.data['failed'], 1)  # type: ignore
+
+    def test_submit_unknown_ship(self):
+        """Unknown registration numbers are rejected before a job is created"""
+        response = self.submit({'ship_registration_numbers': ['KS001', 'UNKNOWN']})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(QuotaPredictionJob.objects.exists())
+
+    def test_result_not_ready(self):
+        """Fetching the result of a pending job returns 409"""
+        job = QuotaPredictionJob.objects.create(
+            requested_by=self.user,
+            ship_registration_numbers=['KS001'],
+            total_ships=1
+        )
+
+        status_response = cast(Response, self.client.get(reverse('quota_prediction_job_status', args=[job.pk])))
+        self.assertEqual(status_response.data['status'], QuotaPredictionJob.STATUS_PENDING)  # type: ignore
+
+        result = cast(Response, self.client.get(reverse('quota_prediction_job_result', args=[job.pk])))
+        self.assertEqual(result.status_code, status.HTTP_409_CONFLICT)
+
+    def create_interrupted_job(self, minutes_ago=10):
+        """A job left running by a worker that stopped ``minutes_ago`` minutes ago"""
+        job = QuotaPredictionJob.objects.create(
+            requested_by=self.user,
+            ship_registration_numbers=['KS001'],
+            prediction_months=3,
+            status=QuotaPredictionJob.STATUS_RUNNING,
+            total_ships=1
+        )
+        QuotaPredictionJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(minutes=minutes_ago))
+        return job
+
+    def test_interrupted_job_is_run_again(self):
+        """resume_quota_prediction_jobs finishes stale jobs and leaves active ones alone"""
+        job = self.create_interrupted_job()
+        active = self.create_interrupted_job(minutes_ago=0)
+
+        call_command('resume_quota_prediction_jobs', stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuotaPredictionJob.STATUS_COMPLETED)
+        self.assertEqual(job.result['succeeded'], 1)  # type: ignore
+        active.refresh_from_db()
+        self.assertEqual(active.status, QuotaPredictionJob.STATUS_RUNNING)
+
+    def test_interrupted_job_can_be_failed(self):
+        """With --fail, stale jobs are marked as failed so their status endpoint finishes"""
+        job = self.create_interrupted_job()
+
+        call_command('resume_quota_prediction_jobs', '--fail', stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuotaPredictionJob.STATUS_FAILED)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_ship_lookup_failure_fails_job(self):
+        """An error while loading the ships marks the job as failed instead of leaving it running"""
+        with mock.patch.object(Ship.objects, 'in_bulk', side_effect=DatabaseError('database unavailable')):
+            response = self.submit({'ship_registration_number': 'KS001'})
+
+        job = QuotaPredictionJob.objects.get(pk=response.data['id'])  # type: ignore
+        self.assertEqual(job.status, QuotaPredictionJob.STATUS_FAILED)
+        self.assertEqual(job.error, 'database unavailable')
+
+    def test_live_job_is_not_started_twice(self):
+        """A running job whose worker is still refreshing it is skipped, even when named explicitly"""
+        job = self.create_interrupted_job(minutes_ago=0)
+        out = StringIO()
+
+        call_command('resume_quota_prediction_jobs', str(job.pk), stdout=out)
+
+        self.assertIn('still running, skipped', out.getvalue())
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuotaPredictionJob.STATUS_RUNNING)
+        self.assertIsNone(job.result)
+
+    def test_worker_stops_when_job_is_claimed_elsewhere(self):
+        """Once another worker claims the job, the first one writes neither progress nor result"""
+        job = QuotaPredictionJob.objects.create(
+            requested_by=self.user, ship_registration_numbers=['KS001', 'KS002'], total_ships=2
+        )
+        calls = []
+
+        def claimed_elsewhere(ship, prediction_months):
+            calls.append(ship.registration_number)
+            QuotaPredictionJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() + timedelta(seconds=1))
+            return None, 'ditangani worker lain'
+
+        with mock.patch('ships.jobs.build_quota_prediction', side_effect=claimed_elsewhere):
+            job = run_quota_prediction_job(job.pk)
+
+        self.assertEqual(calls, ['KS001'])
+        self.assertEqual(job.status, QuotaPredictionJob.STATUS_RUNNING)
+        self.assertEqual(job.processed_ships, 0)
+        self.assertIsNone(job.result)
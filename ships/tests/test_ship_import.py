@@ -0,0 +1,147 @@
+from typing import cast
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from owners.models import Owner, Captain
+from ships.models import Ship
+from ships.lookup import CACHE_PREFIX, get_ship_id, clear_local_cache
+from ships.importers import import_ships
+from fco_project.importing import iter_rows
+
+HEADER = 'name,registration_number,owner_name,captain_name,length,width,gross_tonnage,year_built,home_port,active\n'
+
+
+class ShipImportTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+        self.client = APIClient()
+        User = get_user_model()
+        self.client.force_authenticate(user=User.objects.create_user(username='testuser', password='testpass123'))
+
+        self.owner = Owner.objects.create(full_name='Pemilik Lama', owner_type='individual')
+        Captain.objects.create(full_name='Nahkoda Satu', license_number='LIC001', owner=self.owner)
+        Ship.objects.create(name='Kapal Lama', registration_number='REG000', owner=self.owner, length='10.00')
+        self.url = reverse('ship-import-ships')
+
+    def import_csv(self, rows):
+        return cast(Response, self.client.post(self.url, {'csv_data': HEADER + ''.join(rows)}, format='json'))
+
+    def test_import_reports_created_updated_and_errors(self):
+        """Counts and error messages match the row-by-row import"""
+        response = self.import_csv([
+            'Kapal Satu,REG001,Pemilik Baru,Nahkoda Satu,20.5,5.2,100.5,2020,Pelabuhan A,true\n',
+            'Kapal Lama,REG000,Pemilik Lama,,10,,,,,true\n',
+            'Kapal Lama Baru,REG000,Pemilik Lama,,10,,,,,false\n',
+            ',REG002,Pemilik Baru,,,,,,,\n',
+            'Kapal Tiga,REG003,Pemilik Baru,Tidak Ada,,,,,,\n',
+            'Kapal Empat,REG004,Pemilik Baru,,abc,,,,,\n',
+            'Kapal Satu,REG001,Pemilik Baru,Nahkoda Satu,21,5.2,100.5,2020,Pelabuhan A,true\n',
+        ])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 1)  # type: ignore
+        # The unchanged REG000 row is not counted; its later change and the REG001 repeat are
+        self.assertEqual(response.data['updated'], 2)  # type: ignore
+        self.assertEqual(response.data['errors'], 3)  # type: ignore
+        self.assertEqual(response.data['error_details'], [  # type: ignore
+            'Row 4: Missing name/nama_kapal',
+            'Row 5: Captain "Tidak Ada" not found',
+            'Row 6: Invalid length value "abc"',
+        ])
+
+        ship = Ship.objects.select_related('owner', 'captain').get(registration_number='REG001')
+        self.assertEqual(ship.owner.full_name, 'Pemilik Baru')
+        self.assertEqual(ship.captain.full_name, 'Nahkoda Satu')  # type: ignore
+        self.assertEqual(str(ship.length), '21.00')
+        old_ship = Ship.objects.get(registration_number='REG000')
+        self.assertEqual(old_ship.name, 'Kapal Lama Baru')
+        self.assertFalse(old_ship.active)
+        self.assertEqual(Owner.objects.filter(full_name='Pemilik Baru').count(), 1)
+
+    def test_import_query_count_does_not_grow_with_rows(self):
+        """Owners, captains and ships are resolved and written in bulk"""
+        def run(start, count):
+            rows = [
+                f'Kapal {i},BULK{i:05d},Pemilik {i % 7},Nahkoda Satu,{i % 50 + 1},3,50,2010,Pelabuhan,true\n'
+                for i in range(start, start + count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.import_csv(rows)
+            self.assertEqual(response.data['created'], count)  # type: ignore
+            return len(queries)
+
+        small = run(0, 20)
+        self.assertLessEqual(run(100, 400), small + 2)
+        self.assertEqual(Ship.objects.filter(registration_number__startswith='BULK').count(), 420)
+
+    def test_import_invalidates_cached_lookups(self):
+        """Ships written in bulk do not leave stale registration lookups behind"""
+        # Entry left behind by a ship removed without signals
+        cache.set(CACHE_PREFIX + 'REG009', 999999)
+        self.import_csv(['Kapal Sembilan,REG009,Pemilik Lama,,,,,,,true\n'])
+
+        self.assertEqual(get_ship_id('REG009'), Ship.objects.get(registration_number='REG009').pk)
+
+    def test_dry_run_does_not_write_and_reads_existing_ships_once(self):
+        """A dry run reports the diff without creating ships or owners, in a constant number of queries"""
+        rows = ['Kapal Lama,REG000,Pemilik Lama,,10,,,,,true\n', 'Kapal Lama Baru,REG000,Pemilik Lama,,10,,,,,true\n']
+        rows += [f'Kapal {i},DRY{i:04d},Pemilik Baru,,,,,,,true\n' for i in range(300)]
+        with CaptureQueriesContext(connection) as queries:
+            response = cast(Response, self.client.post(
+                self.url, {'csv_data': HEADER + ''.join(rows), 'dry_run': True}, format='json'
+            ))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 300)  # type: ignore
+        self.assertEqual(response.data['updated'], 1)  # type: ignore
+        self.assertEqual(response.data['unchanged'], 1)  # type: ignore
+        self.assertEqual(response.data['diff'][0], {  # type: ignore
+            'key': 'REG000', 'action': 'updated', 'changes': {'name': {'old': 'Kapal Lama', 'new': 'Kapal Lama Baru'}}
+        })
+        # New owners are reported by name because they do not exist yet
+        self.assertEqual(response.data['diff'][1]['changes']['owner_id']['new'], 'Pemilik Baru')  # type: ignore
+        self.assertLessEqual(len(queries), 10)
+        self.assertFalse(Ship.objects.filter(registration_number__startswith='DRY').exists())
+        self.assertEqual(Ship.objects.get(registration_number='REG000').name, 'Kapal Lama')
+        self.assertFalse(Owner.objects.filter(full_name='Pemilik Baru').exists())
+
+    def test_dry_run_counts_keys_repeated_across_batches_like_real_import(self):
+        """A key seen in an earlier batch is compared with what that batch would have written"""
+        csv_data = HEADER + (
+            'Kapal Satu,REG001,Pemilik Lama,,,,,,,true\n'
+            'Kapal Satu,REG001,Pemilik Lama,,,,,,,true\n'
+            'Kapal Satu Baru,REG001,Pemilik Lama,,,,,,,true\n'
+            'Kapal Lama Baru,REG000,Pemilik Lama,,10,,,,,true\n'
+            'Kapal Lama Baru,REG000,Pemilik Lama,,10,,,,,true\n'
+        )
+        counts = ('created', 'updated', 'unchanged', 'errors')
+
+        dry = import_ships(iter_rows(text=csv_data), chunk_size=1, dry_run=True)
+        self.assertFalse(Ship.objects.filter(registration_number='REG001').exists())
+        real = import_ships(iter_rows(text=csv_data), chunk_size=1)
+
+        self.assertEqual([dry[key] for key in counts], [real[key] for key in counts])
+        self.assertEqual([dry[key] for key in counts], [1, 2, 2, 0])
+        self.assertEqual([(entry['key'], entry['action']) for entry in dry['diff']], [
+            ('REG001', 'created'), ('REG001', 'updated'), ('REG000', 'updated')
+        ])
+        self.assertEqual(dry['diff'][1]['changes'], {'name': {'old': 'Kapal Satu', 'new': 'Kapal Satu Baru'}})
+
+    def test_form_flags_are_parsed(self):
+        """clear_existing=false sent as a form value is false, so it combines with dry_run"""
+        response = cast(Response, self.client.post(self.url, {
+            'csv_data': HEADER + 'Kapal Satu,REG001,Pemilik Lama,,,,,,,true\n',
+            'dry_run': 'true', 'clear_existing': 'false',
+        }, format='multipart'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 1)  # type: ignore
+        self.assertTrue(Ship.objects.filter(registration_number='REG000').exists())
+        self.assertFalse(Ship.objects.filter(registration_number='REG001').exists())
@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import TestCase
+from owners.models import Owner
+from ships.models import Ship
+from ships.lookup import get_ship, get_ship_id, get_ship_ids, clear_local_cache
+
+
+class ShipLookupTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+        self.owner = Owner.objects.create(full_name='Test Owner', owner_type='individual')
+        self.ship = Ship.objects.create(name='Kapal Satu', registration_number='KS001', owner=self.owner)
+
+    def test_repeated_lookup_is_served_from_cache(self):
+        """Only the first resolution of a registration number hits the database"""
+        with self.assertNumQueries(1):
+            self.assertEqual(get_ship_id('KS001'), self.ship.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_ship_id('KS001'), self.ship.pk)
+
+    def test_shared_cache_tier_is_used_after_local_tier_is_cleared(self):
+        """A fresh process (empty local LRU) still avoids the database"""
+        get_ship_id('KS001')
+        clear_local_cache()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_ship_id('KS001'), self.ship.pk)
+
+    def test_bulk_resolution_uses_one_query(self):
+        """Unknown registration numbers are resolved in a single IN query"""
+        other = Ship.objects.create(name='Kapal Dua', registration_number='KS002', owner=self.owner)
+        with self.assertNumQueries(1):
+            resolved = get_ship_ids(['KS001', 'KS002', 'UNKNOWN'])
+        self.assertEqual(resolved, {'KS001': self.ship.pk, 'KS002': other.pk})
+
+    def test_rename_and_delete_invalidate_cache(self):
+        """Saving or deleting a ship drops its cached entries"""
+        get_ship_id('KS001')
+        self.ship.registration_number = 'KS009'
+        self.ship.save()
+        self.assertIsNone(get_ship_id('KS001'))
+        self.assertEqual(get_ship('KS009'), self.ship)
+
+        self.ship.delete()
+        self.assertIsNone(get_ship_id('KS009'))
+        with self.assertRaises(Ship.DoesNotExist):
+            get_ship('KS009')
+
+    def test_get_ship_reads_the_database(self):
+        """get_ship is a single lookup that is not affected by a stale cached id"""
+        get_ship_id('KS001')
+        Ship.objects.filter(pk=self.ship.pk).update(registration_number='KS010')
+
+        with self.assertRaises(Ship.DoesNotExist):
+            get_ship('KS001')
+        with self.assertNumQueries(1):
+            self.assertEqual(get_ship('KS010').pk, self.ship.pk)
+
+    def test_catch_serializer_uses_cached_ship_id(self):
+        """Creating a catch report by registration number does not load the ship"""
+        from catches.models import FishCatch
+        from catches.serializers import FishCatchSerializer
+        get_ship_id('KS001')
+        serializer = FishCatchSerializer(data={
+            'ship': 'KS001', 'catch_date': '2024-05-01', 'catch_type': 'pelagic',
+            'location_latitude': '-6.100000', 'location_longitude': '106.800000',
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.assertNumQueries(1):
+            fish_catch = serializer.save()
+        self.assertEqual(fish_catch.ship_id, self.ship.pk)
+        self.assertEqual(FishCatch.objects.get().ship, self.ship)
@@ -1,7 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
-from .views_quota import predict_ship_quota, regulator_manual_quota_input
+from .views_quota import (
+    predict_ship_quota,
+    regulator_manual_quota_input,
+    submit_quota_prediction_job,
+    quota_prediction_job_status,
+    quota_prediction_job_result,
+    export_quotas
+)
 
 router = DefaultRouter()
 router.register(r'ships', views.ShipViewSet)
@@ -11,5 +18,9 @@ urlpatterns = [
     path('check-ship/', views.check_ship_registration, name='check_ship_registration'),
     path('ai-recommendations/', views.ai_ship_recommendations, name='ai_ship_recommendations'),
     path('predict-quota/', predict_ship_quota, name='predict_ship_quota'),
+    path('predict-quota/jobs/', submit_quota_prediction_job, name='submit_quota_prediction_job'),
+    path('predict-quota/jobs/<int:job_id>/', quota_prediction_job_status, name='quota_prediction_job_status'),
+    path('predict-quota/jobs/<int:job_id>/result/', quota_prediction_job_result, name='quota_prediction_job_result'),
+    path('quotas/export/', export_quotas, name='export_quotas'),
     path('regulator/manual-quota/', regulator_manual_quota_input, name='regulator_manual_quota'),
 ]
\ No newline at end of file
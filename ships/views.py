@@ -9,12 +9,16 @@ from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.apps import apps
 from django.db.models import Sum, Count, F, ExpressionWrapper, FloatField, Avg, Q
 from django.db.models.functions import TruncMonth
-from io import StringIO, BytesIO
+from io import BytesIO
 import csv
 from datetime import datetime, timedelta
 import json
 from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiParameter
 from .models import Ship
+from fco_project.exports import export_response, get_export_format
+from fco_project.importing import diff_csv_response, get_flag, get_import_source, iter_rows
+from .lookup import get_ship
+from . import importers
 from .serializers import ShipSerializer, AIRecommendationResponseSerializer
 
 @extend_schema_view(
@@ -70,6 +74,30 @@ from .serializers import ShipSerializer, AIRecommendationResponseSerializer
             }
         }
     ),
+    export=extend_schema(
+        tags=['Ships'],
+        summary='Ekspor kapal ke CSV/Excel',
+        description='Mengekspor semua kapal sebagai file CSV atau XLSX yang dikirim secara streaming. Header sama dengan template impor, sehingga file dapat diimpor kembali.',
+        parameters=[
+            OpenApiParameter(
+                name='file_format',
+                description='Format file: csv (default) atau xlsx',
+                required=False,
+                type=str,
+                enum=['csv', 'xlsx']
+            ),
+        ],
+        responses={
+            200: {
+                'content': {
+                    'text/csv': {'schema': {'type': 'string'}},
+                    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': {
+                        'schema': {'type': 'string', 'format': 'binary'}
+                    }
+                }
+            }
+        }
+    ),
     import_ships=extend_schema(
         tags=['Ships'],
         summary='Impor kapal dari CSV',
@@ -91,6 +119,17 @@ from .serializers import ShipSerializer, AIRecommendationResponseSerializer
                         'type': 'boolean',
                         'description': 'Jika true, hapus semua kapal yang ada sebelum mengimpor',
                         'default': False
+                    },
+                    'dry_run': {
+                        'type': 'boolean',
+                        'description': 'Jika true, tidak ada data yang disimpan; respons berisi jumlah data yang akan dibuat/diperbarui/tidak berubah beserta perbedaan per kolom',
+                        'default': False
+                    },
+                    'diff_format': {
+                        'type': 'string',
+                        'enum': ['json', 'csv'],
+                        'description': 'Format perbedaan pada dry run: json (dalam respons) atau csv (file unduhan)',
+                        'default': 'json'
                     }
                 }
             }
@@ -102,10 +141,23 @@ from .serializers import ShipSerializer, AIRecommendationResponseSerializer
                     'message': {'type': 'string'},
                     'created': {'type': 'integer'},
                     'updated': {'type': 'integer'},
+                    'unchanged': {'type': 'integer'},
                     'errors': {'type': 'integer'},
                     'error_details': {
                         'type': 'array',
                         'items': {'type': 'string'}
+                    },
+                    'diff': {
+                        'type': 'array',
+                        'description': 'Hanya pada dry run: satu entri per data yang akan dibuat atau diperbarui',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'key': {'type': 'string'},
+                                'action': {'type': 'string', 'enum': ['created', 'updated']},
+                                'changes': {'type': 'object'}
+                            }
+                        }
                     }
                 }
             }
@@ -174,248 +226,67 @@ class ShipViewSet(viewsets.ModelViewSet):
         
         return response
     
+    # Same headers as the import template, so an export can be imported again
+    EXPORT_COLUMNS = [
+        ('name', 'name'),
+        ('registration_number', 'registration_number'),
+        ('owner_name', 'owner__full_name'),
+        ('captain_name', 'captain__full_name'),
+        ('length', 'length'),
+        ('width', 'width'),
+        ('gross_tonnage', 'gross_tonnage'),
+        ('year_built', 'year_built'),
+        ('home_port', 'home_port'),
+        ('active', 'active'),
+    ]
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def export(self, request):
+        """
+        Stream all ships as CSV or XLSX (?file_format=csv|xlsx)
+        """
+        file_format = get_export_format(request)
+        if file_format is None:
+            return Response({'error': 'file_format must be csv or xlsx'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Ship._default_manager.order_by('pk')  # type: ignore
+        return export_response(queryset, self.EXPORT_COLUMNS, 'ships', file_format, sheet_name='Ships')
+
     @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def import_ships(self, request):
         """
         Import ships from CSV data provided in the request
         """
-        csv_data = request.data.get('csv_data')
-        csv_file_upload = request.FILES.get('csv_file')
-        csv_data_file = request.FILES.get('csv_data')  # Handle case where csv_data is sent as file
-        clear_existing = request.data.get('clear_existing', False)
-
-        print(f"Request data keys: {list(request.data.keys())}")
-        print(f"Request FILES keys: {list(request.FILES.keys())}")
-        print(f"csv_data type: {type(csv_data)}")
-        print(f"csv_file_upload type: {type(csv_file_upload)}")
-        print(f"csv_data_file type: {type(csv_data_file)}")
-
-        # Handle the case where csv_data is sent as a file (InMemoryUploadedFile)
-        if csv_data_file and isinstance(csv_data_file, type(csv_file_upload)):
-            print("Detected csv_data as file upload, switching to file processing mode")
-            csv_file_upload = csv_data_file
-            csv_data = None
-        elif csv_data and hasattr(csv_data, 'read'):  # Check if csv_data is a file-like object
-            print("Detected csv_data as file-like object, switching to file processing mode")
-            csv_file_upload = csv_data
-            csv_data = None
+        upload, csv_data = get_import_source(request)
+        clear_existing = get_flag(request, 'clear_existing')
+        dry_run = get_flag(request, 'dry_run')
 
-        if not csv_data and not csv_file_upload:
+        if upload is None and not csv_data:
             return Response(
                 {'error': 'csv_data (string) or csv_file (upload) is required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Get the Ship, Owner, and Captain models dynamically
-        Ship = apps.get_model('ships', 'Ship')
-        Owner = apps.get_model('owners', 'Owner')
-        Captain = apps.get_model('owners', 'Captain')
-
-        # Clear existing data if requested
-        if clear_existing:
-            Ship._default_manager.all().delete()  # type: ignore
-
-        # Process CSV data
+        # Process CSV/Excel data
         try:
-            if csv_file_upload:
-                # Handle file upload
-                print(f"✓ Processing as file upload: {getattr(csv_file_upload, 'name', 'unnamed')}, size: {getattr(csv_file_upload, 'size', 'unknown')}")
-                file_content = csv_file_upload.read().decode('utf-8')
-                print(f"File content length: {len(file_content)}")
-                print(f"File content preview: {file_content[:100]}...")
-                csv_file = StringIO(file_content)
-                reader = csv.DictReader(csv_file)
-            else:
-                # Handle string data
-                print(f"✓ Processing as string data, length: {len(csv_data) if csv_data else 0}")
-                print(f"String content preview: {csv_data[:100] if csv_data else 'None'}...")
-                csv_file = StringIO(csv_data)
-                reader = csv.DictReader(csv_file)
-            
-            created_count = 0
-            updated_count = 0
-            error_count = 0
-            error_details = []
-            row_num = 0  # Initialize row_num to avoid unbound variable error
-
-            print(f"Starting CSV import process...")
-            print(f"Headers detected: {reader.fieldnames}")
+            # Owners, captains and ships are resolved and written in bulk per chunk of rows
+            result = importers.import_ships(iter_rows(upload, csv_data), clear_existing=clear_existing, dry_run=dry_run)
+            error_details = result['error_details']
 
-            for row_num, row in enumerate(reader, start=1):
-                print(f"Processing row {row_num}: {row}")
-                try:
-                    # Extract data from CSV row - support both English and Indonesian headers
-                    name = row.get('name', row.get('nama_kapal', '')).strip()
-                    registration_number = row.get('registration_number', row.get('no_buku_kapal', '')).strip()
-                    owner_name = row.get('owner_name', row.get('nama_pemilik', '')).strip()
-                    captain_name = row.get('captain_name', row.get('nama_nahkoda', '')).strip() or None
-                    length = row.get('length', row.get('panjang', '')).strip()
-                    width = row.get('width', row.get('lebar', '')).strip()
-                    gross_tonnage = row.get('gross_tonnage', row.get('tonase_kotor', '')).strip()
-                    year_built = row.get('year_built', row.get('tahun_dibuat', '')).strip()
-                    home_port = row.get('home_port', row.get('pelabuhan_asal', '')).strip() or None
-                    active = row.get('active', row.get('aktif', 'true')).strip().lower()
-                    # Default to True if not provided
-                    active_bool = active in ['true', '1', 'yes', 'y'] if active else True
+            if dry_run and request.data.get('diff_format') == 'csv':
+                return diff_csv_response(result['diff'], 'ships_import_diff.csv')
 
-                    print(f"  Extracted data: name='{name}', reg_num='{registration_number}', owner='{owner_name}', length='{length}', active={active_bool}")
-                    
-                    # Validate required fields
-                    if not name:
-                        error_details.append(f'Row {row_num}: Missing name/nama_kapal')
-                        error_count += 1
-                        continue
-
-                    if not registration_number:
-                        error_details.append(f'Row {row_num}: Missing registration_number/no_buku_kapal')
-                        error_count += 1
-                        continue
-
-                    # Handle owner - create default if not provided
-                    if not owner_name:
-                        owner_name = 'Default Owner'
-
-                    try:
-                        owner = Owner._default_manager.get_or_create(
-                            full_name=owner_name,
-                            defaults={'owner_type': 'individual'}  # Set default owner type
-                        )[0]  # type: ignore
-                    except Exception as e:
-                        error_details.append(f'Row {row_num}: Could not create/find owner "{owner_name}" - {str(e)}')
-                        error_count += 1
-                        continue
-                    
-                    # Find the captain if provided (optional)
-                    captain = None
-                    if captain_name:
-                        try:
-                            captain = Captain._default_manager.get(full_name=captain_name)  # type: ignore
-                        except Captain.DoesNotExist:  # type: ignore
-                            error_details.append(f'Row {row_num}: Captain "{captain_name}" not found')
-                            error_count += 1
-                            continue
-                    
-                    # Convert numeric values if provided
-                    length_decimal = None
-                    width_decimal = None
-                    gross_tonnage_decimal = None
-                    year_built_int = None
-                    
-                    if length:
-                        try:
-                            length_decimal = float(length)
-                        except ValueError:
-                            error_details.append(f'Row {row_num}: Invalid length value "{length}"')
-                            error_count += 1
-                            continue
-                    
-                    if width:
-                        try:
-                            width_decimal = float(width)
-                        except ValueError:
-                            error_details.append(f'Row {row_num}: Invalid width value "{width}"')
-                            error_count += 1
-                            continue
-                    
-                    if gross_tonnage:
-                        try:
-                            gross_tonnage_decimal = float(gross_tonnage)
-                        except ValueError:
-                            error_details.append(f'Row {row_num}: Invalid gross_tonnage value "{gross_tonnage}"')
-                            error_count += 1
-                            continue
-                    
-                    if year_built:
-                        try:
-                            year_built_int = int(year_built)
-                        except ValueError:
-                            error_details.append(f'Row {row_num}: Invalid year_built value "{year_built}"')
-                            error_count += 1
-                            continue
-                    
-                    # active_bool is already set above
-                    
-                    # Create or update the ship
-                    ship, created = Ship._default_manager.get_or_create(  # type: ignore
-                        registration_number=registration_number,
-                        defaults={
-                            'name': name,
-                            'owner': owner,
-                            'captain': captain,
-                            'length': length_decimal,
-                            'width': width_decimal,
-                            'gross_tonnage': gross_tonnage_decimal,
-                            'year_built': year_built_int,
-                            'home_port': home_port,
-                            'active': active_bool,
-                        }
-                    )
-                    
-                    if created:
-                        created_count += 1
-                        print(f"  ✓ Created new ship: {ship.name} ({ship.registration_number})")
-                    else:
-                        # Update existing record if there's new data
-                        updated = False
-                        if ship.name != name:
-                            ship.name = name
-                            updated = True
-                        if ship.owner != owner:
-                            ship.owner = owner
-                            updated = True
-                        if ship.captain != captain:
-                            ship.captain = captain
-                            updated = True
-                        if ship.length != length_decimal:
-                            ship.length = length_decimal
-                            updated = True
-                        if ship.width != width_decimal:
-                            ship.width = width_decimal
-                            updated = True
-                        if ship.gross_tonnage != gross_tonnage_decimal:
-                            ship.gross_tonnage = gross_tonnage_decimal
-                            updated = True
-                        if ship.year_built != year_built_int:
-                            ship.year_built = year_built_int
-                            updated = True
-                        if ship.home_port != home_port:
-                            ship.home_port = home_port
-                            updated = True
-                        if ship.active != active_bool:
-                            ship.active = active_bool
-                            updated = True
-
-                        if updated:
-                            ship.save()
-                            updated_count += 1
-                            print(f"  ✓ Updated existing ship: {ship.name} ({ship.registration_number})")
-                        else:
-                            print(f"  - No changes needed for ship: {ship.name} ({ship.registration_number})")
-            
-                except ValidationError as e:
-                    print(f"  ✗ Row {row_num}: Validation error - {str(e)}")
-                    error_details.append(f'Row {row_num}: Validation error - {str(e)}')
-                    error_count += 1
-                except Exception as e:
-                    print(f"  ✗ Row {row_num}: Unexpected error - {str(e)}")
-                    error_details.append(f'Row {row_num}: Unexpected error - {str(e)}')
-                    error_count += 1
-            
-            print(f"\nImport Summary:")
-            print(f"  Total rows processed: {row_num}")
-            print(f"  Created: {created_count}")
-            print(f"  Updated: {updated_count}")
-            print(f"  Errors: {error_count}")
-            if error_details:
-                print(f"  Error details: {error_details}")
-
-            return Response({
-                'message': 'Import completed',
-                'created': created_count,
-                'updated': updated_count,
-                'errors': error_count,
+            response_data = {
+                'message': 'Dry run completed, no data was saved' if dry_run else 'Import completed',
+                'created': result['created'],
+                'updated': result['updated'],
+                'unchanged': result['unchanged'],
+                'errors': result['errors'],
                 'error_details': error_details if error_details else None
-            })
+            }
+            if dry_run:
+                response_data['diff'] = result['diff']
+            return Response(response_data)
             
         except Exception as e:
             return Response(
@@ -477,7 +348,7 @@ def check_ship_registration(request):
         }, status=400)
     
     try:
-        ship = Ship._default_manager.select_related('owner', 'captain').get(registration_number=registration_number)
+        ship = get_ship(registration_number, Ship._default_manager.select_related('owner', 'captain'))
         return Response({
             'exists': True,
             'ship': {
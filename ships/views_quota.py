@@ -11,17 +11,18 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 from django.core.exceptions import ObjectDoesNotExist
 from django.apps import apps
 from datetime import datetime, timedelta
-from .models import Quota
+from .models import Quota, QuotaPredictionJob
 from .serializers_quota import (
     QuotaPredictionInputSerializer,
     QuotaPredictionResponseSerializer,
     ManualQuotaInputSerializer,
-    ManualQuotaResponseSerializer
-)
-from .ml_models import (
-    predict_and_optimize_quota, 
-    generate_quota_recommendation
+    ManualQuotaResponseSerializer,
+    QuotaPredictionJobInputSerializer,
+    QuotaPredictionJobSerializer
 )
+from .jobs import build_quota_prediction, enqueue_quota_prediction_job
+from .lookup import get_ship
+from fco_project.exports import export_response, get_export_format
 
 
 @extend_schema(
@@ -79,12 +80,9 @@ def predict_ship_quota(request):
     ship_registration_number = validated_data['ship_registration_number']  # type: ignore
     prediction_months = validated_data.get('prediction_months', 12)  # type: ignore
     
-    # Get Ship model dynamically
-    Ship = apps.get_model('ships', 'Ship')
-    
     # Verify ship exists
     try:
-        ship = Ship._default_manager.get(registration_number=ship_registration_number)
+        ship = get_ship(ship_registration_number)
     except ObjectDoesNotExist:
         return Response(
             {'error': f'Kapal dengan nomor registrasi {ship_registration_number} tidak ditemukan'},
@@ -93,53 +91,17 @@ def predict_ship_quota(request):
     
     # Run sequential prediction and optimization
     # 1. LSTM prediction -> 2. NSGA-III optimization
-    optimized_results = predict_and_optimize_quota(ship_registration_number, prediction_months)
-    
-    # Check if there was an error
-    if isinstance(optimized_results, dict) and "error" in optimized_results:
+    response_serializer, error = build_quota_prediction(ship, prediction_months)
+    if error:
         return Response(
-            {'error': optimized_results["error"]},
+            {'error': error},
             status=status.HTTP_400_BAD_REQUEST
         )
-    
-    # Generate recommendation
-    recommendation = generate_quota_recommendation(optimized_results)
-    
-    # Prepare response data
-    # Format the results for the response
-    lstm_predictions = []
-    nsga3_predictions = []
-    
-    for result in optimized_results:
-        # LSTM predictions
-        lstm_predictions.append({
-            "date": result["date"],  # type: ignore
-            "predicted_quota": result["lstm_predicted_quota"],  # type: ignore
-            "confidence_interval": result["confidence_interval"]  # type: ignore
-        })
-        
-        # NSGA-III optimized predictions
-        nsga3_predictions.append({
-            "date": result["date"],  # type: ignore
-            "predicted_quota": result["optimized_quota"],  # type: ignore
-            "fitness_score": result["fitness_score"]  # type: ignore
-        })
-    
-    response_data = {
-        'ship_registration_number': ship_registration_number,
-        'ship_name': ship.name,
-        'prediction_period': f"{prediction_months} bulan ke depan",
-        'lstm_predictions': lstm_predictions,
-        'nsga3_predictions': nsga3_predictions,
-        'recommendation': recommendation
-    }
-    
+
     # Validate response with serializer
-    response_serializer = QuotaPredictionResponseSerializer(data=response_data)
-    if response_serializer.is_valid():
-        return Response(response_serializer.validated_data)
-    else:
-        return Response(response_serializer.errors, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    if response_serializer.errors:  # type: ignore
+        return Response(response_serializer.errors, status=status.HTTP_500_INTERNAL_SERVER_ERROR)  # type: ignore
+    return Response(response_serializer.validated_data)  # type: ignore
 
 
 @extend_schema(
@@ -214,12 +176,9 @@ def regulator_manual_quota_input(request):
     year = serializer.validated_data['year']
     quota_amount = serializer.validated_data['quota_amount']
 
-    # Get Ship model dynamically
-    Ship = apps.get_model('ships', 'Ship')
-
     # Verify ship exists
     try:
-        ship = Ship._default_manager.get(registration_number=ship_registration_number)
+        ship = get_ship(ship_registration_number)
     except ObjectDoesNotExist:
         return Response(
             {'error': f'Kapal dengan nomor registrasi {ship_registration_number} tidak ditemukan'},
@@ -253,4 +212,212 @@ def regulator_manual_quota_input(request):
     if response_serializer.is_valid():
         return Response(response_serializer.validated_data)
     else:
-        return Response(response_serializer.errors, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response(response_serializer.errors, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+def _get_visible_job(request, job_id):
+    """Return the job if it exists and the user may see it, otherwise None"""
+    job = QuotaPredictionJob.objects.filter(pk=job_id).first()
+    if job is None:
+        return None
+    user = request.user
+    if job.requested_by_id == user.id or user.is_staff or getattr(user, 'role', None) in ('admin', 'regulator'):
+        return job
+    return None
+
+
+@extend_schema(
+    tags=['Quota'],
+    summary='Kirim Job Prediksi Kuota (Asinkron)',
+    description='''Membuat job prediksi kuota yang dijalankan di latar belakang untuk satu kapal,
+    daftar kapal, atau seluruh armada aktif.
+
+    Cara kerja:
+    1. Kirim job dan terima ID job (HTTP 202)
+    2. Pantau status dan progres melalui GET /ships/predict-quota/jobs/{id}/
+    3. Ambil hasil melalui GET /ships/predict-quota/jobs/{id}/result/ setelah status "completed"
+
+    Job tetap berjalan walaupun koneksi klien terputus. Job yang terhenti karena
+    server dimulai ulang dijalankan kembali dengan perintah
+    `manage.py resume_quota_prediction_jobs`.''',
+    request=QuotaPredictionJobInputSerializer,
+    responses={
+        202: QuotaPredictionJobSerializer,
+        400: {
+            'type': 'object',
+            'properties': {
+                'error': {'type': 'string', 'description': 'Pesan kesalahan validasi'}
+            }
+        }
+    }
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def submit_quota_prediction_job(request):
+    """
+    Endpoint untuk mengirim job prediksi kuota asinkron (satu kapal atau armada)
+    """
+    serializer = QuotaPredictionJobInputSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(
+            {'error': 'Invalid input data', 'details': serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    validated_data = serializer.validated_data
+    Ship = apps.get_model('ships', 'Ship')
+
+    if validated_data.get('fleet'):  # type: ignore
+        registration_numbers = list(
+            Ship._default_manager.filter(active=True)
+            .order_by('registration_number')
+            .values_list('registration_number', flat=True)
+        )
+        if not registration_numbers:
+            return Response(
+                {'error': 'Tidak ada kapal aktif untuk diprediksi'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    else:
+        registration_numbers = validated_data.get('ship_registration_numbers') or [  # type: ignore
+            validated_data['ship_registration_number']  # type: ignore
+        ]
+        # Keep request order but drop duplicates
+        registration_numbers = list(dict.fromkeys(registration_numbers))
+        existing = set(
+            Ship._default_manager.filter(registration_number__in=registration_numbers)
+            .values_list('registration_number', flat=True)
+        )
+        missing = [number for number in registration_numbers if number not in existing]
+        if missing:
+            return Response(
+                {'error': f'Kapal dengan nomor registrasi {", ".join(missing)} tidak ditemukan'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+    job = QuotaPredictionJob.objects.create(
+        requested_by=request.user,
+        ship_registration_numbers=registration_numbers,
+        prediction_months=validated_data.get('prediction_months', 12),  # type: ignore
+        total_ships=len(registration_numbers)
+    )
+    enqueue_quota_prediction_job(job)
+
+    response = Response(QuotaPredictionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+    response['Location'] = f'/api/ships/predict-quota/jobs/{job.pk}/'
+    return response
+
+
+@extend_schema(
+    tags=['Quota'],
+    summary='Status Job Prediksi Kuota',
+    description='Mengambil status dan progres job prediksi kuota asinkron',
+    responses={200: QuotaPredictionJobSerializer}
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def quota_prediction_job_status(request, job_id):
+    """
+    Endpoint untuk memantau status dan progres job prediksi kuota
+    """
+    job = _get_visible_job(request, job_id)
+    if job is None:
+        return Response({'error': 'Job tidak ditemukan'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(QuotaPredictionJobSerializer(job).data)
+
+
+@extend_schema(
+    tags=['Quota'],
+    summary='Hasil Job Prediksi Kuota',
+    description='''Mengambil hasil job prediksi kuota yang telah selesai.
+    Mengembalikan HTTP 409 jika job belum selesai.''',
+    responses={
+        200: {
+            'type': 'object',
+            'properties': {
+                'job': {'type': 'object'},
+                'ships': {'type': 'array', 'items': {'type': 'object'}},
+                'succeeded': {'type': 'integer'},
+                'failed': {'type': 'integer'}
+            }
+        }
+    }
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def quota_prediction_job_result(request, job_id):
+    """
+    Endpoint untuk mengambil hasil job prediksi kuota
+    """
+    job = _get_visible_job(request, job_id)
+    if job is None:
+        return Response({'error': 'Job tidak ditemukan'}, status=status.HTTP_404_NOT_FOUND)
+
+    if job.status == QuotaPredictionJob.STATUS_FAILED:
+        return Response(
+            {'job': QuotaPredictionJobSerializer(job).data, 'error': job.error},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    if job.status != QuotaPredictionJob.STATUS_COMPLETED:
+        return Response(
+            {'job': QuotaPredictionJobSerializer(job).data, 'error': 'Job belum selesai'},
+            status=status.HTTP_409_CONFLICT
+        )
+
+    return Response({'job': QuotaPredictionJobSerializer(job).data, **(job.result or {})})
+
+
+QUOTA_EXPORT_COLUMNS = [
+    ('ship_registration_number', 'ship__registration_number'),
+    ('ship_name', 'ship__name'),
+    ('year', 'year'),
+    ('quota', 'quota'),
+    ('remaining_quota', 'remaining_quota'),
+    ('is_active', 'is_active'),
+]
+
+
+@extend_schema(
+    tags=['Quota'],
+    summary='Ekspor Kuota ke CSV/Excel',
+    description='''Mengekspor kuota kapal sebagai file CSV atau XLSX yang dikirim secara streaming,
+    sehingga jutaan baris dapat diekspor tanpa memuat seluruh file ke memori.''',
+    parameters=[
+        OpenApiParameter(
+            name='file_format',
+            description='Format file: csv (default) atau xlsx',
+            required=False,
+            type=str,
+            enum=['csv', 'xlsx']
+        ),
+        OpenApiParameter(name='year', description='Memfilter berdasarkan tahun kuota', required=False, type=int),
+    ],
+    responses={
+        200: {
+            'content': {
+                'text/csv': {'schema': {'type': 'string'}},
+                'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': {
+                    'schema': {'type': 'string', 'format': 'binary'}
+                }
+            }
+        }
+    }
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_quotas(request):
+    """
+    Endpoint untuk mengekspor kuota kapal
+    """
+    file_format = get_export_format(request)
+    if file_format is None:
+        return Response({'error': 'file_format harus csv atau xlsx'}, status=status.HTTP_400_BAD_REQUEST)
+
+    queryset = Quota._default_manager.order_by('pk')  # type: ignore
+    year = request.query_params.get('year')
+    if year:
+        try:
+            queryset = queryset.filter(year=int(year))
+        except ValueError:
+            return Response({'error': 'year harus berupa angka'}, status=status.HTTP_400_BAD_REQUEST)
+
+    return export_response(queryset, QUOTA_EXPORT_COLUMNS, 'quotas', file_format, sheet_name='Quotas')